@@ -1,17 +1,25 @@
 """Agent implementations for research team."""
 
-from .competitor import run_competitor_agent
-from .financial import run_financial_agent
-from .followup import build_focused_task, route_query, synthesize_followup
-from .manager import run_manager_agent
-from .market_intel import run_market_intel_agent
+from importlib import import_module
 
-__all__ = [
-    "run_manager_agent",
-    "run_financial_agent",
-    "run_competitor_agent",
-    "run_market_intel_agent",
-    "route_query",
-    "build_focused_task",
-    "synthesize_followup",
-]
+# Public name → defining submodule. Resolved on first access, so importing one
+# light submodule (e.g. followup) doesn't load every agent and LangGraph with it.
+_EXPORTS = {
+    "run_manager_agent": "manager",
+    "run_financial_agent": "financial",
+    "run_competitor_agent": "competitor",
+    "run_market_intel_agent": "market_intel",
+    "route_query": "followup",
+    "build_focused_task": "followup",
+    "synthesize_followup": "followup",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
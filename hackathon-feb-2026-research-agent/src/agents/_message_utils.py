@@ -0,0 +1,56 @@
+"""Helpers shared by the sub-agents for reading LangGraph message history."""
+
+from collections.abc import Awaitable, Callable, Iterator
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.prebuilt import ToolNode
+
+# Tool results longer than this are truncated in the metadata preview
+_PREVIEW_CHARS = 200
+
+
+def _iter_tool_calls(messages: list) -> Iterator[dict]:
+    # tool_call_id → tool call info from AIMessages, until its ToolMessage arrives
+    pending: dict[str, dict] = {}
+    for msg in messages:
+        if isinstance(msg, AIMessage):
+            for tc in msg.tool_calls:
+                pending[tc["id"]] = tc
+        elif isinstance(msg, ToolMessage):
+            tc = pending.pop(msg.tool_call_id, None)
+            if tc is None:
+                continue
+            # Summarise the result to keep metadata lean
+            content = msg.content
+            if isinstance(content, str) and len(content) > _PREVIEW_CHARS:
+                content = content[:_PREVIEW_CHARS] + "..."
+            yield {"tool": tc["name"], "args": tc["args"], "result_preview": content}
+
+
+def extract_tool_calls(messages: list) -> list[dict]:
+    """Extract tool call details from LangGraph message history.
+
+    Each AIMessage tool call is paired with its ToolMessage response in a
+    single pass; calls that never got a response are skipped.
+    """
+    return list(_iter_tool_calls(messages))
+
+
+def logging_tool_node(tool_node: ToolNode) -> Callable[[dict, RunnableConfig], Awaitable[dict]]:
+    """Wrap a ToolNode so each step also emits its entries for the ``tool_calls`` log.
+
+    The agent state declares ``tool_calls: Annotated[list[dict], operator.add]``,
+    so every tools step only pairs its own new ToolMessages with the AIMessage
+    that requested them instead of re-walking the whole history at the end.
+    """
+
+    async def run_tools(state: dict, config: RunnableConfig) -> dict:
+        result = await tool_node.ainvoke(state, config)
+        new_messages = result["messages"]
+        return {
+            "messages": new_messages,
+            "tool_calls": extract_tool_calls([state["messages"][-1], *new_messages]),
+        }
+
+    return run_tools
@@ -1,22 +1,26 @@
 """Competitor Agent - analyzes competitive positioning using Tavily search."""
 
+import operator
+from functools import cache
 from typing import Annotated, Any, TypedDict
 
-from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 
-from ..config import get_config
+from ..llm import cached_system_message, get_llm
 from ..logging_config import get_logger
 from ..prompts.competitor_prompt import COMPETITOR_SYSTEM_PROMPT
 from ..tools.tavily_tools import (
     search_company_info,
+    search_company_info_batch,
     search_competitive_analysis,
     search_market_trends,
     search_product_info,
 )
+from ..utils.event_loop import run_sync
+from ._message_utils import logging_tool_node
 
 logger = get_logger(__name__)
 
@@ -25,77 +29,45 @@ class CompetitorState(TypedDict):
     """State for competitor agent."""
 
     messages: Annotated[list, add_messages]
+    tool_calls: Annotated[list[dict], operator.add]
     companies: list[str]
 
 
 # Tools available to the competitor agent
 COMPETITOR_TOOLS = [
     search_company_info,
+    search_company_info_batch,
     search_competitive_analysis,
     search_product_info,
     search_market_trends,
 ]
+_COMPETITOR_TOOL_NODE = ToolNode(COMPETITOR_TOOLS)
 
-
-def _extract_tool_calls(messages: list) -> list[dict]:
-    """Extract tool call details from LangGraph message history."""
-    tool_calls = []
-    pending = {}
-    for msg in messages:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                pending[tc["id"]] = {
-                    "tool": tc["name"],
-                    "args": tc["args"],
-                }
-        if msg.__class__.__name__ == "ToolMessage":
-            call_id = getattr(msg, "tool_call_id", None)
-            if call_id and call_id in pending:
-                info = pending.pop(call_id)
-                content = msg.content if hasattr(msg, "content") else str(msg)
-                if isinstance(content, str) and len(content) > 200:
-                    content = content[:200] + "..."
-                tool_calls.append(
-                    {
-                        "tool": info["tool"],
-                        "args": info["args"],
-                        "result_preview": content,
-                    }
-                )
-    return tool_calls
+# Shared by every competitor run
+_COMPETITOR_SYSTEM_MESSAGE = cached_system_message(COMPETITOR_SYSTEM_PROMPT, id="competitor-system")
 
 
 def create_competitor_agent():
     """Create the competitor analysis agent."""
-    config = get_config()
-
     # Initialize the LLM with tools
-    llm = ChatAnthropic(
-        model=config.model_name,
-        temperature=config.model_temperature,
-        api_key=config.anthropic_api_key,
-    )
+    llm = get_llm()
     llm_with_tools = llm.bind_tools(COMPETITOR_TOOLS)
 
-    # Create tool node
-    tool_node = ToolNode(COMPETITOR_TOOLS)
-
     def should_continue(state: CompetitorState) -> str:
         """Determine if agent should continue or end."""
         messages = state["messages"]
         last_message = messages[-1]
 
         # If LLM makes a tool call, continue to tools
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
+        if getattr(last_message, "tool_calls", None):
             return "tools"
 
         # Otherwise, end
         return END
 
-    def call_model(state: CompetitorState) -> dict:
+    async def call_model(state: CompetitorState) -> dict:
         """Call the LLM."""
-        messages = state["messages"]
-        response = llm_with_tools.invoke(messages)
+        response = await llm_with_tools.ainvoke(state["messages"])
         return {"messages": [response]}
 
     # Build the graph
@@ -103,7 +75,7 @@ def create_competitor_agent():
 
     # Add nodes
     workflow.add_node("agent", call_model)
-    workflow.add_node("tools", tool_node)
+    workflow.add_node("tools", logging_tool_node(_COMPETITOR_TOOL_NODE))
 
     # Set entry point
     workflow.set_entry_point("agent")
@@ -115,16 +87,10 @@ def create_competitor_agent():
     return workflow.compile()
 
 
-# Create the agent instance
-_competitor_agent = None
-
-
+@cache
 def get_competitor_agent():
     """Get or create the competitor agent instance."""
-    global _competitor_agent
-    if _competitor_agent is None:
-        _competitor_agent = create_competitor_agent()
-    return _competitor_agent
+    return create_competitor_agent()
 
 
 async def run_competitor_agent(task: str, companies: list[str] | None = None) -> dict[str, Any]:
@@ -149,7 +115,7 @@ async def run_competitor_agent(task: str, companies: list[str] | None = None) ->
             company_info = ""
 
         messages = [
-            SystemMessage(content=COMPETITOR_SYSTEM_PROMPT),
+            _COMPETITOR_SYSTEM_MESSAGE,
             HumanMessage(content=f"{task}{company_info}"),
         ]
 
@@ -164,8 +130,8 @@ async def run_competitor_agent(task: str, companies: list[str] | None = None) ->
         # Extract the final response
         final_message = result["messages"][-1]
 
-        # Extract tool call log from message history
-        tool_calls = _extract_tool_calls(result["messages"])
+        # Tool call log accumulated by the tools node
+        tool_calls = result.get("tool_calls", [])
 
         logger.info("competitor_agent.run.end", companies=companies, tool_call_count=len(tool_calls))
         return {
@@ -189,6 +155,4 @@ async def run_competitor_agent(task: str, companies: list[str] | None = None) ->
 
 def run_competitor_agent_sync(task: str, companies: list[str] | None = None) -> dict[str, Any]:
     """Synchronous wrapper for run_competitor_agent."""
-    import asyncio
-
-    return asyncio.run(run_competitor_agent(task, companies))
+    return run_sync(run_competitor_agent(task, companies))
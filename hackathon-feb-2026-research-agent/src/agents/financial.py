@@ -1,16 +1,16 @@
 """Financial Agent - analyzes company financial data using yfinance."""
 
 import ast
-import json
+import operator
+from functools import cache
 from typing import Annotated, Any, TypedDict
 
-from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage, ToolMessage
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 
-from ..config import get_config
+from ..llm import cached_system_message, get_llm
 from ..logging_config import get_logger
 from ..prompts.financial_prompt import FINANCIAL_SYSTEM_PROMPT
 from ..tools.yfinance_tools import (
@@ -18,6 +18,9 @@ from ..tools.yfinance_tools import (
     get_company_financials,
     get_historical_revenue,
 )
+from ..utils import serialization
+from ..utils.event_loop import run_sync
+from ._message_utils import logging_tool_node
 
 logger = get_logger(__name__)
 
@@ -26,6 +29,7 @@ class FinancialState(TypedDict):
     """State for financial agent."""
 
     messages: Annotated[list, add_messages]
+    tool_calls: Annotated[list[dict], operator.add]
     tickers: list[str]
 
 
@@ -35,37 +39,10 @@ FINANCIAL_TOOLS = [
     get_historical_revenue,
     get_company_comparison,
 ]
+_FINANCIAL_TOOL_NODE = ToolNode(FINANCIAL_TOOLS)
 
-
-def _extract_tool_calls(messages: list) -> list[dict]:
-    """Extract tool call details from LangGraph message history."""
-    tool_calls = []
-    # Build a map of tool_call_id → tool call info from AIMessages
-    pending = {}
-    for msg in messages:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                pending[tc["id"]] = {
-                    "tool": tc["name"],
-                    "args": tc["args"],
-                }
-        # Match ToolMessage responses back to their calls
-        if msg.__class__.__name__ == "ToolMessage":
-            call_id = getattr(msg, "tool_call_id", None)
-            if call_id and call_id in pending:
-                info = pending.pop(call_id)
-                # Summarise the result to keep metadata lean
-                content = msg.content if hasattr(msg, "content") else str(msg)
-                if isinstance(content, str) and len(content) > 200:
-                    content = content[:200] + "..."
-                tool_calls.append(
-                    {
-                        "tool": info["tool"],
-                        "args": info["args"],
-                        "result_preview": content,
-                    }
-                )
-    return tool_calls
+# Built once and shared across runs; the fixed id stops add_messages from assigning one in place
+_FINANCIAL_SYSTEM_MESSAGE = cached_system_message(FINANCIAL_SYSTEM_PROMPT, id="financial-system")
 
 
 def _parse_tool_content(content: str) -> dict | None:
@@ -73,8 +50,8 @@ def _parse_tool_content(content: str) -> dict | None:
     if not content or not isinstance(content, str):
         return None
     try:
-        return json.loads(content)
-    except json.JSONDecodeError:
+        return serialization.loads(content)
+    except serialization.JSONDecodeError:
         pass
     try:
         return ast.literal_eval(content)
@@ -89,14 +66,14 @@ def _extract_structured_data(messages: list) -> dict[str, Any]:
     saw_comparison_tool = False
 
     for msg in messages:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
+        if tcs := getattr(msg, "tool_calls", None):
+            for tc in tcs:
                 pending[tc["id"]] = {"tool": tc["name"], "args": tc["args"]}
-        if msg.__class__.__name__ == "ToolMessage":
-            call_id = getattr(msg, "tool_call_id", None)
-            if call_id and call_id in pending:
+        elif isinstance(msg, ToolMessage):
+            call_id = msg.tool_call_id
+            if call_id in pending:
                 info = pending.pop(call_id)
-                content = msg.content if hasattr(msg, "content") else str(msg)
+                content = msg.content
                 parsed = _parse_tool_content(content) if isinstance(content, str) else None
                 if not parsed:
                     continue
@@ -131,35 +108,25 @@ def _extract_structured_data(messages: list) -> dict[str, Any]:
 
 def create_financial_agent():
     """Create the financial analysis agent."""
-    config = get_config()
-
     # Initialize the LLM with tools
-    llm = ChatAnthropic(
-        model=config.model_name,
-        temperature=config.model_temperature,
-        api_key=config.anthropic_api_key,
-    )
+    llm = get_llm()
     llm_with_tools = llm.bind_tools(FINANCIAL_TOOLS)
 
-    # Create tool node
-    tool_node = ToolNode(FINANCIAL_TOOLS)
-
     def should_continue(state: FinancialState) -> str:
         """Determine if agent should continue or end."""
         messages = state["messages"]
         last_message = messages[-1]
 
         # If LLM makes a tool call, continue to tools
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
+        if getattr(last_message, "tool_calls", None):
             return "tools"
 
         # Otherwise, end
         return END
 
-    def call_model(state: FinancialState) -> dict:
+    async def call_model(state: FinancialState) -> dict:
         """Call the LLM."""
-        messages = state["messages"]
-        response = llm_with_tools.invoke(messages)
+        response = await llm_with_tools.ainvoke(state["messages"])
         return {"messages": [response]}
 
     # Build the graph
@@ -167,7 +134,7 @@ def create_financial_agent():
 
     # Add nodes
     workflow.add_node("agent", call_model)
-    workflow.add_node("tools", tool_node)
+    workflow.add_node("tools", logging_tool_node(_FINANCIAL_TOOL_NODE))
 
     # Set entry point
     workflow.set_entry_point("agent")
@@ -179,16 +146,10 @@ def create_financial_agent():
     return workflow.compile()
 
 
-# Create the agent instance
-_financial_agent = None
-
-
+@cache
 def get_financial_agent():
     """Get or create the financial agent instance."""
-    global _financial_agent
-    if _financial_agent is None:
-        _financial_agent = create_financial_agent()
-    return _financial_agent
+    return create_financial_agent()
 
 
 async def run_financial_agent(task: str, tickers: list[str] | None = None) -> dict[str, Any]:
@@ -213,7 +174,7 @@ async def run_financial_agent(task: str, tickers: list[str] | None = None) -> di
             ticker_info = ""
 
         messages = [
-            SystemMessage(content=FINANCIAL_SYSTEM_PROMPT),
+            _FINANCIAL_SYSTEM_MESSAGE,
             HumanMessage(content=f"{task}{ticker_info}"),
         ]
 
@@ -228,8 +189,8 @@ async def run_financial_agent(task: str, tickers: list[str] | None = None) -> di
         # Extract the final response
         final_message = result["messages"][-1]
 
-        # Extract tool call log and structured data from message history
-        tool_calls = _extract_tool_calls(result["messages"])
+        # Tool call log accumulated by the tools node; structured data from message history
+        tool_calls = result.get("tool_calls", [])
         structured_data = _extract_structured_data(result["messages"])
 
         logger.info("financial_agent.run.end", tickers=tickers, tool_call_count=len(tool_calls))
@@ -256,6 +217,4 @@ async def run_financial_agent(task: str, tickers: list[str] | None = None) -> di
 
 def run_financial_agent_sync(task: str, tickers: list[str] | None = None) -> dict[str, Any]:
     """Synchronous wrapper for run_financial_agent."""
-    import asyncio
-
-    return asyncio.run(run_financial_agent(task, tickers))
+    return run_sync(run_financial_agent(task, tickers))
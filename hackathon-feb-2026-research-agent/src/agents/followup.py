@@ -1,7 +1,5 @@
 """Follow-up routing and synthesis logic for conversational follow-ups."""
 
-import json
-
 from langchain_core.messages import HumanMessage
 
 from ..logging_config import get_logger
@@ -10,6 +8,7 @@ from ..prompts.followup_prompt import (
     FOLLOWUP_SYNTHESIS_PROMPT,
     ROUTE_QUERY_PROMPT,
 )
+from ..utils import serialization
 
 logger = get_logger(__name__)
 
@@ -40,15 +39,7 @@ def route_query(user_query: str, prior_report: str | None, llm) -> dict:
 
     try:
         response = llm.invoke([HumanMessage(content=prompt)])
-        content = response.content.strip()
-
-        # Strip markdown code fences if present
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0]
-
-        parsed = json.loads(content.strip())
+        parsed = serialization.loads_fenced(response.content)
 
         query_type = parsed.get("query_type", "new_research")
         if query_type not in ("new_research", "followup_with_agents", "followup_context_only"):
@@ -75,7 +66,7 @@ def route_query(user_query: str, prior_report: str | None, llm) -> dict:
             "reasoning": reasoning,
         }
 
-    except (json.JSONDecodeError, IndexError, KeyError) as e:
+    except (serialization.JSONDecodeError, KeyError) as e:
         logger.warning("followup.route.parse_error", error=str(e))
         return {
             "query_type": "new_research",
@@ -1,15 +1,23 @@
 """Manager Agent - orchestrates research by delegating to sub-agents."""
 
 import asyncio
-import json
+import re
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterator
+from functools import cache
 from typing import Any, Literal, TypedDict
 
-from langchain_anthropic import ChatAnthropic
-from langgraph.graph import END, StateGraph
+from langchain_core.messages import HumanMessage
 
+from ..cache.parse_cache import ParseResult, parse_cache
 from ..config import get_config
+from ..llm import cached_system_message, get_llm
 from ..logging_config import get_logger
-from ..report.generator import generate_report
+from ..prompts.manager_prompt import PARSE_REQUEST_PROMPT
+from ..report.generator import agenerate_report
+from ..utils import serialization
+from ..utils.event_loop import iter_sync, run_sync
+from ..utils.progress import ProgressPump
 from .competitor import run_competitor_agent
 from .financial import run_financial_agent
 from .followup import build_focused_task, route_query, synthesize_followup
@@ -17,6 +25,77 @@ from .market_intel import run_market_intel_agent
 
 logger = get_logger(__name__)
 
+# Static parse instructions, sent as a cached system block ahead of the per-query human turn
+_PARSE_SYSTEM_MESSAGE = cached_system_message(PARSE_REQUEST_PROMPT, id="parse-system")
+
+# Queued by run_manager_agent_stream once the run itself has finished
+_RUN_DONE = object()
+
+# Sub-agent tasks parse_request started ahead of time, keyed by run_id then agent name. Kept out
+# of graph state, which should stay serializable; _run_graph cancels whatever is left unclaimed.
+_speculative_tasks: dict[str, dict[str, asyncio.Task]] = {}
+# Each run's sub-agent concurrency pool, keyed by run_id. Speculative and regular agents share it,
+# so a run never has more than manager_max_parallel_agents agents in flight.
+_run_semaphores: dict[str, asyncio.Semaphore] = {}
+
+# Overall budget (seconds) for one fan-out of sub-agents
+_AGENT_TIMEOUT_S = 300
+# Budget (seconds) for a single sub-agent, counted from when it gets a concurrency slot
+_PER_AGENT_TIMEOUT_S = 180
+
+# Explicit tickers the manager can resolve without asking the LLM
+_KNOWN_TICKERS = {
+    "CSCO": "Cisco (Splunk/AppDynamics)",
+    "DDOG": "DataDog",
+    "DT": "Dynatrace",
+}
+_TICKER_RE = re.compile(r"\b[A-Z]{1,5}\b")
+# All-caps words that show up in research queries but are not tickers
+_TICKER_STOPWORDS = frozenset("A I AI API APM ARR AWS CEO CFO EPS GCP IT ML ROI TTM US VS YOY".split())
+# Capitalized words that may still name a company once the known ones are removed ("New Relic")
+_PROPER_WORD_RE = re.compile(r"\b[A-Z][a-z][\w&'-]*")
+# Capitalized words that open or join research queries rather than name companies. Anything
+# not listed counts as a possible company; a false alarm only costs the LLM parse.
+_QUERY_WORDS = frozenset(
+    """
+    about against analyse analyze and are assess between can compare comparing comparison could did do does
+    evaluate explain for give how in is list of on or please rank research should show summarize tell the
+    to versus vs what when where which who why will with would
+    """.split()
+)
+
+# Sub-agent entry points keyed by ResearchTask["agent"]. The lambdas look the runner up at
+# call time, so new agent types only need an entry here.
+_AGENT_DISPATCH = {
+    "financial": lambda task, companies, tickers: run_financial_agent(task, tickers),
+    "competitor": lambda task, companies, tickers: run_competitor_agent(task, companies),
+    "market_intel": lambda task, companies, tickers: run_market_intel_agent(task, companies),
+}
+
+# Full-research instruction for each sub-agent, filled with the comma-joined companies
+_TASK_TEMPLATES = {
+    "financial": "Analyze financial metrics for: {}",
+    "competitor": "Analyze competitive positioning for: {}",
+    "market_intel": "Analyze market intelligence and trends for: {}",
+}
+
+# Agents started against the default companies while the parse LLM call is in flight
+_SPECULATIVE_AGENTS = ("financial", "competitor")
+
+# Progress detail shown while a sub-agent re-runs for a follow-up question
+_FOLLOWUP_RUNNING_DETAIL = {
+    "financial": "Re-checking financials...",
+    "competitor": "Digging deeper on competitors...",
+    "market_intel": "Fetching market updates...",
+}
+
+# Progress detail reported as each sub-agent finishes a full research run
+_DONE_DETAIL = {
+    "financial": "Financial analysis complete",
+    "competitor": "Competitor research complete",
+    "market_intel": "Market intelligence complete",
+}
+
 
 class ResearchTask(TypedDict):
     """A single research task."""
@@ -30,7 +109,6 @@ class ResearchTask(TypedDict):
 class ManagerState(TypedDict):
     """State for manager agent."""
 
-    messages: list
     user_query: str
     companies: list[str]
     tickers: list[str]
@@ -41,6 +119,8 @@ class ManagerState(TypedDict):
     final_report: str
     status: str
     progress_callback: Any | None
+    # Keys this run's entry in _speculative_tasks
+    run_id: str
     # Follow-up context fields
     prior_report: str | None
     prior_results: dict | None
@@ -49,16 +129,123 @@ class ManagerState(TypedDict):
     focused_task: str
 
 
+async def _run_bounded(
+    sem: asyncio.Semaphore,
+    agent_name: str,
+    task: str,
+    companies: list[str],
+    tickers: list[str],
+) -> dict:
+    """Run one sub-agent while holding a slot in the shared concurrency pool.
+
+    Raises TimeoutError if the agent overruns ``_PER_AGENT_TIMEOUT_S``, which
+    frees its slot for queued agents without failing the rest of the fan-out.
+    """
+    async with sem:
+        return await asyncio.wait_for(_AGENT_DISPATCH[agent_name](task, companies, tickers), _PER_AGENT_TIMEOUT_S)
+
+
+def _task_text(agent_name: str, companies: list[str]) -> str:
+    """Full-research instruction for one sub-agent."""
+    return _TASK_TEMPLATES[agent_name].format(", ".join(companies))
+
+
+def _cancel_speculative(run_id: str) -> None:
+    """Cancel and forget any speculative sub-agents a run started but never claimed."""
+    for agent_task in _speculative_tasks.pop(run_id, {}).values():
+        agent_task.cancel()
+
+
+def _names_other_companies(text: str) -> bool:
+    """Whether text still has company-like words: capitalized non-query words or unknown tickers."""
+    if any(word.lower() not in _QUERY_WORDS for word in _PROPER_WORD_RE.findall(text)):
+        return True
+    return any(t not in _TICKER_STOPWORDS and t not in _KNOWN_TICKERS for t in _TICKER_RE.findall(text))
+
+
+def _match_known_tickers(query: str) -> tuple[list[str], list[str]] | None:
+    """Resolve companies straight from explicit tickers, e.g. "CSCO vs DDOG vs DT".
+
+    Needs at least two distinct tickers, all of them known, and nothing else
+    company-like in the query; anything less (e.g. "CSCO vs DDOG and New
+    Relic") is ambiguous and left to the LLM.
+    """
+    candidates = dict.fromkeys(t for t in _TICKER_RE.findall(query) if t not in _TICKER_STOPWORDS)
+    if len(candidates) < 2 or not candidates.keys() <= _KNOWN_TICKERS.keys() or _names_other_companies(query):
+        return None
+    tickers = list(candidates)
+    return [_KNOWN_TICKERS[t] for t in tickers], tickers
+
+
+def _match_company_names(query: str, config) -> tuple[list[str], list[str]] | None:
+    """Resolve companies from ticker_map names, e.g. "Compare Datadog to Dynatrace".
+
+    Needs at least two distinct tickers and nothing else company-like in the
+    query ("Datadog, Dynatrace and New Relic"); anything else is left to the LLM.
+    """
+    tickers = config.find_tickers(query)
+    if len(tickers) < 2 or _names_other_companies(config.strip_company_names(query)):
+        return None
+    return [_KNOWN_TICKERS.get(t, t) for t in tickers], tickers
+
+
+async def _collect_agent_results(tasks_by_agent: dict[str, asyncio.Task], event_prefix: str) -> dict[str, dict]:
+    """Await sub-agent tasks, handling each result as soon as it lands.
+
+    Failures become ``{"error": ..., "response": ""}`` dicts. When the
+    ``_AGENT_TIMEOUT_S`` budget runs out, agents that already finished keep
+    their results and only the stragglers are cancelled and marked as timed out.
+    """
+    agent_of = {task: name for name, task in tasks_by_agent.items()}
+    results: dict[str, dict] = {}
+    pending = set(agent_of)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + _AGENT_TIMEOUT_S
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=max(deadline - loop.time(), 0), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                agent_name = agent_of[task]
+                exc = asyncio.CancelledError("cancelled") if task.cancelled() else task.exception()
+                if exc is not None:
+                    error = "Timeout" if isinstance(exc, TimeoutError) else str(exc)
+                    logger.error(f"{event_prefix}.{agent_name}_error", error=error)
+                    results[agent_name] = {"error": error, "response": ""}
+                else:
+                    results[agent_name] = task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if pending:
+        logger.error(f"{event_prefix}.timeout", agents=[agent_of[task] for task in pending])
+        for task in pending:
+            results[agent_of[task]] = {"error": "Timeout", "response": ""}
+    return results
+
+
+def _notify_done(task: asyncio.Task, callback: Any, agent_name: str, detail: str) -> None:
+    """Report ``agent_name`` as done from the event loop as soon as ``task`` finishes."""
+    task.add_done_callback(lambda _t: callback({"stage": agent_name, "status": "done", "detail": detail}))
+
+
 def create_manager_agent():
     """Create the manager orchestration agent."""
+    # Deferred: langgraph is only needed to build the graph, not to import this module
+    from langgraph.graph import END, StateGraph
+
     config = get_config()
 
     # Initialize the LLM
-    llm = ChatAnthropic(
-        model=config.model_name,
-        temperature=config.model_temperature,
-        api_key=config.anthropic_api_key,
-    )
+    llm = get_llm()
+    max_parallel_agents = config.manager_max_parallel_agents
+    # Fallback research set, also used to start sub-agents speculatively during the parse LLM call
+    default_companies = list(config.default_companies or [])
+    default_tickers = list(dict.fromkeys(t for c in default_companies if (t := config.get_ticker(c))))
 
     def route_request(state: ManagerState) -> dict:
         """Classify query and determine execution path."""
@@ -66,7 +253,7 @@ def create_manager_agent():
         user_query = state["user_query"]
         callback = state.get("progress_callback")
 
-        if callback:
+        if callback is not None:
             callback({"stage": "route", "status": "running", "detail": "Classifying query..."})
 
         logger.info("manager.route.start", query=user_query, has_prior=bool(prior_report))
@@ -82,7 +269,7 @@ def create_manager_agent():
             query_type=query_type,
             agents_needed=agents_needed,
         )
-        if callback:
+        if callback is not None:
             callback(
                 {
                     "stage": "route",
@@ -99,78 +286,98 @@ def create_manager_agent():
             "focused_task": focused_task,
         }
 
-    def parse_request(state: ManagerState) -> dict:
+    async def _parse_query_cached(query: str) -> ParseResult:
+        """Extract (companies, tickers) from a query with the LLM.
+
+        Results are kept in the shared parse cache, so repeated or
+        near-duplicate queries skip the LLM round trip. Errors propagate
+        instead of returning defaults, so a failed parse is never cached.
+        """
+        if (cached := parse_cache.get(query)) is not None:
+            logger.info("manager.parse.cache_hit", query=query)
+            return cached
+
+        response = await llm.ainvoke([_PARSE_SYSTEM_MESSAGE, HumanMessage(content="Request: " + query)])
+
+        parsed = serialization.loads_fenced(response.content)
+        result = tuple(parsed.get("companies", [])), tuple(parsed.get("tickers", []))
+        parse_cache.set(query, result)
+        return result
+
+    def _run_semaphore(run_id: str) -> asyncio.Semaphore:
+        """The run's shared sub-agent pool, created on first use."""
+        if (sem := _run_semaphores.get(run_id)) is None:
+            sem = _run_semaphores[run_id] = asyncio.Semaphore(max_parallel_agents)
+        return sem
+
+    def _start_speculative_agents(run_id: str) -> dict[str, asyncio.Task]:
+        """Launch the default-company sub-agents so they overlap the parse LLM call."""
+        if not default_companies:
+            return {}
+        sem = _run_semaphore(run_id)
+        return {
+            agent: asyncio.create_task(
+                _run_bounded(sem, agent, _task_text(agent, default_companies), default_companies, default_tickers)
+            )
+            for agent in _SPECULATIVE_AGENTS
+        }
+
+    async def parse_request(state: ManagerState) -> dict:
         """Parse the user request to identify companies and create task plan."""
         user_query = state["user_query"]
         callback = state.get("progress_callback")
 
-        if callback:
+        if callback is not None:
             callback({"stage": "parse", "status": "running", "detail": "Analyzing query..."})
 
         logger.info("manager.parse.start", query=user_query)
 
-        # Use LLM to parse the request
-        parse_prompt = f"""Analyze this research request and extract:
-1. Companies to analyze
-2. Stock tickers (CSCO for Cisco/Splunk/AppDynamics, DDOG for DataDog, DT for Dynatrace)
-3. Research focus areas
-
-Request: {user_query}
-
-Respond with JSON only:
-{{
-    "companies": ["Company1", "Company2"],
-    "tickers": ["TICK1", "TICK2"],
-    "focus": "Brief description of research focus"
-}}"""
-
+        run_id = state["run_id"]
+        speculative: dict[str, asyncio.Task] = {}
         try:
-            response = llm.invoke([{"role": "user", "content": parse_prompt}])
-
-            # Try to parse JSON from response
-            content = response.content
-            # Handle potential markdown code blocks
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-
-            parsed = json.loads(content.strip())
-            companies = parsed.get("companies", [])
-            tickers = parsed.get("tickers", [])
-        except (json.JSONDecodeError, IndexError):
+            if matched := _match_known_tickers(user_query):
+                companies, tickers = matched
+                logger.info("manager.parse.ticker_fast_path", tickers=tickers)
+            elif matched := _match_company_names(user_query, config):
+                companies, tickers = matched
+                logger.info("manager.parse.name_fast_path", tickers=tickers)
+            else:
+                speculative = _speculative_tasks[run_id] = _start_speculative_agents(run_id)
+                try:
+                    parsed = await _parse_query_cached(user_query)
+                except asyncio.CancelledError:
+                    # The run is gone; don't leave its head start spending LLM and search calls
+                    _cancel_speculative(run_id)
+                    raise
+                companies, tickers = (list(items) for items in parsed)
+        except serialization.JSONDecodeError:
             logger.warning("manager.parse.json_error", query=user_query)
-            companies = ["Cisco (Splunk/AppDynamics)", "DataDog", "Dynatrace"]
-            tickers = ["CSCO", "DDOG", "DT"]
+            companies, tickers = [], []
         except Exception as e:
             logger.error("manager.parse.llm_error", error=str(e))
-            companies = ["Cisco (Splunk/AppDynamics)", "DataDog", "Dynatrace"]
-            tickers = ["CSCO", "DDOG", "DT"]
-
-        # Create tasks for sub-agents
+            companies, tickers = [], []
+
+        # Empty or failed parses fall back to the configured defaults; repeats are dropped in order.
+        # Tickers follow the companies: parsed (e.g. private) companies may rightly have none.
+        if not companies:
+            companies, tickers = default_companies, default_tickers
+        companies = list(dict.fromkeys(companies))
+        tickers = list(dict.fromkeys(tickers))
+
+        # Keep the head start only if the parse landed on the companies we guessed
+        if speculative and (set(companies), set(tickers)) != (set(default_companies), set(default_tickers)):
+            logger.info("manager.parse.speculation_discarded", agents=list(speculative))
+            _cancel_speculative(run_id)
+
+        # One task per sub-agent, sharing a single join of the company list
+        joined = ", ".join(companies)
         tasks = [
-            {
-                "agent": "financial",
-                "task": f"Analyze financial metrics for: {', '.join(companies)}",
-                "companies": companies,
-                "tickers": tickers,
-            },
-            {
-                "agent": "competitor",
-                "task": f"Analyze competitive positioning for: {', '.join(companies)}",
-                "companies": companies,
-                "tickers": tickers,
-            },
-            {
-                "agent": "market_intel",
-                "task": f"Analyze market intelligence and trends for: {', '.join(companies)}",
-                "companies": companies,
-                "tickers": tickers,
-            },
+            {"agent": agent, "task": template.format(joined), "companies": companies, "tickers": tickers}
+            for agent, template in _TASK_TEMPLATES.items()
         ]
 
         logger.info("manager.parse.end", companies=companies, tickers=tickers)
-        if callback:
+        if callback is not None:
             callback({"stage": "parse", "status": "done", "detail": f"Found {len(companies)} companies"})
 
         return {
@@ -188,66 +395,40 @@ Respond with JSON only:
         callback = state.get("progress_callback")
 
         # Update progress
-        if callback:
+        if callback is not None:
             callback({"stage": "financial", "status": "running", "detail": "Fetching market data..."})
             callback({"stage": "competitor", "status": "pending", "detail": "Waiting..."})
             callback({"stage": "market_intel", "status": "pending", "detail": "Waiting..."})
 
         logger.info("manager.execute.start", company_count=len(companies))
 
-        # Run all agents in parallel
-        financial_task = None
-        competitor_task = None
-        market_intel_task = None
-
-        for task in tasks:
-            if task["agent"] == "financial":
-                financial_task = run_financial_agent(task["task"], tickers)
-            elif task["agent"] == "competitor":
-                competitor_task = run_competitor_agent(task["task"], companies)
-            elif task["agent"] == "market_intel":
-                market_intel_task = run_market_intel_agent(task["task"], companies)
-
-        # Start all concurrently
-        if callback:
+        # Fan out through a bounded pool so extra agent types don't stampede the API rate limits;
+        # agents parse_request already started hold or wait for slots in the same pool
+        reused = _speculative_tasks.pop(state["run_id"], {})
+        sem = _run_semaphore(state["run_id"])
+        runnable = [task for task in tasks if task["agent"] in _AGENT_DISPATCH]
+        agent_tasks = {
+            task["agent"]: reused.get(task["agent"])
+            or asyncio.create_task(_run_bounded(sem, task["agent"], task["task"], companies, tickers))
+            for task in runnable
+        }
+        if reused:
+            logger.info("manager.execute.speculation_reused", agents=list(reused))
+
+        # Start all concurrently; each stage flips to done as its own agent finishes
+        if callback is not None:
             callback({"stage": "competitor", "status": "running", "detail": "Searching competitive landscape..."})
             callback({"stage": "market_intel", "status": "running", "detail": "Scanning market trends..."})
+            for agent_name, agent_task in agent_tasks.items():
+                _notify_done(agent_task, callback, agent_name, _DONE_DETAIL[agent_name])
 
-        async def _noop():
-            return None
+        agent_results = await _collect_agent_results(agent_tasks, "manager.execute")
 
-        try:
-            financial_results, competitor_results, market_intel_results = await asyncio.wait_for(
-                asyncio.gather(
-                    financial_task if financial_task else _noop(),
-                    competitor_task if competitor_task else _noop(),
-                    market_intel_task if market_intel_task else _noop(),
-                    return_exceptions=True,
-                ),
-                timeout=300,
-            )
-        except asyncio.TimeoutError:
-            logger.error("manager.execute.timeout")
-            financial_results = {"error": "Timeout", "response": ""}
-            competitor_results = {"error": "Timeout", "response": ""}
-            market_intel_results = {"error": "Timeout", "response": ""}
-
-        # Handle individual agent exceptions returned by gather(return_exceptions=True)
-        if isinstance(financial_results, BaseException):
-            logger.error("manager.execute.financial_error", error=str(financial_results))
-            financial_results = {"error": str(financial_results), "response": ""}
-        if isinstance(competitor_results, BaseException):
-            logger.error("manager.execute.competitor_error", error=str(competitor_results))
-            competitor_results = {"error": str(competitor_results), "response": ""}
-        if isinstance(market_intel_results, BaseException):
-            logger.error("manager.execute.market_intel_error", error=str(market_intel_results))
-            market_intel_results = {"error": str(market_intel_results), "response": ""}
+        financial_results = agent_results.get("financial")
+        competitor_results = agent_results.get("competitor")
+        market_intel_results = agent_results.get("market_intel")
 
         logger.info("manager.execute.end")
-        if callback:
-            callback({"stage": "financial", "status": "done", "detail": "Financial analysis complete"})
-            callback({"stage": "competitor", "status": "done", "detail": "Competitor research complete"})
-            callback({"stage": "market_intel", "status": "done", "detail": "Market intelligence complete"})
 
         return {
             "financial_results": financial_results,
@@ -256,7 +437,7 @@ Respond with JSON only:
             "status": "tasks_completed",
         }
 
-    def synthesize_report(state: ManagerState) -> dict:
+    async def synthesize_report(state: ManagerState) -> dict:
         """Synthesize final report from agent outputs."""
         user_query = state["user_query"]
         companies = state["companies"]
@@ -265,25 +446,33 @@ Respond with JSON only:
         market_intel_results = state["market_intel_results"]
         callback = state.get("progress_callback")
 
-        if callback:
+        if callback is not None:
             callback({"stage": "synthesize", "status": "running", "detail": "Writing final report..."})
 
+        # Stream the report to the caller as it is written instead of after the last token
+        on_token = None
+        if callback is not None:
+
+            def on_token(token: str) -> None:
+                callback({"stage": "synthesize", "status": "streaming", "token": token})
+
         logger.info("manager.synthesize.start")
         try:
-            report = generate_report(
+            report = await agenerate_report(
                 query=user_query,
                 companies=companies,
                 financial_data=financial_results,
                 competitor_data=competitor_results,
                 market_intel_data=market_intel_results,
                 llm=llm,
+                on_token=on_token,
             )
         except Exception as e:
             logger.error("manager.synthesize.error", error=str(e))
             report = f"# Error Generating Report\n\nAn error occurred during report synthesis: {e}"
 
         logger.info("manager.synthesize.end")
-        if callback:
+        if callback is not None:
             callback({"stage": "synthesize", "status": "done", "detail": "Report ready"})
 
         return {
@@ -305,51 +494,24 @@ Respond with JSON only:
 
         logger.info("manager.execute_followup.start", agents=agents_needed)
 
-        async def _noop():
-            return None
-
-        coros = []
-        agent_order = []
+        sem = _run_semaphore(state["run_id"])
+        agent_tasks = {}
 
         for agent_name in agents_needed:
+            if agent_name not in _AGENT_DISPATCH:
+                continue
             task_str = build_focused_task(agent_name, focused_task_str, prior_report or "", companies)
+            if callback is not None:
+                callback({"stage": agent_name, "status": "running", "detail": _FOLLOWUP_RUNNING_DETAIL[agent_name]})
+            agent_tasks[agent_name] = asyncio.create_task(_run_bounded(sem, agent_name, task_str, companies, tickers))
+            if callback is not None:
+                _notify_done(agent_tasks[agent_name], callback, agent_name, f"{agent_name} follow-up complete")
 
-            if agent_name == "financial":
-                if callback:
-                    callback({"stage": "financial", "status": "running", "detail": "Re-checking financials..."})
-                coros.append(run_financial_agent(task_str, tickers))
-                agent_order.append("financial")
-            elif agent_name == "competitor":
-                if callback:
-                    callback({"stage": "competitor", "status": "running", "detail": "Digging deeper on competitors..."})
-                coros.append(run_competitor_agent(task_str, companies))
-                agent_order.append("competitor")
-            elif agent_name == "market_intel":
-                if callback:
-                    callback({"stage": "market_intel", "status": "running", "detail": "Fetching market updates..."})
-                coros.append(run_market_intel_agent(task_str, companies))
-                agent_order.append("market_intel")
-
-        if not coros:
+        if not agent_tasks:
             return {"status": "followup_no_agents"}
 
-        try:
-            results = await asyncio.wait_for(
-                asyncio.gather(*coros, return_exceptions=True),
-                timeout=300,
-            )
-        except asyncio.TimeoutError:
-            logger.error("manager.execute_followup.timeout")
-            results = [{"error": "Timeout", "response": ""} for _ in coros]
-
-        new_results = {}
-        for agent_name, result in zip(agent_order, results):
-            if isinstance(result, BaseException):
-                logger.error(f"manager.execute_followup.{agent_name}_error", error=str(result))
-                result = {"error": str(result), "response": ""}
-            new_results[f"{agent_name}_results"] = result
-            if callback:
-                callback({"stage": agent_name, "status": "done", "detail": f"{agent_name} follow-up complete"})
+        agent_results = await _collect_agent_results(agent_tasks, "manager.execute_followup")
+        new_results = {f"{agent_name}_results": result for agent_name, result in agent_results.items()}
 
         # Store companies/tickers in state for downstream use
         logger.info("manager.execute_followup.end")
@@ -369,7 +531,7 @@ Respond with JSON only:
         prior_results = state.get("prior_results")
         callback = state.get("progress_callback")
 
-        if callback:
+        if callback is not None:
             callback({"stage": "synthesize", "status": "running", "detail": "Composing follow-up answer..."})
 
         logger.info("manager.synthesize_followup.start")
@@ -392,7 +554,7 @@ Respond with JSON only:
         )
 
         logger.info("manager.synthesize_followup.end")
-        if callback:
+        if callback is not None:
             callback({"stage": "synthesize", "status": "done", "detail": "Follow-up ready"})
 
         # Carry forward companies/tickers from prior_results if not already set
@@ -456,44 +618,26 @@ Respond with JSON only:
     return workflow.compile()
 
 
-# Create the agent instance
-_manager_agent = None
-
-
+@cache
 def get_manager_agent():
     """Get or create the manager agent instance."""
-    global _manager_agent
-    if _manager_agent is None:
-        _manager_agent = create_manager_agent()
-    return _manager_agent
+    return create_manager_agent()
 
 
-async def run_manager_agent(
+async def _run_graph(
     query: str,
-    progress_callback: Any | None = None,
-    prior_report: str | None = None,
-    prior_results: dict | None = None,
+    emit: Callable[[dict], None] | None,
+    prior_report: str | None,
+    prior_results: dict | None,
 ) -> dict:
-    """
-    Run the manager agent to orchestrate research.
-
-    Args:
-        query: User's research query
-        progress_callback: Optional callback function for progress updates
-        prior_report: Previous report markdown (enables follow-up routing)
-        prior_results: Previous agent results dict (enables context-only follow-ups)
-
-    Returns:
-        Dict with keys: final_report, companies, tickers, financial_results,
-        competitor_results, market_intel_results, query_type, followup_agents.
-    """
+    """Invoke the manager graph; ``emit`` must not block, as nodes call it inline."""
     logger.info("manager_agent.run.start", query=query, has_prior=bool(prior_report))
+    run_id = uuid.uuid4().hex
     try:
         agent = get_manager_agent()
 
         # Initialize state
         initial_state = {
-            "messages": [],
             "user_query": query,
             "companies": [],
             "tickers": [],
@@ -503,7 +647,8 @@ async def run_manager_agent(
             "market_intel_results": None,
             "final_report": "",
             "status": "started",
-            "progress_callback": progress_callback,
+            "progress_callback": emit,
+            "run_id": run_id,
             # Follow-up context
             "prior_report": prior_report,
             "prior_results": prior_results,
@@ -539,6 +684,79 @@ async def run_manager_agent(
             "query_type": "new_research",
             "followup_agents": [],
         }
+    finally:
+        # Covers a cancel or failure between parse_request starting agents and execute_tasks claiming them
+        _cancel_speculative(run_id)
+        _run_semaphores.pop(run_id, None)
+
+
+async def run_manager_agent(
+    query: str,
+    progress_callback: Any | None = None,
+    prior_report: str | None = None,
+    prior_results: dict | None = None,
+) -> dict:
+    """
+    Run the manager agent to orchestrate research.
+
+    Args:
+        query: User's research query
+        progress_callback: Optional callback function for progress updates
+        prior_report: Previous report markdown (enables follow-up routing)
+        prior_results: Previous agent results dict (enables context-only follow-ups)
+
+    Returns:
+        Dict with keys: final_report, companies, tickers, financial_results,
+        competitor_results, market_intel_results, query_type, followup_agents.
+    """
+    if progress_callback is None:
+        return await _run_graph(query, None, prior_report, prior_results)
+
+    # Nodes report through the pump so a slow UI callback never blocks the graph
+    pump = ProgressPump(progress_callback)
+    try:
+        return await _run_graph(query, pump.emit, prior_report, prior_results)
+    finally:
+        await pump.aclose()
+
+
+async def run_manager_agent_stream(
+    query: str,
+    prior_report: str | None = None,
+    prior_results: dict | None = None,
+) -> AsyncIterator[dict]:
+    """Run the manager agent, yielding its progress as it happens.
+
+    Yields ``{"type": "stage", "stage": ..., "status": ..., ...}`` for stage
+    updates, ``{"type": "token", "text": ...}`` for each chunk of the report
+    as it is written, and finally ``{"type": "final", "report": ...,
+    "result": ...}`` where ``result`` is the dict ``run_manager_agent`` returns.
+    Closing the iterator early cancels the run.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def emit(update: dict) -> None:
+        # Queueing never blocks, so nodes skip the ProgressPump; they may call this from executor threads
+        if update.get("status") == "streaming":
+            event = {"type": "token", "text": update.get("token", "")}
+        else:
+            event = {"type": "stage", **update}
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    # Loop callbacks run in the order they were scheduled, so every event is queued before _RUN_DONE
+    run = asyncio.create_task(_run_graph(query, emit, prior_report, prior_results))
+    run.add_done_callback(lambda _: events.put_nowait(_RUN_DONE))
+    try:
+        while (event := await events.get()) is not _RUN_DONE:
+            yield event
+    finally:
+        if not run.done():
+            run.cancel()
+            await asyncio.wait([run])
+
+    result = run.result()
+    yield {"type": "final", "report": result["final_report"], "result": result}
 
 
 def extract_tool_call_summary(agent_output: dict) -> dict:
@@ -560,4 +778,18 @@ def run_manager_agent_sync(
     prior_results: dict | None = None,
 ) -> str:
     """Synchronous wrapper for run_manager_agent."""
-    return asyncio.run(run_manager_agent(query, progress_callback, prior_report, prior_results))
+    return run_sync(run_manager_agent(query, progress_callback, prior_report, prior_results))
+
+
+def run_manager_agent_iter(
+    query: str,
+    prior_report: str | None = None,
+    prior_results: dict | None = None,
+    idle_timeout: float | None = None,
+) -> Iterator[dict | None]:
+    """Synchronous wrapper for run_manager_agent_stream; yields the same events.
+
+    With ``idle_timeout`` set, also yields ``None`` after each quiet spell of
+    that many seconds (see ``iter_sync``).
+    """
+    return iter_sync(run_manager_agent_stream(query, prior_report, prior_results), idle_timeout)
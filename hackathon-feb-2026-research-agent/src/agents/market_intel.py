@@ -1,14 +1,15 @@
 """Market Intelligence Agent - analyzes market sizing, forecasts, news, and sentiment."""
 
+import operator
+from functools import cache
 from typing import Annotated, Any, TypedDict
 
-from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 
-from ..config import get_config
+from ..llm import cached_system_message, get_llm
 from ..prompts.market_intel_prompt import MARKET_INTEL_SYSTEM_PROMPT
 from ..tools.market_intel_tools import (
     search_analyst_sentiment,
@@ -16,12 +17,15 @@ from ..tools.market_intel_tools import (
     search_market_size,
     search_recent_news,
 )
+from ..utils.event_loop import run_sync
+from ._message_utils import logging_tool_node
 
 
 class MarketIntelState(TypedDict):
     """State for market intelligence agent."""
 
     messages: Annotated[list, add_messages]
+    tool_calls: Annotated[list[dict], operator.add]
     companies: list[str]
 
 
@@ -32,67 +36,33 @@ MARKET_INTEL_TOOLS = [
     search_recent_news,
     search_analyst_sentiment,
 ]
+_MARKET_INTEL_TOOL_NODE = ToolNode(MARKET_INTEL_TOOLS)
 
-
-def _extract_tool_calls(messages: list) -> list[dict]:
-    """Extract tool call details from LangGraph message history."""
-    tool_calls = []
-    pending = {}
-    for msg in messages:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                pending[tc["id"]] = {
-                    "tool": tc["name"],
-                    "args": tc["args"],
-                }
-        if msg.__class__.__name__ == "ToolMessage":
-            call_id = getattr(msg, "tool_call_id", None)
-            if call_id and call_id in pending:
-                info = pending.pop(call_id)
-                content = msg.content if hasattr(msg, "content") else str(msg)
-                if isinstance(content, str) and len(content) > 200:
-                    content = content[:200] + "..."
-                tool_calls.append(
-                    {
-                        "tool": info["tool"],
-                        "args": info["args"],
-                        "result_preview": content,
-                    }
-                )
-    return tool_calls
+# Shared by every market intel run
+_MARKET_INTEL_SYSTEM_MESSAGE = cached_system_message(MARKET_INTEL_SYSTEM_PROMPT, id="market_intel-system")
 
 
 def create_market_intel_agent():
     """Create the market intelligence agent."""
-    config = get_config()
-
     # Initialize the LLM with tools
-    llm = ChatAnthropic(
-        model=config.model_name,
-        temperature=config.model_temperature,
-        api_key=config.anthropic_api_key,
-    )
+    llm = get_llm()
     llm_with_tools = llm.bind_tools(MARKET_INTEL_TOOLS)
 
-    # Create tool node
-    tool_node = ToolNode(MARKET_INTEL_TOOLS)
-
     def should_continue(state: MarketIntelState) -> str:
         """Determine if agent should continue or end."""
         messages = state["messages"]
         last_message = messages[-1]
 
         # If LLM makes a tool call, continue to tools
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
+        if getattr(last_message, "tool_calls", None):
             return "tools"
 
         # Otherwise, end
         return END
 
-    def call_model(state: MarketIntelState) -> dict:
+    async def call_model(state: MarketIntelState) -> dict:
         """Call the LLM."""
-        messages = state["messages"]
-        response = llm_with_tools.invoke(messages)
+        response = await llm_with_tools.ainvoke(state["messages"])
         return {"messages": [response]}
 
     # Build the graph
@@ -100,7 +70,7 @@ def create_market_intel_agent():
 
     # Add nodes
     workflow.add_node("agent", call_model)
-    workflow.add_node("tools", tool_node)
+    workflow.add_node("tools", logging_tool_node(_MARKET_INTEL_TOOL_NODE))
 
     # Set entry point
     workflow.set_entry_point("agent")
@@ -112,16 +82,10 @@ def create_market_intel_agent():
     return workflow.compile()
 
 
-# Create the agent instance
-_market_intel_agent = None
-
-
+@cache
 def get_market_intel_agent():
     """Get or create the market intelligence agent instance."""
-    global _market_intel_agent
-    if _market_intel_agent is None:
-        _market_intel_agent = create_market_intel_agent()
-    return _market_intel_agent
+    return create_market_intel_agent()
 
 
 async def run_market_intel_agent(task: str, companies: list[str] | None = None) -> dict[str, Any]:
@@ -144,7 +108,7 @@ async def run_market_intel_agent(task: str, companies: list[str] | None = None)
         company_info = ""
 
     messages = [
-        SystemMessage(content=MARKET_INTEL_SYSTEM_PROMPT),
+        _MARKET_INTEL_SYSTEM_MESSAGE,
         HumanMessage(content=f"{task}{company_info}"),
     ]
 
@@ -159,8 +123,8 @@ async def run_market_intel_agent(task: str, companies: list[str] | None = None)
     # Extract the final response
     final_message = result["messages"][-1]
 
-    # Extract tool call log from message history
-    tool_calls = _extract_tool_calls(result["messages"])
+    # Tool call log accumulated by the tools node
+    tool_calls = result.get("tool_calls", [])
 
     return {
         "task": task,
@@ -173,6 +137,4 @@ async def run_market_intel_agent(task: str, companies: list[str] | None = None)
 
 def run_market_intel_agent_sync(task: str, companies: list[str] | None = None) -> dict[str, Any]:
     """Synchronous wrapper for run_market_intel_agent."""
-    import asyncio
-
-    return asyncio.run(run_market_intel_agent(task, companies))
+    return run_sync(run_market_intel_agent(task, companies))
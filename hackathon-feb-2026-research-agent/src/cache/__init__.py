@@ -0,0 +1,7 @@
+"""Caches for expensive LLM and external API round trips (in-process, plus one on-disk store)."""
+
+from .parse_cache import ParseCache, normalize_query, parse_cache
+from .report_store import ReportStore
+from .ttl import TTLCache, clear_caches, ttl_cache
+
+__all__ = ["ParseCache", "ReportStore", "TTLCache", "clear_caches", "normalize_query", "parse_cache", "ttl_cache"]
@@ -0,0 +1,46 @@
+"""Cache of manager parse results keyed on a normalized query."""
+
+import hashlib
+import re
+
+from .ttl import TTLCache
+
+# (companies, tickers) as returned by the manager's parse step
+ParseResult = tuple[tuple[str, ...], tuple[str, ...]]
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+# Connectives that don't change which companies a comparison query is about
+_CONNECTIVES = {"to": "vs", "versus": "vs", "against": "vs", "and": "vs", "with": "vs"}
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, punctuation, whitespace and comparison connectives.
+
+    "Compare Cisco vs. Datadog" and "compare cisco to datadog" normalize to
+    the same string.
+    """
+    words = _PUNCT_RE.sub(" ", query.lower()).split()
+    return " ".join(_CONNECTIVES.get(word, word) for word in words)
+
+
+def _key(query: str) -> str:
+    return hashlib.blake2b(normalize_query(query).encode(), digest_size=16).hexdigest()
+
+
+class ParseCache(TTLCache):
+    """TTL LRU of parse results, keyed by a hash of the normalized query."""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 86400.0):
+        super().__init__(maxsize, ttl)
+
+    def get(self, query: str) -> ParseResult | None:
+        """Return the cached result for ``query``, or None on a miss or expiry."""
+        return super().get(_key(query))
+
+    def set(self, query: str, result: ParseResult) -> None:
+        """Store ``result`` for ``query``, evicting the least recently used entry if full."""
+        super().set(_key(query), result)
+
+
+# Shared by every manager graph in the process
+parse_cache = ParseCache()
@@ -0,0 +1,82 @@
+"""On-disk store of finished research runs, shared across processes and sessions."""
+
+import hashlib
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+from ..logging_config import get_logger
+from ..utils import serialization
+from .parse_cache import normalize_query
+
+logger = get_logger(__name__)
+
+# Part of every key: bump when prompts or the manager's output shape change so stale runs miss
+AGENT_VERSION = "1"
+
+
+def _key(query: str) -> str:
+    return hashlib.sha256(f"{AGENT_VERSION}|{normalize_query(query)}".encode()).hexdigest()
+
+
+class ReportStore:
+    """SQLite-backed TTL store of ``run_manager_agent`` outputs, keyed on the normalized query.
+
+    Every call opens its own short-lived connection, so one store can be
+    shared between threads and several processes can point at the same file.
+    Storage errors are logged and treated as misses; the store never fails a run.
+    If the file can't be created (e.g. an unwritable path) the store is
+    disabled: ``enabled`` is False, ``get`` always misses and writes are dropped.
+    """
+
+    def __init__(self, path: str | Path, ttl: float = 86400.0):
+        self.path = Path(path)
+        self.ttl = ttl
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.path)) as conn, conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS reports (key TEXT PRIMARY KEY, expires_at REAL, value TEXT)")
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("report_store.init.error", path=str(self.path), error=str(e))
+            self.enabled = False
+        else:
+            self.enabled = True
+
+    def get(self, query: str) -> dict | None:
+        """Return the stored output for ``query``, or None on a miss or expiry."""
+        if not self.enabled:
+            return None
+        try:
+            with closing(sqlite3.connect(self.path)) as conn:
+                row = conn.execute(
+                    "SELECT value FROM reports WHERE key = ? AND expires_at > ?", (_key(query), time.time())
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("report_store.get.error", error=str(e))
+            return None
+        return serialization.loads(row[0]) if row else None
+
+    def set(self, query: str, output: dict) -> None:
+        """Store ``output`` for ``query``, dropping any entries that have expired."""
+        if not self.enabled:
+            return
+        now = time.time()
+        try:
+            with closing(sqlite3.connect(self.path)) as conn, conn:
+                conn.execute("DELETE FROM reports WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO reports VALUES (?, ?, ?)",
+                    (_key(query), now + self.ttl, serialization.dumps(output)),
+                )
+        except (sqlite3.Error, TypeError) as e:  # TypeError: output isn't JSON-serializable
+            logger.warning("report_store.set.error", error=str(e))
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            with closing(sqlite3.connect(self.path)) as conn, conn:
+                conn.execute("DELETE FROM reports")
+        except sqlite3.Error as e:
+            logger.warning("report_store.clear.error", error=str(e))
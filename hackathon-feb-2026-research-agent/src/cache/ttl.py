@@ -0,0 +1,85 @@
+"""Thread-safe TTL + LRU caching for external API round trips."""
+
+import functools
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_MISSING = object()
+
+# Every live cache, so tests can reset them all between cases
+_caches: "weakref.WeakSet[TTLCache]" = weakref.WeakSet()
+
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries expire ``ttl`` seconds after they are stored."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        _caches.add(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value stored under ``key``, or ``default`` on a miss or expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def ttl_cache(maxsize: int = 256, ttl: float = 600.0) -> Callable[[F], F]:
+    """Memoize a function on its positional arguments for ``ttl`` seconds.
+
+    List arguments are keyed as tuples. Calls that raise are not cached, so a
+    transient failure is retried on the next call. Cached values are shared
+    between callers and must not be mutated. The wrapper exposes
+    ``cache_clear()``.
+    """
+
+    def decorator(fn: F) -> F:
+        cache = TTLCache(maxsize, ttl)
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            key = tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args)
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = fn(*args)
+                cache.set(key, value)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def clear_caches() -> None:
+    """Empty every TTLCache in the process (used to isolate tests)."""
+    for cache in list(_caches):
+        cache.clear()
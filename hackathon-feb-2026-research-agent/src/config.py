@@ -1,21 +1,42 @@
 """Configuration management for research agent team."""
 
 import os
-from dataclasses import dataclass
+import re
+import tempfile
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
 
 from dotenv import load_dotenv
 
 from .logging_config import get_logger
 
-# Load environment variables
-load_dotenv()
-
 logger = get_logger(__name__)
 
+_dotenv_loaded = False
+
+_DEFAULT_REPORT_CACHE_PATH = str(Path(tempfile.gettempdir()) / "rumble-reports.sqlite3")
+
+
+def load_env() -> None:
+    """Load .env once, before the first reader of the environment (Config.from_env(), the Tavily clients)."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Application configuration."""
+    """Application configuration.
+
+    Immutable once built; use ``Config.from_env()`` to read the environment, or
+    ``dataclasses.replace`` to derive a variant. Hashable, so it can key caches:
+    ``ticker_map`` still takes part in ``==`` but is left out of the hash,
+    since mappings are not hashable.
+    """
 
     # API Keys
     anthropic_api_key: str = ""
@@ -25,40 +46,74 @@ class Config:
     model_name: str = "claude-sonnet-4-20250514"
     model_temperature: float = 0.0
 
+    # Anthropic HTTP settings (seconds / attempts) for the shared LLM client
+    llm_request_timeout: float = 120.0
+    llm_max_retries: int = 2
+
+    # Upper bound on sub-agents the manager runs at once
+    manager_max_parallel_agents: int = 4
+
+    # SQLite file where the UI keeps finished runs across sessions; empty disables it
+    report_cache_path: str = _DEFAULT_REPORT_CACHE_PATH
+
     # LangSmith tracing (optional)
     langsmith_tracing: bool = False
     langsmith_api_key: str = ""
     langsmith_project: str = "rivalry-rumble-o-tron"
 
     # Default companies for observability analysis
-    default_companies: list = None
-
-    # Ticker mappings
-    ticker_map: dict = None
+    default_companies: tuple[str, ...] = ("Cisco (Splunk/AppDynamics)", "DataDog", "Dynatrace")
 
-    def __post_init__(self):
-        # Load API keys from environment
-        self.anthropic_api_key = os.getenv("ANTHROPIC_API_KEY", "")
-        self.tavily_api_key = os.getenv("TAVILY_API_KEY", "")
-
-        # Load LangSmith config from environment
-        self.langsmith_tracing = os.getenv("LANGCHAIN_TRACING_V2", "false").lower() == "true"
-        self.langsmith_api_key = os.getenv("LANGCHAIN_API_KEY", "")
-        self.langsmith_project = os.getenv("LANGSMITH_PROJECT", "rivalry-rumble-o-tron")
-
-        # Default companies for demo
-        if self.default_companies is None:
-            self.default_companies = ["Cisco (Splunk/AppDynamics)", "DataDog", "Dynatrace"]
-
-        # Ticker mappings for financial data
-        if self.ticker_map is None:
-            self.ticker_map = {
+    # Ticker mappings for financial data (read-only view; keys are lowercase)
+    ticker_map: Mapping[str, str] = field(
+        default_factory=lambda: MappingProxyType(
+            {
                 "cisco": "CSCO",
                 "splunk": "CSCO",  # Acquired by Cisco
                 "appdynamics": "CSCO",  # Acquired by Cisco
                 "datadog": "DDOG",
                 "dynatrace": "DT",
             }
+        ),
+        hash=False,
+    )
+
+    # Case-insensitive alternations over ticker_map keys, longest first (built in __post_init__):
+    # any substring for get_ticker, whole words only for find_tickers
+    _ticker_key_re: re.Pattern = field(init=False, repr=False, compare=False)
+    _ticker_name_re: re.Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # A plain dict passed in is copied behind a read-only view, so the instance stays immutable
+        if not isinstance(self.ticker_map, MappingProxyType):
+            object.__setattr__(self, "ticker_map", MappingProxyType(dict(self.ticker_map)))
+        keys = "|".join(map(re.escape, sorted(self.ticker_map, key=len, reverse=True)))
+        object.__setattr__(self, "_ticker_key_re", re.compile(keys, re.IGNORECASE))
+        object.__setattr__(self, "_ticker_name_re", re.compile(rf"\b({keys})\b", re.IGNORECASE))
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] | None = None) -> "Config":
+        """Build the configuration from environment variables (and .env).
+
+        Pass ``env`` to read from that mapping instead; .env and os.environ are
+        then left untouched.
+        """
+        if env is None:
+            load_env()
+            env = os.environ
+        return cls(
+            anthropic_api_key=env.get("ANTHROPIC_API_KEY", ""),
+            tavily_api_key=env.get("TAVILY_API_KEY", ""),
+            report_cache_path=env.get("REPORT_CACHE_PATH", _DEFAULT_REPORT_CACHE_PATH),
+            langsmith_tracing=env.get("LANGCHAIN_TRACING_V2", "false").lower() == "true",
+            langsmith_api_key=env.get("LANGCHAIN_API_KEY", ""),
+            langsmith_project=env.get("LANGSMITH_PROJECT", "rivalry-rumble-o-tron"),
+        )
+
+    @property
+    def is_valid(self) -> bool:
+        """True when both required API keys are set; a cheap check for callers on hot paths."""
+        return bool(self.anthropic_api_key and self.tavily_api_key)
 
     def validate(self) -> list[str]:
         """Validate configuration and return list of errors."""
@@ -91,20 +146,20 @@ class Config:
 
     def get_ticker(self, company_name: str) -> str | None:
         """Get stock ticker for a company name."""
-        name_lower = company_name.lower()
-
-        # Check direct mapping
-        for key, ticker in self.ticker_map.items():
-            if key in name_lower:
-                return ticker
-
+        if match := self._ticker_key_re.search(company_name):
+            return self.ticker_map[match.group().lower()]
         return None
 
+    def find_tickers(self, text: str) -> list[str]:
+        """Tickers for every ticker_map company named in text, deduplicated in mention order."""
+        return list(dict.fromkeys(self.ticker_map[name.lower()] for name in self._ticker_name_re.findall(text)))
 
-# Global config instance
-config = Config()
+    def strip_company_names(self, text: str) -> str:
+        """text with every ticker_map company name blanked out."""
+        return self._ticker_name_re.sub(" ", text)
 
 
+@lru_cache(maxsize=1)
 def get_config() -> Config:
-    """Get the global configuration instance."""
-    return config
+    """Get the global configuration instance, built on first use."""
+    return Config.from_env()
@@ -0,0 +1,5 @@
+"""Shared LLM client for all agents."""
+
+from .client import cached_system_message, get_llm
+
+__all__ = ["cached_system_message", "get_llm"]
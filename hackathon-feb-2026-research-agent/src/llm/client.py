@@ -0,0 +1,47 @@
+"""Process-wide ChatAnthropic instance."""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from langchain_core.messages import SystemMessage
+
+from ..config import get_config
+
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+
+
+@lru_cache(maxsize=1)
+def get_llm() -> "ChatAnthropic":
+    """Return the shared ChatAnthropic client.
+
+    All agents use the same instance so they share one HTTP connection pool.
+    Agents that need tools call ``bind_tools`` on it, which wraps the client
+    without copying it. ChatAnthropic builds its own (process-cached) httpx
+    clients, so only the timeout and retry budget are tunable here.
+    """
+    # Deferred: the Anthropic SDK is the heaviest import and only needed once a client is built
+    from langchain_anthropic import ChatAnthropic
+
+    config = get_config()
+    return ChatAnthropic(
+        model=config.model_name,
+        temperature=config.model_temperature,
+        api_key=config.anthropic_api_key,
+        default_request_timeout=config.llm_request_timeout,
+        max_retries=config.llm_max_retries,
+    )
+
+
+def cached_system_message(text: str, id: str | None = None) -> SystemMessage:
+    """Build a SystemMessage whose text carries an Anthropic prompt-cache breakpoint.
+
+    Anthropic caches the request prefix up to and including this block (tool
+    definitions plus the system prompt), so repeat calls with the same static
+    prompt reuse it instead of re-processing it. Prefixes below the model's
+    minimum cacheable length are sent uncached, so marking short prompts is harmless.
+    """
+    return SystemMessage(
+        content=[{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}],
+        id=id,
+    )
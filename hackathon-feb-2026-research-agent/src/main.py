@@ -3,7 +3,6 @@
 import asyncio
 import sys
 
-from .agents import run_manager_agent
 from .config import get_config
 
 
@@ -19,11 +18,10 @@ def main(query: str | None = None) -> str:
     """
     config = get_config()
 
-    # Validate configuration
-    errors = config.validate()
-    if errors:
+    # Validate configuration; the full check (and its logging) only runs when keys are missing
+    if not config.is_valid:
         print("Configuration errors:")
-        for error in errors:
+        for error in config.validate():
             print(f"  - {error}")
         print("\nPlease set required environment variables in .env file.")
         sys.exit(1)
@@ -38,6 +36,9 @@ def main(query: str | None = None) -> str:
     print(f"Research Query: {query}")
     print("-" * 50)
 
+    # Imported here so config errors are reported without loading the LangChain/LangGraph stack
+    from .agents import run_manager_agent
+
     # Run the manager agent
     result = asyncio.run(run_manager_agent(query))
 
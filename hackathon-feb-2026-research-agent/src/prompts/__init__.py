@@ -7,11 +7,12 @@ from .followup_prompt import (
     FOLLOWUP_SYNTHESIS_PROMPT,
     ROUTE_QUERY_PROMPT,
 )
-from .manager_prompt import MANAGER_SYSTEM_PROMPT
+from .manager_prompt import MANAGER_SYSTEM_PROMPT, PARSE_REQUEST_PROMPT
 from .market_intel_prompt import MARKET_INTEL_SYSTEM_PROMPT
 
 __all__ = [
     "MANAGER_SYSTEM_PROMPT",
+    "PARSE_REQUEST_PROMPT",
     "FINANCIAL_SYSTEM_PROMPT",
     "COMPETITOR_SYSTEM_PROMPT",
     "MARKET_INTEL_SYSTEM_PROMPT",
@@ -1,4 +1,4 @@
-"""Manager agent system prompt."""
+"""Manager agent system and request-parsing prompts."""
 
 MANAGER_SYSTEM_PROMPT = """You are a Research Manager agent coordinating a team of specialized research agents to analyze companies and produce comprehensive research reports.
 
@@ -42,3 +42,16 @@ Your final output should be a comprehensive markdown report with:
 - DataDog (DDOG): Cloud monitoring and security platform
 - Dynatrace (DT): AI-powered observability platform
 """
+
+# Static instructions for parse_request; the user's query follows in its own human message
+PARSE_REQUEST_PROMPT = """Analyze the research request and extract:
+1. Companies to analyze
+2. Stock tickers (CSCO for Cisco/Splunk/AppDynamics, DDOG for DataDog, DT for Dynatrace)
+3. Research focus areas
+
+Respond with JSON only:
+{
+    "companies": ["Company1", "Company2"],
+    "tickers": ["TICK1", "TICK2"],
+    "focus": "Brief description of research focus"
+}"""
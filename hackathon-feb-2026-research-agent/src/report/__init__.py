@@ -1,6 +1,6 @@
 """Report generation for research output."""
 
-from .generator import generate_report
+from .generator import agenerate_report, generate_report
 from .templates import REPORT_TEMPLATE
 
-__all__ = ["generate_report", "REPORT_TEMPLATE"]
+__all__ = ["agenerate_report", "generate_report", "REPORT_TEMPLATE"]
@@ -1,35 +1,54 @@
 """Decision tree visualization — generates a readable text tree from agent metadata."""
 
+from functools import lru_cache
+
+_TOOL_LABELS = {
+    "get_company_financials": "Company Financials",
+    "get_historical_revenue": "Historical Revenue",
+    "get_company_comparison": "Company Comparison",
+    "search_company_info": "Company Info Search",
+    "search_company_info_batch": "Company Info Search (batch)",
+    "search_competitive_analysis": "Competitive Analysis",
+    "search_product_info": "Product Info Search",
+    "search_market_trends": "Market Trends Search",
+    "search_market_size": "Market Size Estimates",
+    "search_industry_forecast": "Industry Forecast",
+    "search_recent_news": "Recent News",
+    "search_analyst_sentiment": "Analyst Sentiment",
+}
+
+
+def _fmt(value) -> str:
+    """Render an arg value, joining lists with commas."""
+    return ", ".join(map(str, value)) if isinstance(value, list) else str(value)
+
+
+def _trunc(text: str, limit: int = 50) -> str:
+    """Clip text to ``limit`` characters, ending in an ellipsis when cut."""
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
 
 def _short_args(args: dict) -> str:
     """Format tool call args into a compact summary."""
-    parts = []
-    for k, v in args.items():
-        if isinstance(v, list):
-            v = ", ".join(str(i) for i in v)
-        v = str(v)
-        if len(v) > 50:
-            v = v[:47] + "..."
-        parts.append(f"{k}={v}")
-    return "  ".join(parts)
+    return "  ".join(f"{k}={_trunc(_fmt(v))}" for k, v in args.items())
 
 
+@lru_cache(maxsize=64)
 def _friendly_tool_name(tool: str) -> str:
     """Convert snake_case tool name to a readable label."""
-    mapping = {
-        "get_company_financials": "Company Financials",
-        "get_historical_revenue": "Historical Revenue",
-        "get_company_comparison": "Company Comparison",
-        "search_company_info": "Company Info Search",
-        "search_competitive_analysis": "Competitive Analysis",
-        "search_product_info": "Product Info Search",
-        "search_market_trends": "Market Trends Search",
-        "search_market_size": "Market Size Estimates",
-        "search_industry_forecast": "Industry Forecast",
-        "search_recent_news": "Recent News",
-        "search_analyst_sentiment": "Analyst Sentiment",
-    }
-    return mapping.get(tool, tool.replace("_", " ").title())
+    return _TOOL_LABELS.get(tool) or tool.replace("_", " ").title()
+
+
+def _render_section(title: str, calls: list[dict]) -> list[str]:
+    """Render one agent's header and tool-call rows, ending with a spacer line."""
+    count = len(calls)
+    rows = [f"🔧 {_friendly_tool_name(tc.get('tool', '?'))}  ({_short_args(tc.get('args', {}))})" for tc in calls]
+    return [
+        f"├── {title} — {count} tool call{'s' if count != 1 else ''}",
+        *(f"│   ├── {row}" for row in rows[:-1]),
+        *(f"│   └── {row}" for row in rows[-1:]),
+        "│",
+    ]
 
 
 def build_decision_tree_markdown(metadata: dict) -> str:
@@ -48,53 +67,21 @@ def build_decision_tree_markdown(metadata: dict) -> str:
     comp_calls = metadata.get("competitor_tool_calls", [])
     market_intel_calls = metadata.get("market_intel_tool_calls", [])
 
-    lines = []
-
-    # Root
-    lines.append("🔷 User Query")
-    lines.append("│")
-
-    # Parse
-    lines.append(f"├── 📋 Parse → {', '.join(companies)}  ·  Tickers: {', '.join(tickers)}")
-    lines.append("│")
-
-    # Parallel split
-    lines.append("├── ⚡ parallel execution")
-    lines.append("│")
-
-    # Number Cruncher
-    lines.append(f"├── 📊 Number Cruncher — {len(fin_calls)} tool call{'s' if len(fin_calls) != 1 else ''}")
-    for i, tc in enumerate(fin_calls):
-        is_last = i == len(fin_calls) - 1
-        prefix = "│   └── " if is_last else "│   ├── "
-        name = _friendly_tool_name(tc.get("tool", "?"))
-        args_str = _short_args(tc.get("args", {}))
-        lines.append(f"{prefix}🔧 {name}  ({args_str})")
-    lines.append("│")
-
-    # Street Scout
-    lines.append(f"├── 🔍 Street Scout — {len(comp_calls)} tool call{'s' if len(comp_calls) != 1 else ''}")
-    for i, tc in enumerate(comp_calls):
-        is_last = i == len(comp_calls) - 1
-        prefix = "│   └── " if is_last else "│   ├── "
-        name = _friendly_tool_name(tc.get("tool", "?"))
-        args_str = _short_args(tc.get("args", {}))
-        lines.append(f"{prefix}🔧 {name}  ({args_str})")
-    lines.append("│")
-
-    # Market Intel Scout
-    mi_count = len(market_intel_calls)
-    mi_suffix = "s" if mi_count != 1 else ""
-    lines.append(f"├── 📈 Market Intel Scout — {mi_count} tool call{mi_suffix}")
-    for i, tc in enumerate(market_intel_calls):
-        is_last = i == len(market_intel_calls) - 1
-        prefix = "│   └── " if is_last else "│   ├── "
-        name = _friendly_tool_name(tc.get("tool", "?"))
-        args_str = _short_args(tc.get("args", {}))
-        lines.append(f"{prefix}🔧 {name}  ({args_str})")
-    lines.append("│")
-
-    # Verdict
-    lines.append("└── 📝 Verdict → Final Report")
+    lines = [
+        # Root
+        "🔷 User Query",
+        "│",
+        # Parse
+        f"├── 📋 Parse → {', '.join(companies)}  ·  Tickers: {', '.join(tickers)}",
+        "│",
+        # Parallel split
+        "├── ⚡ parallel execution",
+        "│",
+        *_render_section("📊 Number Cruncher", fin_calls),
+        *_render_section("🔍 Street Scout", comp_calls),
+        *_render_section("📈 Market Intel Scout", market_intel_calls),
+        # Verdict
+        "└── 📝 Verdict → Final Report",
+    ]
 
     return "\n".join(lines)
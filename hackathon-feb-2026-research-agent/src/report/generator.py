@@ -1,8 +1,12 @@
 """Report generator - synthesizes agent outputs into markdown report."""
 
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
+from langchain_core.messages import HumanMessage
+
+from ..llm import cached_system_message
 from ..logging_config import get_logger
 from .templates import (
     format_companies_table,
@@ -10,6 +14,50 @@ from .templates import (
 
 logger = get_logger(__name__)
 
+# Closes a streamed report whose LLM synthesis failed after some of it was already sent
+_INTERRUPTED_NOTE = "\n\n---\n*Report generation was interrupted; this report is incomplete.*\n"
+
+# Fixed synthesis instructions, sent as a cached system block ahead of the per-run agent outputs
+_SYNTHESIS_SYSTEM_MESSAGE = cached_system_message(
+    """You are synthesizing a research report from agent outputs.
+
+Create a comprehensive markdown research report with these sections:
+
+1. **Executive Summary** (2-3 paragraphs)
+   - Key findings from financial, competitive, and market intelligence analysis
+   - Main takeaways for the reader
+
+2. **Companies Analyzed** (table format)
+   - Company name, ticker, primary products
+
+3. **Financial Comparison** (table + analysis)
+   - Market cap, revenue, growth rates, margins
+   - Include a comparison table
+   - Brief analysis of financial health trends
+
+4. **Competitive Analysis**
+   - Product offerings comparison
+   - Market positioning
+   - Strengths and weaknesses for each company
+   - Key differentiators
+
+5. **Market Intelligence**
+   - Market size and growth forecasts
+   - Recent news and developments
+   - Analyst sentiment and outlook
+   - Key industry trends
+
+6. **Key Insights** (numbered list)
+   - 3-5 actionable insights from the research
+
+7. **Sources**
+   - List all sources mentioned in agent outputs
+
+Format the report in clean markdown. Use tables where appropriate.
+Start with a title: "# Competitive Analysis: Observability Market"
+"""
+)
+
 
 def generate_report(
     query: str,
@@ -33,18 +81,9 @@ def generate_report(
     Returns:
         Formatted markdown report.
     """
-    # Extract responses from agent outputs
-    financial_response = ""
-    if financial_data and "response" in financial_data:
-        financial_response = financial_data["response"]
-
-    competitor_response = ""
-    if competitor_data and "response" in competitor_data:
-        competitor_response = competitor_data["response"]
-
-    market_intel_response = ""
-    if market_intel_data and "response" in market_intel_data:
-        market_intel_response = market_intel_data["response"]
+    financial_response = _agent_response(financial_data)
+    competitor_response = _agent_response(competitor_data)
+    market_intel_response = _agent_response(market_intel_data)
 
     # If we have an LLM, use it to synthesize a proper report
     if llm is not None:
@@ -67,72 +106,136 @@ def generate_report(
     )
 
 
-def _generate_with_llm(
+async def agenerate_report(
     query: str,
     companies: list[str],
-    financial_response: str,
-    competitor_response: str,
-    market_intel_response: str,
-    llm: Any,
+    financial_data: dict | None,
+    competitor_data: dict | None,
+    market_intel_data: dict | None = None,
+    llm: Any = None,
+    on_token: Callable[[str], Any] | None = None,
 ) -> str:
-    """Generate report using LLM to synthesize agent outputs."""
+    """
+    Async ``generate_report`` that streams the LLM synthesis as it is written.
 
-    synthesis_prompt = f"""You are synthesizing a research report from agent outputs.
+    Args:
+        query: Original user query
+        companies: List of companies analyzed
+        financial_data: Output from financial agent
+        competitor_data: Output from competitor agent
+        market_intel_data: Output from market intelligence agent
+        llm: LLM instance for synthesis (optional)
+        on_token: Called with each text chunk as the LLM produces it (optional)
 
-Original Query: {query}
+    Returns:
+        Formatted markdown report. If streaming fails before any text was sent,
+        the basic template report; if it fails partway, the partial report with
+        an interruption note (also passed to ``on_token``), so callers never see
+        one report streamed and a different one returned.
+    """
+    financial_response = _agent_response(financial_data)
+    competitor_response = _agent_response(competitor_data)
+    market_intel_response = _agent_response(market_intel_data)
 
-Companies Analyzed: {", ".join(companies)}
+    if llm is None:
+        return _generate_basic_report(
+            query=query,
+            companies=companies,
+            financial_response=financial_response,
+            competitor_response=competitor_response,
+            market_intel_response=market_intel_response,
+        )
 
-=== FINANCIAL AGENT OUTPUT ===
-{financial_response}
+    messages = _synthesis_messages(query, companies, financial_response, competitor_response, market_intel_response)
+    logger.info("report.llm_synthesis.start", companies=companies, streaming=True)
+    chunks = []
+    try:
+        async for chunk in llm.astream(messages):
+            if token := _chunk_text(chunk):
+                chunks.append(token)
+                if on_token is not None:
+                    on_token(token)
+        logger.info("report.llm_synthesis.end", chunks=len(chunks))
+        return "".join(chunks)
+    except Exception as e:
+        logger.warning("report.llm_synthesis.error", error=str(e), chunks=len(chunks))
+        if chunks:
+            # Part of the report already reached on_token; finish that one rather than start another
+            chunks.append(_INTERRUPTED_NOTE)
+            if on_token is not None:
+                on_token(_INTERRUPTED_NOTE)
+            return "".join(chunks)
+        return _generate_basic_report(
+            query=query,
+            companies=companies,
+            financial_response=financial_response,
+            competitor_response=competitor_response,
+            market_intel_response=market_intel_response,
+        )
 
-=== COMPETITOR AGENT OUTPUT ===
-{competitor_response}
 
-=== MARKET INTELLIGENCE AGENT OUTPUT ===
-{market_intel_response}
+def _chunk_text(chunk: Any) -> str:
+    """Text of one streamed message chunk, from either a plain string or a list of content blocks.
 
-=== INSTRUCTIONS ===
-Create a comprehensive markdown research report with these sections:
+    Reads ``content`` directly: ``chunk.text`` is a property only on langchain-core 1.x.
+    """
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in content
+        if isinstance(block, str) or block.get("type") == "text"
+    )
 
-1. **Executive Summary** (2-3 paragraphs)
-   - Key findings from financial, competitive, and market intelligence analysis
-   - Main takeaways for the reader
 
-2. **Companies Analyzed** (table format)
-   - Company name, ticker, primary products
+def _agent_response(agent_data: dict | None) -> str:
+    """Pull the response text out of a sub-agent result, or "" if missing."""
+    if agent_data and "response" in agent_data:
+        return agent_data["response"]
+    return ""
 
-3. **Financial Comparison** (table + analysis)
-   - Market cap, revenue, growth rates, margins
-   - Include a comparison table
-   - Brief analysis of financial health trends
 
-4. **Competitive Analysis**
-   - Product offerings comparison
-   - Market positioning
-   - Strengths and weaknesses for each company
-   - Key differentiators
+def _synthesis_messages(
+    query: str,
+    companies: list[str],
+    financial_response: str,
+    competitor_response: str,
+    market_intel_response: str,
+) -> list:
+    """Cached synthesis instructions followed by this run's agent outputs."""
+    synthesis_prompt = f"""Original Query: {query}
 
-5. **Market Intelligence**
-   - Market size and growth forecasts
-   - Recent news and developments
-   - Analyst sentiment and outlook
-   - Key industry trends
+Companies Analyzed: {", ".join(companies)}
 
-6. **Key Insights** (numbered list)
-   - 3-5 actionable insights from the research
+=== FINANCIAL AGENT OUTPUT ===
+{financial_response}
 
-7. **Sources**
-   - List all sources mentioned in agent outputs
+=== COMPETITOR AGENT OUTPUT ===
+{competitor_response}
+
+=== MARKET INTELLIGENCE AGENT OUTPUT ===
+{market_intel_response}
 
-Format the report in clean markdown. Use tables where appropriate.
-Start with a title: "# Competitive Analysis: Observability Market"
 Include the date: *Generated: {datetime.now().strftime("%Y-%m-%d")} | Research Agent v0.1*
 """
+    return [_SYNTHESIS_SYSTEM_MESSAGE, HumanMessage(content=synthesis_prompt)]
+
+
+def _generate_with_llm(
+    query: str,
+    companies: list[str],
+    financial_response: str,
+    competitor_response: str,
+    market_intel_response: str,
+    llm: Any,
+) -> str:
+    """Generate report using LLM to synthesize agent outputs."""
+    messages = _synthesis_messages(query, companies, financial_response, competitor_response, market_intel_response)
 
     logger.info("report.llm_synthesis.start", companies=companies)
     try:
-        response = llm.invoke([{"role": "user", "content": synthesis_prompt}])
+        response = llm.invoke(messages)
         logger.info("report.llm_synthesis.end")
         return response.content
     except Exception as e:
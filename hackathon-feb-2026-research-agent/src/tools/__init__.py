@@ -6,13 +6,14 @@ from .market_intel_tools import (
     search_market_size,
     search_recent_news,
 )
-from .tavily_tools import search_company_info, search_competitive_analysis
+from .tavily_tools import search_company_info, search_company_info_batch, search_competitive_analysis
 from .yfinance_tools import get_company_financials, get_historical_revenue
 
 __all__ = [
     "get_company_financials",
     "get_historical_revenue",
     "search_company_info",
+    "search_company_info_batch",
     "search_competitive_analysis",
     "search_market_size",
     "search_industry_forecast",
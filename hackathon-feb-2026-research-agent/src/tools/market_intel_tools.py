@@ -1,29 +1,11 @@
 """Market intelligence tools for market sizing, forecasts, news, and sentiment research."""
 
-import os
 from typing import Any
 
-from dotenv import load_dotenv
 from langchain_core.tools import tool
 
-# Load environment variables
-load_dotenv()
-
-# Reuse the lazy Tavily client pattern
-_tavily_client = None
-
-
-def _get_client():
-    """Get or create Tavily client."""
-    global _tavily_client
-    if _tavily_client is None:
-        from tavily import TavilyClient
-
-        api_key = os.getenv("TAVILY_API_KEY")
-        if not api_key:
-            raise ValueError("TAVILY_API_KEY environment variable not set")
-        _tavily_client = TavilyClient(api_key=api_key)
-    return _tavily_client
+# Same lazily created client (and lazy .env load) as the competitor tools
+from .tavily_tools import _get_client
 
 
 @tool
@@ -1,34 +1,48 @@
 """Tavily search tools for competitor research."""
 
 import os
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Literal
 
-from dotenv import load_dotenv
 from langchain_core.tools import tool
 
+from ..cache.ttl import ttl_cache
+from ..config import load_env
 from ..logging_config import get_logger
-from ..utils.retry import retry_transient
-
-# Load environment variables
-load_dotenv()
+from ..utils.retry import TRANSIENT_POLICY
 
 logger = get_logger(__name__)
 
-# Lazy import to avoid issues if tavily not installed
-_tavily_client = None
+# Shared pool for fanning out independent searches; the cached client's
+# requests.Session keeps the connections to Tavily alive between them
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tavily")
 
 
+@lru_cache(maxsize=1)
 def _get_client():
     """Get or create Tavily client."""
-    global _tavily_client
-    if _tavily_client is None:
-        from tavily import TavilyClient
+    # Lazy import to avoid issues if tavily not installed
+    from tavily import TavilyClient
+
+    # .env is read on first client creation rather than at import
+    load_env()
+    api_key = os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        raise ValueError("TAVILY_API_KEY environment variable not set")
+    return TavilyClient(api_key=api_key)
+
 
-        api_key = os.getenv("TAVILY_API_KEY")
-        if not api_key:
-            raise ValueError("TAVILY_API_KEY environment variable not set")
-        _tavily_client = TavilyClient(api_key=api_key)
-    return _tavily_client
+# "basic" answers in roughly a third of the time of "advanced"; the latter digs
+# deeper for more relevant snippets
+SearchDepth = Literal["basic", "advanced"]
+
+# Search query templates, bound once so every caller phrases a query the same way
+_Q_COMPANY = "{name} company overview products services".format
+_Q_COMPETITIVE_VS = "{name} vs {others} comparison competitive analysis".format
+_Q_COMPETITIVE = "{name} competitive analysis market position strengths weaknesses".format
+_Q_PRODUCT = "{name} {category} product features pricing".format
+_Q_TRENDS = "{topic} market trends analysis forecast".format
 
 
 def _parse_search_results(response: dict) -> tuple[list[dict], list[str]]:
@@ -47,12 +61,13 @@ def _parse_search_results(response: dict) -> tuple[list[dict], list[str]]:
     return results, sources
 
 
-@retry_transient()
-def _search_company(company_name: str) -> dict[str, Any]:
+@ttl_cache()
+@TRANSIENT_POLICY
+def _search_company(company_name: str, search_depth: SearchDepth = "basic") -> dict[str, Any]:
     """Search for company info via Tavily (retried on transient errors)."""
     client = _get_client()
-    query = f"{company_name} company overview products services"
-    response = client.search(query=query, search_depth="advanced", max_results=5)
+    query = _Q_COMPANY(name=company_name)
+    response = client.search(query=query, search_depth=search_depth, max_results=5)
     results, sources = _parse_search_results(response)
     return {
         "company": company_name,
@@ -62,15 +77,15 @@ def _search_company(company_name: str) -> dict[str, Any]:
     }
 
 
-@retry_transient()
+@ttl_cache()
+@TRANSIENT_POLICY
 def _search_competitive(company_name: str, competitors: list[str] | None) -> dict[str, Any]:
     """Search for competitive analysis via Tavily (retried on transient errors)."""
     client = _get_client()
     if competitors:
-        comp_str = " vs ".join(competitors)
-        query = f"{company_name} vs {comp_str} comparison competitive analysis"
+        query = _Q_COMPETITIVE_VS(name=company_name, others=" vs ".join(competitors))
     else:
-        query = f"{company_name} competitive analysis market position strengths weaknesses"
+        query = _Q_COMPETITIVE(name=company_name)
     response = client.search(query=query, search_depth="advanced", max_results=5)
     results, sources = _parse_search_results(response)
     return {
@@ -82,12 +97,13 @@ def _search_competitive(company_name: str, competitors: list[str] | None) -> dic
     }
 
 
-@retry_transient()
-def _search_product(company_name: str, product_category: str) -> dict[str, Any]:
+@ttl_cache()
+@TRANSIENT_POLICY
+def _search_product(company_name: str, product_category: str, search_depth: SearchDepth = "basic") -> dict[str, Any]:
     """Search for product info via Tavily (retried on transient errors)."""
     client = _get_client()
-    query = f"{company_name} {product_category} product features pricing"
-    response = client.search(query=query, search_depth="advanced", max_results=5)
+    query = _Q_PRODUCT(name=company_name, category=product_category)
+    response = client.search(query=query, search_depth=search_depth, max_results=5)
     results, sources = _parse_search_results(response)
     return {
         "company": company_name,
@@ -98,12 +114,13 @@ def _search_product(company_name: str, product_category: str) -> dict[str, Any]:
     }
 
 
-@retry_transient()
-def _search_trends(topic: str) -> dict[str, Any]:
+@ttl_cache()
+@TRANSIENT_POLICY
+def _search_trends(topic: str, search_depth: SearchDepth = "basic") -> dict[str, Any]:
     """Search for market trends via Tavily (retried on transient errors)."""
     client = _get_client()
-    query = f"{topic} market trends analysis forecast"
-    response = client.search(query=query, search_depth="advanced", max_results=5)
+    query = _Q_TRENDS(topic=topic)
+    response = client.search(query=query, search_depth=search_depth, max_results=5)
     results, sources = _parse_search_results(response)
     return {
         "topic": topic,
@@ -114,12 +131,14 @@ def _search_trends(topic: str) -> dict[str, Any]:
 
 
 @tool
-def search_company_info(company_name: str) -> dict[str, Any]:
+def search_company_info(company_name: str, search_depth: SearchDepth = "basic") -> dict[str, Any]:
     """
     Search for general information about a company.
 
     Args:
         company_name: Name of the company to research (e.g., "DataDog", "Dynatrace")
+        search_depth: "basic" (default, fastest) or "advanced" (~2-3x slower,
+            more thorough); use "advanced" only when basic results are too thin
 
     Returns:
         Dictionary with search results including:
@@ -138,7 +157,7 @@ def search_company_info(company_name: str) -> dict[str, Any]:
 
     logger.info("tavily.search_company_info", company=company_name)
     try:
-        return _search_company(company_name)
+        return _search_company(company_name, search_depth)
     except Exception as e:
         logger.error("tavily.search_company_info.error", company=company_name, error=str(e))
         return {
@@ -150,11 +169,33 @@ def search_company_info(company_name: str) -> dict[str, Any]:
         }
 
 
+@tool
+def search_company_info_batch(company_names: list[str]) -> list[dict[str, Any]]:
+    """
+    Search for general information about several companies at once.
+
+    Prefer this over repeated search_company_info calls when researching two
+    or more companies; the searches run concurrently.
+
+    Args:
+        company_names: Names of the companies to research (e.g., ["DataDog", "Dynatrace"])
+
+    Returns:
+        List with one search_company_info result per company, in input order.
+    """
+    logger.info("tavily.search_company_info_batch", companies=company_names)
+    # map() yields results in input order; each call handles its own errors
+    return list(_SEARCH_POOL.map(lambda name: search_company_info.invoke({"company_name": name}), company_names))
+
+
 @tool
 def search_competitive_analysis(company_name: str, competitors: list[str] | None = None) -> dict[str, Any]:
     """
     Search for competitive analysis and market positioning information.
 
+    Always runs an "advanced" depth search, since positioning detail is the
+    point of this tool.
+
     Args:
         company_name: Name of the company to research
         competitors: Optional list of competitor names to compare against
@@ -182,20 +223,24 @@ def search_competitive_analysis(company_name: str, competitors: list[str] | None
 
 
 @tool
-def search_product_info(company_name: str, product_category: str) -> dict[str, Any]:
+def search_product_info(
+    company_name: str, product_category: str, search_depth: SearchDepth = "basic"
+) -> dict[str, Any]:
     """
     Search for specific product information.
 
     Args:
         company_name: Name of the company
         product_category: Product category to search (e.g., "observability", "APM", "monitoring")
+        search_depth: "basic" (default, fastest) or "advanced" (~2-3x slower,
+            more thorough); use "advanced" only when basic results are too thin
 
     Returns:
         Dictionary with product information.
     """
     logger.info("tavily.search_product_info", company=company_name, category=product_category)
     try:
-        return _search_product(company_name, product_category)
+        return _search_product(company_name, product_category, search_depth)
     except Exception as e:
         logger.error("tavily.search_product_info.error", company=company_name, error=str(e))
         return {
@@ -209,19 +254,21 @@ def search_product_info(company_name: str, product_category: str) -> dict[str, A
 
 
 @tool
-def search_market_trends(topic: str) -> dict[str, Any]:
+def search_market_trends(topic: str, search_depth: SearchDepth = "basic") -> dict[str, Any]:
     """
     Search for market trends and industry analysis.
 
     Args:
         topic: Market or industry topic to research (e.g., "observability market 2024")
+        search_depth: "basic" (default, fastest) or "advanced" (~2-3x slower,
+            more thorough); use "advanced" only when basic results are too thin
 
     Returns:
         Dictionary with market trend information.
     """
     logger.info("tavily.search_market_trends", topic=topic)
     try:
-        return _search_trends(topic)
+        return _search_trends(topic, search_depth)
     except Exception as e:
         logger.error("tavily.search_market_trends.error", topic=topic, error=str(e))
         return {
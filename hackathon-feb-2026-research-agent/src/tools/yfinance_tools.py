@@ -1,27 +1,34 @@
 """Yahoo Finance tools for financial data retrieval."""
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+import numpy as np
 import yfinance as yf
 from langchain_core.tools import tool
 
+from ..cache.ttl import ttl_cache
 from ..logging_config import get_logger
-from ..utils.retry import retry_transient
+from ..utils.retry import TRANSIENT_POLICY
 
 logger = get_logger(__name__)
 
+# Shared pool for fanning out per-ticker Yahoo Finance requests (I/O bound, so threads overlap the latency)
+_FETCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="yfinance")
+
+# (threshold, suffix), largest first so the common large-cap case returns on the first check
+_SCALES = ((1_000_000_000, "B"), (1_000_000, "M"))
+
 
 def _format_large_number(num: float | None) -> str:
     """Format large numbers with B/M suffix."""
     if num is None:
         return "N/A"
 
-    if num >= 1_000_000_000:
-        return f"${num / 1_000_000_000:.2f}B"
-    elif num >= 1_000_000:
-        return f"${num / 1_000_000:.2f}M"
-    else:
-        return f"${num:,.0f}"
+    for threshold, suffix in _SCALES:
+        if num >= threshold:
+            return f"${num / threshold:.2f}{suffix}"
+    return f"${num:,.0f}"
 
 
 def _format_percentage(num: float | None) -> str:
@@ -31,33 +38,47 @@ def _format_percentage(num: float | None) -> str:
     return f"{num * 100:.1f}%"
 
 
-@retry_transient()
+# (result field, yfinance info key, formatter); each emits a formatted value plus a "<field>_raw" copy
+_METRIC_FIELDS = (
+    ("market_cap", "marketCap", _format_large_number),
+    ("revenue_ttm", "totalRevenue", _format_large_number),
+    ("revenue_growth_yoy", "revenueGrowth", _format_percentage),
+    ("gross_margin", "grossMargins", _format_percentage),
+    ("operating_margin", "operatingMargins", _format_percentage),
+)
+
+# (result field / yfinance info key, default)
+_LABEL_FIELDS = (("sector", "N/A"), ("industry", "N/A"), ("currency", "USD"))
+
+# Income statement row labels for revenue, in order of preference
+_REVENUE_ROWS = ["Total Revenue", "Revenue"]
+
+
+def _clean_ticker(ticker: str) -> str | None:
+    """Normalize a ticker to stripped upper case, or None if it is blank."""
+    symbol = ticker.strip().upper() if ticker else ""
+    return symbol or None
+
+
+@ttl_cache()
+@TRANSIENT_POLICY
 def _fetch_financials(ticker: str) -> dict[str, Any]:
     """Fetch financial data from yfinance (retried on transient errors)."""
-    stock = yf.Ticker(ticker)
-    info = stock.info
+    info = yf.Ticker(ticker).info
 
-    return {
-        "company_name": info.get("shortName", ticker),
-        "ticker": ticker,
-        "market_cap": _format_large_number(info.get("marketCap")),
-        "market_cap_raw": info.get("marketCap"),
-        "revenue_ttm": _format_large_number(info.get("totalRevenue")),
-        "revenue_ttm_raw": info.get("totalRevenue"),
-        "revenue_growth_yoy": _format_percentage(info.get("revenueGrowth")),
-        "revenue_growth_yoy_raw": info.get("revenueGrowth"),
-        "gross_margin": _format_percentage(info.get("grossMargins")),
-        "gross_margin_raw": info.get("grossMargins"),
-        "operating_margin": _format_percentage(info.get("operatingMargins")),
-        "operating_margin_raw": info.get("operatingMargins"),
-        "sector": info.get("sector", "N/A"),
-        "industry": info.get("industry", "N/A"),
-        "currency": info.get("currency", "USD"),
-        "source": "yfinance",
-    }
+    result = {"company_name": info.get("shortName", ticker), "ticker": ticker}
+    for field, key, fmt in _METRIC_FIELDS:
+        raw = info.get(key)
+        result[field] = fmt(raw)
+        result[f"{field}_raw"] = raw
+    for field, default in _LABEL_FIELDS:
+        result[field] = info.get(field, default)
+    result["source"] = "yfinance"
+    return result
 
 
-@retry_transient()
+@ttl_cache()
+@TRANSIENT_POLICY
 def _fetch_historical(ticker: str, years: int) -> dict[str, Any]:
     """Fetch historical revenue from yfinance (retried on transient errors)."""
     stock = yf.Ticker(ticker)
@@ -67,31 +88,25 @@ def _fetch_historical(ticker: str, years: int) -> dict[str, Any]:
     historical = []
 
     if financials is not None and not financials.empty:
-        # Get total revenue row if it exists
-        revenue_row = None
-        for row_name in ["Total Revenue", "Revenue"]:
-            if row_name in financials.index:
-                revenue_row = financials.loc[row_name]
-                break
-
-        if revenue_row is not None:
-            # Get the last N years
-            for i, (date, value) in enumerate(revenue_row.items()):
-                if i >= years:
-                    break
-                if value is not None and not (isinstance(value, float) and value != value):  # Check for NaN
-                    historical.append(
-                        {
-                            "year": date.year,
-                            "revenue": value,
-                            "revenue_formatted": _format_large_number(value),
-                        }
-                    )
+        # Positions of the revenue rows yfinance may use (-1 where absent)
+        rows = financials.index.get_indexer(_REVENUE_ROWS)
+        rows = rows[rows >= 0]
+        if rows.size:
+            revenue_row = financials.iloc[rows[0]]
+            values = revenue_row.to_numpy(dtype=float)
+            year_arr = revenue_row.index.year.to_numpy()
+            # Columns run newest first; keep the latest N reported years, then flip to oldest first
+            reported = ~np.isnan(values)
+            values, year_arr = values[reported][:years][::-1], year_arr[reported][:years][::-1]
+            historical = [
+                {"year": int(year), "revenue": float(value), "revenue_formatted": _format_large_number(float(value))}
+                for year, value in zip(year_arr, values, strict=True)
+            ]
 
     return {
         "company_name": info.get("shortName", ticker),
         "ticker": ticker,
-        "historical_revenue": sorted(historical, key=lambda x: x["year"]),
+        "historical_revenue": historical,
         "source": "yfinance",
     }
 
@@ -116,17 +131,18 @@ def get_company_financials(ticker: str) -> dict[str, Any]:
         - sector: Company sector
         - industry: Company industry
     """
-    if not ticker or not ticker.strip():
+    symbol = _clean_ticker(ticker)
+    if symbol is None:
         return {"error": "Empty ticker symbol", "ticker": ticker, "source": "yfinance"}
 
-    logger.info("yfinance.get_financials", ticker=ticker)
+    logger.info("yfinance.get_financials", ticker=symbol)
     try:
-        return _fetch_financials(ticker)
+        return _fetch_financials(symbol)
     except Exception as e:
-        logger.error("yfinance.get_financials.error", ticker=ticker, error=str(e))
+        logger.error("yfinance.get_financials.error", ticker=symbol, error=str(e))
         return {
             "error": str(e),
-            "ticker": ticker,
+            "ticker": symbol,
             "source": "yfinance",
         }
 
@@ -146,17 +162,18 @@ def get_historical_revenue(ticker: str, years: int = 3) -> dict[str, Any]:
         - ticker: Stock ticker
         - historical_revenue: List of yearly revenue data
     """
-    if not ticker or not ticker.strip():
+    symbol = _clean_ticker(ticker)
+    if symbol is None:
         return {"error": "Empty ticker symbol", "ticker": ticker, "historical_revenue": [], "source": "yfinance"}
 
-    logger.info("yfinance.get_historical_revenue", ticker=ticker, years=years)
+    logger.info("yfinance.get_historical_revenue", ticker=symbol, years=years)
     try:
-        return _fetch_historical(ticker, years)
+        return _fetch_historical(symbol, years)
     except Exception as e:
-        logger.error("yfinance.get_historical_revenue.error", ticker=ticker, error=str(e))
+        logger.error("yfinance.get_historical_revenue.error", ticker=symbol, error=str(e))
         return {
             "error": str(e),
-            "ticker": ticker,
+            "ticker": symbol,
             "historical_revenue": [],
             "source": "yfinance",
         }
@@ -173,13 +190,9 @@ def get_company_comparison(tickers: list[str]) -> dict[str, Any]:
     Returns:
         Dictionary with comparison data for all companies.
     """
-    results = {"companies": [], "source": "yfinance"}
-
-    for ticker in tickers:
-        data = get_company_financials.invoke({"ticker": ticker})
-        results["companies"].append(data)
-
-    return results
+    # Fetch every ticker concurrently; map() yields results in input order
+    companies = list(_FETCH_POOL.map(lambda ticker: get_company_financials.invoke({"ticker": ticker}), tickers))
+    return {"companies": companies, "source": "yfinance"}
 
 
 # Convenience functions for direct use (non-tool versions)
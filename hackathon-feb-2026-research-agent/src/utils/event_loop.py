@@ -0,0 +1,98 @@
+"""Persistent background event loop for the synchronous agent wrappers.
+
+Everything submitted through ``run_sync`` / ``iter_sync`` (including every
+Streamlit query) runs on one long-lived loop instead of a fresh loop per call,
+so anything bound to the loop (such as async HTTP connections) outlives a
+single query.
+"""
+
+import asyncio
+import atexit
+import queue
+import threading
+from collections.abc import AsyncIterator, Coroutine, Iterator
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+
+# Queued by iter_sync() after the async iterator's last item
+_END = object()
+
+
+def _shutdown(loop: asyncio.AbstractEventLoop, thread: threading.Thread) -> None:
+    """Stop the background loop and close it once its thread has exited."""
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    if not loop.is_running():
+        loop.close()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared loop, starting its daemon thread on first use."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="run-sync-loop", daemon=True)
+            thread.start()
+            atexit.register(_shutdown, loop, thread)
+            _loop, _thread = loop, thread
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on the shared background loop and return its result.
+
+    Unlike ``asyncio.run``, the loop lives for the whole process, so every
+    ``*_sync`` caller — from any thread — reuses the same loop instead of
+    paying loop setup/teardown each time. Safe to call from a thread that
+    already runs its own loop, but not from coroutines scheduled on the
+    shared loop itself.
+    """
+    loop = _background_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from the shared event loop thread")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def iter_sync(aiterator: AsyncIterator[T], idle_timeout: float | None = None) -> Iterator[T | None]:
+    """Iterate an async iterator on the shared background loop, yielding its items here.
+
+    Items are handed over as they are produced, so the caller sees each one
+    while the iterator is still running. Exceptions it raises are re-raised
+    after its last item; closing this generator early cancels it. With
+    ``idle_timeout`` set, ``None`` is yielded whenever that many seconds pass
+    without an item, so the caller can do periodic work while it waits. The
+    same thread rules as ``run_sync`` apply.
+    """
+    loop = _background_loop()
+    if threading.current_thread() is _thread:
+        raise RuntimeError("iter_sync() cannot be called from the shared event loop thread")
+    items: queue.Queue = queue.Queue()
+
+    async def _forward() -> None:
+        try:
+            async for item in aiterator:
+                items.put(item)
+        finally:
+            items.put(_END)
+
+    future = asyncio.run_coroutine_threadsafe(_forward(), loop)
+    try:
+        while True:
+            try:
+                item = items.get(timeout=idle_timeout)
+            except queue.Empty:
+                yield None
+                continue
+            if item is _END:
+                break
+            yield item
+        future.result()
+    finally:
+        future.cancel()
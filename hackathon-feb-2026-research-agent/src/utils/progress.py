@@ -0,0 +1,82 @@
+"""Background delivery of progress events to a UI callback."""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Queued by aclose() after the last real event
+_STOP = object()
+
+
+def _coalesce(batch: list[dict]) -> list[dict]:
+    """Collapse a batch to the updates that still matter once it is delivered.
+
+    Only back-to-back events for the same ``(stage, status)`` are merged, so
+    status transitions keep their order: a repeated update replaces the one
+    before it (last writer wins), and streaming tokens are joined into a
+    single event so no report text is lost.
+    """
+    coalesced: list[dict] = []
+    for event in batch:
+        last = coalesced[-1] if coalesced else None
+        if (
+            not isinstance(event, dict)
+            or event.get("status") is None
+            or not isinstance(last, dict)
+            or (last.get("stage"), last.get("status")) != (event.get("stage"), event.get("status"))
+        ):
+            coalesced.append(event)
+        elif event["status"] == "streaming":
+            coalesced[-1] = {**event, "token": last.get("token", "") + event.get("token", "")}
+        else:
+            coalesced[-1] = event
+    return coalesced
+
+
+class ProgressPump:
+    """Deliver progress events to a callback from one background task.
+
+    Graph nodes call ``emit`` and move on; the pump collects whatever arrives
+    within ``window`` seconds of the first queued event, coalesces superseded
+    updates and hands the rest to the callback in order. ``emit`` is safe to
+    call from the executor threads LangGraph runs sync nodes in. Must be
+    created inside a running event loop.
+    """
+
+    def __init__(self, callback: Callable[[dict], Any], window: float = 0.05):
+        self._callback = callback
+        self._window = window
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = self._loop.create_task(self._run())
+
+    def emit(self, event: dict) -> None:
+        """Queue an event for delivery without waiting on the callback."""
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    async def aclose(self) -> None:
+        """Deliver everything emitted so far, then stop the background task."""
+        self.emit(_STOP)
+        await self._task
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self._window
+            while batch[-1] is not _STOP and (remaining := deadline - self._loop.time()) > 0:
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except TimeoutError:
+                    break
+
+            for event in _coalesce(batch):
+                if event is _STOP:
+                    return
+                try:
+                    self._callback(event)
+                except Exception as e:
+                    logger.warning("progress.callback_error", error=str(e))
@@ -1,6 +1,7 @@
 """Reusable retry decorator for transient failures."""
 
 import logging
+from functools import lru_cache
 
 from tenacity import (
     before_sleep_log,
@@ -18,6 +19,21 @@ logger = get_logger(__name__)
 TRANSIENT_EXCEPTIONS = (ConnectionError, TimeoutError, OSError)
 
 
+@lru_cache(maxsize=8)
+def _policy(max_attempts: int):
+    """Build the tenacity decorator for ``max_attempts`` once and share it.
+
+    Safe to reuse: tenacity creates a fresh ``Retrying`` for each function it wraps.
+    """
+    return retry(
+        retry=retry_if_exception_type(TRANSIENT_EXCEPTIONS),
+        stop=stop_after_attempt(max_attempts),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        before_sleep=before_sleep_log(logging.getLogger(__name__), logging.WARNING),
+        reraise=True,
+    )
+
+
 def retry_transient(max_attempts: int = 3):
     """Retry decorator for transient network/API errors.
 
@@ -28,10 +44,8 @@ def retry_transient(max_attempts: int = 3):
     Args:
         max_attempts: Maximum number of attempts (default 3).
     """
-    return retry(
-        retry=retry_if_exception_type(TRANSIENT_EXCEPTIONS),
-        stop=stop_after_attempt(max_attempts),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        before_sleep=before_sleep_log(logging.getLogger(__name__), logging.WARNING),
-        reraise=True,
-    )
+    return _policy(max_attempts)
+
+
+# Default policy, for decorating without the factory call
+TRANSIENT_POLICY = _policy(3)
@@ -0,0 +1,36 @@
+"""JSON helpers backed by orjson, falling back to the stdlib when it is missing."""
+
+import json
+import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both backends
+JSONDecodeError = json.JSONDecodeError
+
+# Body of a ```json / ``` fenced block in an LLM reply; a missing closing fence runs to the end
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL)
+
+
+def loads(data: str | bytes) -> Any:
+    """Deserialize a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize ``obj`` to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def loads_fenced(content: str) -> Any:
+    """Deserialize JSON from an LLM reply, preferring the first fenced code block."""
+    match = _FENCE_RE.search(content)
+    return loads((match.group(1) if match else content).strip())
@@ -1,13 +1,11 @@
 """Pytest configuration and shared fixtures."""
 
-import sys
-from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pandas as pd
 import pytest
-
-# Add project root to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from langchain_core.messages import AIMessageChunk
 
 
 # ---------------------------------------------------------------------------
@@ -67,25 +65,47 @@ def mock_route_response():
 
 
 # ---------------------------------------------------------------------------
-# Autouse: reset agent/client singletons between tests
+# Autouse: reset agent/client singletons and skip backoff waits between tests
 # ---------------------------------------------------------------------------
 @pytest.fixture(autouse=True)
 def reset_singletons():
     """Reset module-level singletons so tests don't leak state."""
-    import src.agents.competitor as comp_mod
-    import src.agents.financial as fin_mod
-    import src.agents.manager as mgr_mod
-    import src.agents.market_intel as market_intel_mod
     import src.tools.tavily_tools as tavily_mod
-
-    fin_mod._financial_agent = None
-    comp_mod._competitor_agent = None
-    mgr_mod._manager_agent = None
-    market_intel_mod._market_intel_agent = None
-    tavily_mod._tavily_client = None
+    from src.agents.competitor import get_competitor_agent
+    from src.agents.financial import get_financial_agent
+    from src.agents.manager import get_manager_agent
+    from src.agents.market_intel import get_market_intel_agent
+    from src.cache import clear_caches
+    from src.llm import get_llm
+
+    get_llm.cache_clear()
+    clear_caches()
+    get_financial_agent.cache_clear()
+    get_competitor_agent.cache_clear()
+    get_manager_agent.cache_clear()
+    get_market_intel_agent.cache_clear()
+    tavily_mod._get_client.cache_clear()
     yield
 
 
+@pytest.fixture(autouse=True)
+def _no_backoff_sleep():
+    """Make tenacity's retry backoff (a time.sleep) instant; attempt counts and retry logs are unchanged."""
+    with patch("time.sleep"):
+        yield
+
+
+# ---------------------------------------------------------------------------
+# Config fixtures
+# ---------------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def config():
+    """Default Config, built once; it is frozen, so tests can share it safely."""
+    from src.config import Config
+
+    return Config()
+
+
 # ---------------------------------------------------------------------------
 # Sample data fixtures
 # ---------------------------------------------------------------------------
@@ -173,26 +193,58 @@ def mock_competitor_response():
 # ---------------------------------------------------------------------------
 # LLM mock fixtures
 # ---------------------------------------------------------------------------
+# mock_llm's default reply: a parse_request answer naming DataDog and Dynatrace
+_PARSE_REPLY = '{"companies": ["DataDog", "Dynatrace"], "tickers": ["DDOG", "DT"], "focus": "observability"}'
+
+
 @pytest.fixture
 def mock_llm():
-    """Return a MagicMock that behaves like ChatAnthropic.invoke()."""
+    """Return a MagicMock that behaves like ChatAnthropic.invoke() / ainvoke()."""
     llm = MagicMock()
-    response = MagicMock()
-    response.content = '{"companies": ["DataDog", "Dynatrace"], "tickers": ["DDOG", "DT"], "focus": "observability"}'
-    response.tool_calls = []
+    response = SimpleNamespace(content=_PARSE_REPLY, tool_calls=[])
     llm.invoke.return_value = response
+    llm.ainvoke = AsyncMock(return_value=response)
+
+    async def _astream(messages, **kwargs):
+        # Read content at call time so tests can override it after setup
+        yield AIMessageChunk(content=response.content)
+
+    llm.astream = MagicMock(side_effect=_astream)
     return llm
 
 
+def _reply(text: str) -> SimpleNamespace:
+    return SimpleNamespace(content=text, tool_calls=[])
+
+
+@pytest.fixture
+def llm_returning():
+    """Factory for a mock LLM whose invoke() answers ``replies`` in turn (a single reply, every time).
+
+    ainvoke() answers ``async_reply``, or the first reply when it is not given.
+    """
+
+    def make(*replies: str, async_reply: str | None = None) -> MagicMock:
+        llm = MagicMock()
+        responses = [_reply(text) for text in replies]
+        if len(responses) == 1:
+            llm.invoke.return_value = responses[0]
+        else:
+            llm.invoke.side_effect = responses
+        llm.ainvoke = AsyncMock(return_value=_reply(async_reply) if async_reply is not None else responses[0])
+        return llm
+
+    return make
+
+
 @pytest.fixture
 def mock_llm_with_tool_calls():
     """Return a mock LLM whose response includes tool_calls."""
     llm = MagicMock()
-    response = MagicMock()
-    response.content = ""
-    response.tool_calls = [
-        {"id": "tc1", "name": "get_company_financials", "args": {"ticker": "DDOG"}},
-    ]
+    response = SimpleNamespace(
+        content="",
+        tool_calls=[{"id": "tc1", "name": "get_company_financials", "args": {"ticker": "DDOG"}}],
+    )
     llm.invoke.return_value = response
     return llm
 
@@ -200,13 +252,17 @@ def mock_llm_with_tool_calls():
 # ---------------------------------------------------------------------------
 # Tool mock fixtures
 # ---------------------------------------------------------------------------
-@pytest.fixture
-def mock_yfinance_ticker():
-    """Patch yf.Ticker to return a mock with .info and .financials."""
-    import pandas as pd
+# Built once for every mock_yfinance_ticker test; treat as read-only
+_MOCK_FINANCIALS = pd.DataFrame(
+    {"2024-12-31": [2_100_000_000], "2023-12-31": [1_700_000_000]},
+    index=["Total Revenue"],
+)
+_MOCK_FINANCIALS.columns = pd.to_datetime(_MOCK_FINANCIALS.columns)
 
-    mock_ticker = MagicMock()
-    mock_ticker.info = {
+
+# DDOG-like yf.Ticker(...).info; read-only, since every mock ticker shares it
+_DDOG_INFO = MappingProxyType(
+    {
         "shortName": "Datadog Inc.",
         "marketCap": 45_000_000_000,
         "totalRevenue": 2_100_000_000,
@@ -217,30 +273,63 @@ def mock_yfinance_ticker():
         "industry": "Software—Application",
         "currency": "USD",
     }
-    mock_ticker.financials = pd.DataFrame(
-        {"2024-12-31": [2_100_000_000], "2023-12-31": [1_700_000_000]},
-        index=["Total Revenue"],
-    )
-    mock_ticker.financials.columns = pd.to_datetime(mock_ticker.financials.columns)
+)
+
 
+def _mock_ticker() -> MagicMock:
+    """A yf.Ticker stand-in with DDOG-like .info and .financials."""
+    return MagicMock(info=_DDOG_INFO, financials=_MOCK_FINANCIALS)
+
+
+@pytest.fixture
+def mock_yfinance_ticker():
+    """Patch yf.Ticker to return a mock with .info and .financials."""
+    mock_ticker = _mock_ticker()
     with patch("src.tools.yfinance_tools.yf.Ticker", return_value=mock_ticker) as mock_cls:
         mock_cls._instance = mock_ticker
         yield mock_cls
 
 
+@pytest.fixture(scope="session")
+def empty_financials_df():
+    """An empty .financials frame (no filings), built once; treat as read-only."""
+    return pd.DataFrame()
+
+
+@pytest.fixture(scope="session")
+def ddog_financials():
+    """get_company_financials result for DDOG against the mock ticker, computed once; treat as read-only."""
+    from src.tools.yfinance_tools import get_company_financials
+
+    with patch("src.tools.yfinance_tools.yf.Ticker", return_value=_mock_ticker()):
+        return get_company_financials.invoke({"ticker": "DDOG"})
+
+
+# Canned TavilyClient.search() response; treat as read-only
+_MOCK_SEARCH_RESPONSE = {
+    "results": [
+        {
+            "title": "Test Result",
+            "content": "Test content about the company.",
+            "url": "https://example.com/test",
+        }
+    ]
+}
+
+
+@pytest.fixture(scope="session")
+def _mock_tavily_template():
+    """One MagicMock TavilyClient for the whole session; mock_tavily_client resets it per test."""
+    return MagicMock()
+
+
 @pytest.fixture
-def mock_tavily_client():
+def mock_tavily_client(_mock_tavily_template):
     """Patch _get_client to return a mock TavilyClient."""
-    mock_client = MagicMock()
-    mock_client.search.return_value = {
-        "results": [
-            {
-                "title": "Test Result",
-                "content": "Test content about the company.",
-                "url": "https://example.com/test",
-            }
-        ]
-    }
+    # reset_mock recurses into child mocks, so call counts and side effects don't leak between tests
+    mock_client = _mock_tavily_template
+    mock_client.reset_mock(return_value=True, side_effect=True)
+    mock_client.search.return_value = _MOCK_SEARCH_RESPONSE
 
     with patch("src.tools.tavily_tools._get_client", return_value=mock_client) as mock_get:
         mock_get._client = mock_client
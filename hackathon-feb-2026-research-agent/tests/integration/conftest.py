@@ -0,0 +1,61 @@
+"""Fixtures shared by the integration tests."""
+
+import asyncio
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def mock_cfg_values():
+    """Manager config stand-in, built once and shared read-only by every pipeline test."""
+    return SimpleNamespace(
+        model_name="test",
+        model_temperature=0.0,
+        anthropic_api_key="test-key",
+        manager_max_parallel_agents=4,
+        default_companies=(),
+        get_ticker=lambda company_name: None,
+        find_tickers=lambda text: [],
+    )
+
+
+_real_asyncio_sleep = asyncio.sleep
+
+
+async def _instant_sleep(delay, result=None):
+    # Still yield to the loop once, so code that sleeps to hand over control keeps its ordering
+    await _real_asyncio_sleep(0)
+    return result
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep():
+    """Make async backoff/poll sleeps instant in pipeline tests (time.sleep is handled suite-wide)."""
+    with patch("asyncio.sleep", new=_instant_sleep):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _mock_market_intel(mock_run_market_intel_agent):
+    """Keep the market intel agent off the network; the pipeline tests only vary the other two agents."""
+    return mock_run_market_intel_agent
+
+
+@pytest.fixture
+def manager_test_env(mock_llm, mock_cfg_values):
+    """Patch the manager's config and LLM in one place for a pipeline test.
+
+    ``patch(target, new)`` swaps in more objects (e.g. a failing sub-agent) for
+    the rest of the test; everything is undone together at teardown.
+    """
+    with ExitStack() as stack:
+        stack.enter_context(patch("src.agents.manager.get_config", return_value=mock_cfg_values))
+        stack.enter_context(patch("src.agents.manager.get_llm", return_value=mock_llm))
+        yield SimpleNamespace(
+            mock_cfg=mock_cfg_values,
+            llm=mock_llm,
+            patch=lambda target, new: stack.enter_context(patch(target, new)),
+        )
@@ -1,5 +1,6 @@
 """Unit tests for configuration management."""
 
+import dataclasses
 import os
 from unittest.mock import patch
 
@@ -14,60 +15,110 @@ class TestConfig:
         config = get_config()
         assert config is not None
 
-    def test_config_has_defaults(self):
-        config = Config()
+    def test_get_config_returns_shared_instance(self):
+        assert get_config() is get_config()
+
+    def test_config_has_defaults(self, config):
         assert config.model_name == "claude-sonnet-4-20250514"
         assert config.model_temperature == 0.0
+        assert config.llm_request_timeout == 120.0
+        assert config.llm_max_retries == 2
         assert len(config.default_companies) == 3
 
-    def test_config_default_companies(self):
-        config = Config()
+    def test_config_default_companies(self, config):
         assert "DataDog" in config.default_companies
         assert "Dynatrace" in config.default_companies
 
     def test_config_loads_api_keys_from_env(self):
-        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key", "TAVILY_API_KEY": "tav-key"}):
-            config = Config()
-            assert config.anthropic_api_key == "test-key"
-            assert config.tavily_api_key == "tav-key"
+        config = Config.from_env({"ANTHROPIC_API_KEY": "test-key", "TAVILY_API_KEY": "tav-key"})
+        assert config.anthropic_api_key == "test-key"
+        assert config.tavily_api_key == "tav-key"
+
+    def test_report_cache_path_override(self):
+        assert Config.from_env({"REPORT_CACHE_PATH": "/data/reports.db"}).report_cache_path == "/data/reports.db"
+        assert Config.from_env({"REPORT_CACHE_PATH": ""}).report_cache_path == ""
+        assert Config.from_env({}).report_cache_path.endswith("rumble-reports.sqlite3")
+
+    def test_from_env_reads_os_environ_by_default(self):
+        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "os-key"}):
+            assert Config.from_env().anthropic_api_key == "os-key"
+
+    def test_from_env_override_skips_dotenv_and_os_environ(self):
+        with (
+            patch.dict(os.environ, {"ANTHROPIC_API_KEY": "os-key"}),
+            patch("src.config.load_dotenv") as mock_load,
+            patch("src.config._dotenv_loaded", False),
+        ):
+            config = Config.from_env({})
+        assert config.anthropic_api_key == ""
+        mock_load.assert_not_called()
+
+    def test_dotenv_loaded_once(self):
+        with patch("src.config.load_dotenv") as mock_load, patch("src.config._dotenv_loaded", False):
+            Config.from_env()
+            Config.from_env()
+        mock_load.assert_called_once()
+
+    def test_config_is_immutable(self, config):
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.anthropic_api_key = "changed"
+        with pytest.raises(TypeError):
+            config.ticker_map["newrelic"] = "NEWR"
+
+    def test_config_is_hashable(self):
+        custom = Config(ticker_map={"new relic": "NEWR"})
+
+        assert hash(Config()) == hash(Config())
+        assert {Config(): "default"}[Config()] == "default"
+        assert custom != Config()
+        with pytest.raises(TypeError):
+            custom.ticker_map["grafana"] = "GRAF"
 
     def test_config_validates_missing_keys(self):
-        with patch.dict(os.environ, {}, clear=True):
-            config = Config()
-            # Force empty keys regardless of .env file
-            config.anthropic_api_key = ""
-            config.tavily_api_key = ""
-            errors = config.validate()
-            assert "ANTHROPIC_API_KEY not set" in errors
-            assert "TAVILY_API_KEY not set" in errors
+        errors = Config.from_env({}).validate()
+        assert "ANTHROPIC_API_KEY not set" in errors
+        assert "TAVILY_API_KEY not set" in errors
 
     def test_config_validates_no_errors_when_present(self):
-        config = Config()
-        config.anthropic_api_key = "present"
-        config.tavily_api_key = "present"
+        config = Config(anthropic_api_key="present", tavily_api_key="present")
         errors = config.validate()
         assert errors == []
 
-    def test_ticker_mapping_known_companies(self):
-        config = Config()
+    def test_is_valid_tracks_required_keys(self):
+        config = Config(anthropic_api_key="present", tavily_api_key="present")
+        assert config.is_valid
+        assert not dataclasses.replace(config, tavily_api_key="").is_valid
+
+    def test_ticker_mapping_known_companies(self, config):
         assert config.get_ticker("DataDog") == "DDOG"
         assert config.get_ticker("Dynatrace") == "DT"
         assert config.get_ticker("Cisco") == "CSCO"
         assert config.get_ticker("Splunk") == "CSCO"
         assert config.get_ticker("AppDynamics") == "CSCO"
 
-    def test_ticker_mapping_unknown_company(self):
-        config = Config()
+    def test_ticker_mapping_matches_inside_names(self, config):
+        assert config.get_ticker("Cisco (Splunk/AppDynamics)") == "CSCO"
+        assert config.get_ticker("SplunkCloud Platform") == "CSCO"
+
+    def test_ticker_mapping_custom_map(self):
+        config = Config(ticker_map={"new relic": "NEWR"})
+        assert config.get_ticker("New Relic One") == "NEWR"
+        assert config.get_ticker("DataDog") is None
+
+    def test_ticker_mapping_unknown_company(self, config):
         assert config.get_ticker("UnknownCompany") is None
 
+    def test_find_tickers_in_mention_order(self, config):
+        assert config.find_tickers("Splunk vs DATADOG, and Cisco vs dynatrace") == ["CSCO", "DDOG", "DT"]
+
+    def test_find_tickers_needs_whole_words(self, config):
+        assert config.find_tickers("datadoggy ciscos") == []
+
 
 @pytest.mark.unit
 class TestLangSmithTracing:
     def test_configure_tracing_sets_env_vars(self):
-        config = Config()
-        config.langsmith_tracing = True
-        config.langsmith_api_key = "lsv2-test-key"
-        config.langsmith_project = "test-project"
+        config = Config(langsmith_tracing=True, langsmith_api_key="lsv2-test-key", langsmith_project="test-project")
 
         # Clean up env first
         for var in ["LANGCHAIN_TRACING_V2", "LANGCHAIN_API_KEY", "LANGSMITH_PROJECT"]:
@@ -84,9 +135,7 @@ class TestLangSmithTracing:
             os.environ.pop(var, None)
 
     def test_configure_tracing_noop_when_disabled(self):
-        config = Config()
-        config.langsmith_tracing = False
-        config.langsmith_api_key = "lsv2-test-key"
+        config = Config(langsmith_tracing=False, langsmith_api_key="lsv2-test-key")
 
         # Ensure vars are not set
         for var in ["LANGCHAIN_TRACING_V2", "LANGCHAIN_API_KEY", "LANGSMITH_PROJECT"]:
@@ -98,9 +147,7 @@ class TestLangSmithTracing:
         assert "LANGCHAIN_API_KEY" not in os.environ
 
     def test_configure_tracing_noop_when_key_missing(self):
-        config = Config()
-        config.langsmith_tracing = True
-        config.langsmith_api_key = ""
+        config = Config(langsmith_tracing=True, langsmith_api_key="")
 
         # Ensure vars are not set
         for var in ["LANGCHAIN_TRACING_V2", "LANGCHAIN_API_KEY", "LANGSMITH_PROJECT"]:
@@ -111,33 +158,28 @@ class TestLangSmithTracing:
         assert "LANGCHAIN_TRACING_V2" not in os.environ
 
     def test_validate_warns_on_tracing_without_key(self, caplog):
-        config = Config()
-        config.anthropic_api_key = "present"
-        config.tavily_api_key = "present"
-        config.langsmith_tracing = True
-        config.langsmith_api_key = ""
+        config = Config(
+            anthropic_api_key="present", tavily_api_key="present", langsmith_tracing=True, langsmith_api_key=""
+        )
 
         errors = config.validate()
         # No hard errors for LangSmith — just a warning
         assert errors == []
 
     def test_langsmith_defaults(self):
-        with patch.dict(os.environ, {}, clear=True):
-            config = Config()
-            assert config.langsmith_tracing is False
-            assert config.langsmith_api_key == ""
-            assert config.langsmith_project == "rivalry-rumble-o-tron"
+        config = Config.from_env({})
+        assert config.langsmith_tracing is False
+        assert config.langsmith_api_key == ""
+        assert config.langsmith_project == "rivalry-rumble-o-tron"
 
     def test_langsmith_loads_from_env(self):
-        with patch.dict(
-            os.environ,
+        config = Config.from_env(
             {
                 "LANGCHAIN_TRACING_V2": "true",
                 "LANGCHAIN_API_KEY": "lsv2-from-env",
                 "LANGSMITH_PROJECT": "my-project",
-            },
-        ):
-            config = Config()
-            assert config.langsmith_tracing is True
-            assert config.langsmith_api_key == "lsv2-from-env"
-            assert config.langsmith_project == "my-project"
+            }
+        )
+        assert config.langsmith_tracing is True
+        assert config.langsmith_api_key == "lsv2-from-env"
+        assert config.langsmith_project == "my-project"
@@ -8,21 +8,23 @@ from src.report.decision_tree import (
     build_decision_tree_markdown,
 )
 
+# Shared by the tree tests; they override keys in a shallow copy and never mutate it
+_BASE_META = {
+    "companies": ["DataDog", "Dynatrace"],
+    "tickers": ["DDOG", "DT"],
+    "financial_tool_calls": [
+        {"tool": "get_company_financials", "args": {"ticker": "DDOG"}},
+    ],
+    "competitor_tool_calls": [
+        {"tool": "search_company_info", "args": {"company_name": "DataDog"}},
+    ],
+}
+
 
 @pytest.mark.unit
 class TestBuildDecisionTreeMarkdown:
     def test_produces_text_tree(self):
-        metadata = {
-            "companies": ["DataDog", "Dynatrace"],
-            "tickers": ["DDOG", "DT"],
-            "financial_tool_calls": [
-                {"tool": "get_company_financials", "args": {"ticker": "DDOG"}},
-            ],
-            "competitor_tool_calls": [
-                {"tool": "search_company_info", "args": {"company_name": "DataDog"}},
-            ],
-        }
-        tree = build_decision_tree_markdown(metadata)
+        tree = build_decision_tree_markdown(_BASE_META)
         assert "User Query" in tree
         assert "Number Cruncher" in tree
         assert "Street Scout" in tree
@@ -30,12 +32,7 @@ class TestBuildDecisionTreeMarkdown:
         assert "DDOG" in tree
 
     def test_handles_empty_tool_calls(self):
-        metadata = {
-            "companies": ["DataDog"],
-            "tickers": ["DDOG"],
-            "financial_tool_calls": [],
-            "competitor_tool_calls": [],
-        }
+        metadata = {**_BASE_META, "financial_tool_calls": [], "competitor_tool_calls": []}
         tree = build_decision_tree_markdown(metadata)
         assert "0 tool calls" in tree
 
@@ -44,6 +41,19 @@ class TestBuildDecisionTreeMarkdown:
         assert "User Query" in tree
         assert "0 tool calls" in tree
 
+    def test_only_last_tool_call_uses_closing_branch(self):
+        metadata = {
+            **_BASE_META,
+            "financial_tool_calls": [
+                *_BASE_META["financial_tool_calls"],
+                {"tool": "get_historical_revenue", "args": {"ticker": "DT"}},
+            ],
+        }
+        lines = build_decision_tree_markdown(metadata).splitlines()
+        assert "│   ├── 🔧 Company Financials  (ticker=DDOG)" in lines
+        assert "│   └── 🔧 Historical Revenue  (ticker=DT)" in lines
+        assert "├── 📊 Number Cruncher — 2 tool calls" in lines
+
 
 @pytest.mark.unit
 class TestShortArgs:
@@ -0,0 +1,109 @@
+"""Unit tests for the shared background event loop."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.utils.event_loop import iter_sync, run_sync
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+@pytest.mark.unit
+class TestRunSync:
+    def test_returns_coroutine_result(self):
+        async def add(a, b):
+            return a + b
+
+        assert run_sync(add(2, 3)) == 5
+
+    def test_reuses_loop_across_calls(self):
+        assert run_sync(_current_loop()) is run_sync(_current_loop())
+
+    def test_shares_one_loop_across_threads(self):
+        main_loop = run_sync(_current_loop())
+        other = []
+        worker = threading.Thread(target=lambda: other.append(run_sync(_current_loop())))
+        worker.start()
+        worker.join()
+
+        assert other[0] is main_loop
+
+    def test_callable_from_inside_a_running_loop(self):
+        async def outer():
+            return run_sync(_current_loop())
+
+        inner_loop = asyncio.run(outer())
+        assert inner_loop is run_sync(_current_loop())
+
+    def test_rejects_calls_from_the_shared_loop(self):
+        async def reenter():
+            run_sync(_current_loop())
+
+        with pytest.raises(RuntimeError, match="shared event loop"):
+            run_sync(reenter())
+
+    def test_propagates_exceptions(self):
+        async def boom():
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError, match="bad"):
+            run_sync(boom())
+
+
+async def _count(n):
+    for i in range(n):
+        yield i
+        await asyncio.sleep(0)
+
+
+@pytest.mark.unit
+class TestIterSync:
+    def test_yields_items_in_order(self):
+        assert list(iter_sync(_count(3))) == [0, 1, 2]
+
+    def test_runs_on_the_shared_loop(self):
+        async def loops():
+            yield asyncio.get_running_loop()
+
+        assert next(iter_sync(loops())) is run_sync(_current_loop())
+
+    def test_reraises_after_last_item(self):
+        async def fails_after_one():
+            yield 1
+            raise ValueError("bad")
+
+        items = iter_sync(fails_after_one())
+        assert next(items) == 1
+        with pytest.raises(ValueError, match="bad"):
+            next(items)
+
+    def test_yields_none_while_idle(self):
+        async def slow():
+            await asyncio.sleep(0.2)
+            yield 1
+
+        items = list(iter_sync(slow(), idle_timeout=0.01))
+        assert items[-1] == 1
+        assert items[0] is None
+
+    def test_closing_early_cancels_the_iterator(self):
+        cancelled = threading.Event()
+
+        async def endless():
+            try:
+                while True:
+                    yield None
+                    await asyncio.sleep(0.01)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        items = iter_sync(endless())
+        next(items)
+        items.close()
+
+        assert cancelled.wait(timeout=5)
@@ -21,6 +21,9 @@ Dynatrace focuses on AI-powered full-stack observability.
 The observability market is estimated at $20B, growing at 12% CAGR.
 """
 
+# Well past build_focused_task's 2000-char prior-report cut-off
+_LONG_REPORT = "x" * 5000
+
 
 def _make_route_response(query_type, agents_needed, focused_task, reasoning):
     """Helper to build a mock LLM response for route_query."""
@@ -275,10 +278,9 @@ class TestBuildFocusedTask:
 
     def test_truncates_long_prior_report(self):
         """Very long prior reports are truncated to keep task string manageable."""
-        long_report = "x" * 5000
-        task = build_focused_task("financial", "query", long_report, ["A"])
+        task = build_focused_task("financial", "query", _LONG_REPORT, ["A"])
         # The template truncates at 2000 chars
-        assert len(task) < len(long_report)
+        assert len(task) < len(_LONG_REPORT)
 
     def test_handles_empty_companies(self):
         """Works with empty companies list."""
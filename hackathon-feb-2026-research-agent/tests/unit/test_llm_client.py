@@ -0,0 +1,57 @@
+"""Unit tests for the shared LLM client."""
+
+from unittest.mock import patch
+
+import pytest
+from langchain_anthropic import ChatAnthropic
+from langchain_core.messages import HumanMessage
+
+from src.llm import cached_system_message, get_llm
+
+
+@pytest.mark.unit
+class TestGetLlm:
+    def test_returns_single_shared_instance(self):
+        with patch("langchain_anthropic.ChatAnthropic") as mock_cls:
+            first = get_llm()
+            second = get_llm()
+
+            assert first is second
+            mock_cls.assert_called_once()
+
+    def test_uses_configured_model(self):
+        with (
+            patch("langchain_anthropic.ChatAnthropic") as mock_cls,
+            patch("src.llm.client.get_config") as mock_cfg,
+        ):
+            mock_cfg.return_value.model_name = "test-model"
+            mock_cfg.return_value.model_temperature = 0.5
+            mock_cfg.return_value.anthropic_api_key = "test-key"
+            mock_cfg.return_value.llm_request_timeout = 30.0
+            mock_cfg.return_value.llm_max_retries = 1
+
+            get_llm()
+
+            mock_cls.assert_called_once_with(
+                model="test-model",
+                temperature=0.5,
+                api_key="test-key",
+                default_request_timeout=30.0,
+                max_retries=1,
+            )
+
+
+@pytest.mark.unit
+class TestCachedSystemMessage:
+    def test_marks_text_block_ephemeral(self):
+        message = cached_system_message("static prompt", id="x-system")
+
+        assert message.id == "x-system"
+        assert message.content == [{"type": "text", "text": "static prompt", "cache_control": {"type": "ephemeral"}}]
+
+    def test_survives_anthropic_payload_formatting(self):
+        llm = ChatAnthropic(model="claude-sonnet-4-20250514", api_key="test-key")
+
+        payload = llm._get_request_payload([cached_system_message("static prompt"), HumanMessage(content="hi")])
+
+        assert payload["system"][0]["cache_control"] == {"type": "ephemeral"}
@@ -0,0 +1,38 @@
+"""Unit tests for the CLI entry point."""
+
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.unit
+class TestMainImport:
+    def test_import_does_not_load_agent_stack(self):
+        """The CLI can validate config before paying for LangChain/LangGraph imports."""
+        code = (
+            "import sys, src.main; "
+            "print(sorted(m for m in ('langgraph', 'langchain_anthropic', 'src.agents') if m in sys.modules))"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "[]"
+
+
+@pytest.mark.unit
+class TestAgentsPackageImport:
+    def test_light_submodule_does_not_load_every_agent(self):
+        """src.agents resolves its exports lazily; followup alone needs no LangGraph."""
+        code = (
+            "import sys, src.agents.followup; "
+            "print(sorted(m for m in ('langgraph', 'src.agents.manager') if m in sys.modules))"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "[]"
+
+    def test_exports_resolve_on_access(self):
+        import src.agents
+        from src.agents.manager import run_manager_agent
+
+        assert src.agents.run_manager_agent is run_manager_agent
+        with pytest.raises(AttributeError):
+            src.agents.not_an_agent
@@ -1,11 +1,48 @@
 """Unit tests for manager agent — sub-agents and LLM mocked."""
 
+import asyncio
+import dataclasses
 import json
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.agents.manager import extract_tool_call_summary
+from src.agents.manager import (
+    extract_tool_call_summary,
+    run_manager_agent,
+    run_manager_agent_iter,
+    run_manager_agent_stream,
+)
+from src.prompts import PARSE_REQUEST_PROMPT
+
+# Read-only manager config stand-in; attribute access is plain, unlike a MagicMock's auto-created children
+_CFG = SimpleNamespace(
+    model_name="test",
+    model_temperature=0.0,
+    anthropic_api_key="test-key",
+    manager_max_parallel_agents=4,
+    default_companies=(),
+    get_ticker=lambda company_name: None,
+    find_tickers=lambda text: [],
+)
+# Same, but the manager may run only one sub-agent at a time
+_SERIAL_CFG = SimpleNamespace(**{**vars(_CFG), "manager_max_parallel_agents": 1})
+
+
+@pytest.fixture
+def manager_env(monkeypatch, mock_llm):
+    """Point the manager at a config and LLM; call it to swap in others for the rest of the test.
+
+    Requesting the fixture is enough for the defaults, ``_CFG`` and ``mock_llm``.
+    """
+
+    def use(config=_CFG, llm=mock_llm):
+        monkeypatch.setattr("src.agents.manager.get_config", lambda: config)
+        monkeypatch.setattr("src.agents.manager.get_llm", lambda: llm)
+
+    use()
+    return use
 
 
 @pytest.mark.unit
@@ -34,395 +71,655 @@ class TestExtractToolCallSummary:
 class TestRunManagerAgent:
     @pytest.mark.asyncio
     async def test_returns_complete_dict(
-        self, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
     ):
-        with patch("src.agents.manager.get_config") as mock_cfg:
-            mock_cfg.return_value.model_name = "test"
-            mock_cfg.return_value.model_temperature = 0.0
-            mock_cfg.return_value.anthropic_api_key = "test-key"
-
-            with patch("src.agents.manager.ChatAnthropic", return_value=mock_llm):
-                # Reset singleton so create_manager_agent runs with our mocked LLM
-                import src.agents.manager as mgr_mod
+        # The parse_request node calls llm.ainvoke and generate_report calls llm.invoke;
+        # mock_llm answers both with its default parse JSON
+        result = await run_manager_agent("Compare DataDog to Dynatrace")
 
-                mgr_mod._manager_agent = None
-
-                from src.agents.manager import run_manager_agent
-
-                # The parse_request node calls llm.invoke — mock_llm returns JSON
-                # generate_report will call llm.invoke too — mock_llm returns content
-                mock_llm.invoke.return_value.content = (
-                    '{"companies": ["DataDog", "Dynatrace"], "tickers": ["DDOG", "DT"], "focus": "observability"}'
-                )
-
-                result = await run_manager_agent("Compare DataDog to Dynatrace")
-
-                assert "final_report" in result
-                assert "companies" in result
-                assert "tickers" in result
+        assert "final_report" in result
+        assert "companies" in result
+        assert "tickers" in result
 
     @pytest.mark.asyncio
     async def test_handles_top_level_error(self):
         with patch("src.agents.manager.get_manager_agent", side_effect=Exception("fatal")):
-            from src.agents.manager import run_manager_agent
-
             result = await run_manager_agent("test query")
             assert "error" in result
             assert "Error" in result["final_report"] or "fatal" in result["final_report"]
 
     @pytest.mark.asyncio
     async def test_parse_falls_back_on_json_error(
-        self, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent
+        self,
+        manager_env,
+        llm_returning,
+        config,
+        mock_run_financial_agent,
+        mock_run_competitor_agent,
+        mock_run_market_intel_agent,
     ):
-        bad_llm = MagicMock()
-        bad_llm.invoke.return_value.content = "not valid json"
-
-        with patch("src.agents.manager.get_config") as mock_cfg:
-            mock_cfg.return_value.model_name = "test"
-            mock_cfg.return_value.model_temperature = 0.0
-            mock_cfg.return_value.anthropic_api_key = "test-key"
-
-            with patch("src.agents.manager.ChatAnthropic", return_value=bad_llm):
-                import src.agents.manager as mgr_mod
-
-                mgr_mod._manager_agent = None
-
-                from src.agents.manager import run_manager_agent
-
-                result = await run_manager_agent("some query")
+        manager_env(config, llm=llm_returning("not valid json"))
+        result = await run_manager_agent("some query")
 
-                # Should fall back to defaults and still produce a report
-                assert "final_report" in result
-                assert len(result["companies"]) == 3  # default fallback
+        # Should fall back to defaults and still produce a report
+        assert "final_report" in result
+        assert result["companies"] == list(config.default_companies)
+        assert result["tickers"] == ["CSCO", "DDOG", "DT"]
 
     @pytest.mark.asyncio
     async def test_parse_falls_back_on_llm_error(
-        self, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent
+        self,
+        manager_env,
+        llm_returning,
+        config,
+        mock_run_financial_agent,
+        mock_run_competitor_agent,
+        mock_run_market_intel_agent,
     ):
-        failing_llm = MagicMock()
-        # First call (parse) raises, subsequent calls (synthesize) succeed
-        failing_llm.invoke.side_effect = [
-            Exception("LLM down"),
-            MagicMock(content="Fallback report content"),
-        ]
+        failing_llm = llm_returning("Fallback report content")
+        # Parse (async) raises, synthesize (sync) succeeds
+        failing_llm.ainvoke.side_effect = Exception("LLM down")
 
-        with patch("src.agents.manager.get_config") as mock_cfg:
-            mock_cfg.return_value.model_name = "test"
-            mock_cfg.return_value.model_temperature = 0.0
-            mock_cfg.return_value.anthropic_api_key = "test-key"
+        manager_env(config, llm=failing_llm)
+        result = await run_manager_agent("some query")
 
-            with patch("src.agents.manager.ChatAnthropic", return_value=failing_llm):
-                import src.agents.manager as mgr_mod
+        # Should fall back to defaults
+        assert "final_report" in result
+        assert len(result["companies"]) == 3
 
-                mgr_mod._manager_agent = None
+    @pytest.mark.asyncio
+    async def test_parse_dedupes_llm_output_in_order(
+        self,
+        manager_env,
+        config,
+        mock_run_financial_agent,
+        mock_run_competitor_agent,
+        mock_run_market_intel_agent,
+        mock_llm,
+    ):
+        mock_llm.ainvoke.return_value.content = json.dumps(
+            {"companies": ["Splunk", "DataDog", "Splunk"], "tickers": ["CSCO", "DDOG", "CSCO"]}
+        )
+        manager_env(config)
+        result = await run_manager_agent("What about the APM leaders?")
 
-                from src.agents.manager import run_manager_agent
+        assert result["companies"] == ["Splunk", "DataDog"]
+        assert result["tickers"] == ["CSCO", "DDOG"]
 
-                result = await run_manager_agent("some query")
+    @pytest.mark.asyncio
+    async def test_parsed_companies_without_tickers_keep_no_tickers(
+        self,
+        manager_env,
+        config,
+        mock_run_financial_agent,
+        mock_run_competitor_agent,
+        mock_run_market_intel_agent,
+        mock_llm,
+    ):
+        """Private companies parse with no tickers; the default tickers must not be swapped in."""
+        mock_llm.ainvoke.return_value.content = json.dumps(
+            {"companies": ["Grafana Labs", "Chronosphere"], "tickers": []}
+        )
+        manager_env(config)
+        result = await run_manager_agent("Who leads the observability market?")
 
-                # Should fall back to defaults
-                assert "final_report" in result
-                assert len(result["companies"]) == 3
+        assert result["companies"] == ["Grafana Labs", "Chronosphere"]
+        assert result["tickers"] == []
 
     @pytest.mark.asyncio
     async def test_handles_financial_agent_failure(
-        self, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+        self, manager_env, mock_run_competitor_agent, mock_run_market_intel_agent
     ):
         """If the financial agent fails, the report is still generated with competitor data."""
         failing_fin = AsyncMock(side_effect=Exception("financial down"))
 
-        with (
-            patch("src.agents.manager.run_financial_agent", failing_fin),
-            patch("src.agents.manager.get_config") as mock_cfg,
-            patch("src.agents.manager.ChatAnthropic", return_value=mock_llm),
-        ):
-            mock_cfg.return_value.model_name = "test"
-            mock_cfg.return_value.model_temperature = 0.0
-            mock_cfg.return_value.anthropic_api_key = "test-key"
-
-            import src.agents.manager as mgr_mod
-
-            mgr_mod._manager_agent = None
-
-            from src.agents.manager import run_manager_agent
-
+        with patch("src.agents.manager.run_financial_agent", failing_fin):
             result = await run_manager_agent("Compare DataDog to Dynatrace")
             # Should still return a report (partial)
             assert "final_report" in result
 
     @pytest.mark.asyncio
     async def test_handles_competitor_agent_failure(
-        self, mock_run_financial_agent, mock_run_market_intel_agent, mock_llm
+        self, manager_env, mock_run_financial_agent, mock_run_market_intel_agent
     ):
         """If the competitor agent fails, the report is still generated with financial data."""
         failing_comp = AsyncMock(side_effect=Exception("competitor down"))
 
-        with (
-            patch("src.agents.manager.run_competitor_agent", failing_comp),
-            patch("src.agents.manager.get_config") as mock_cfg,
-            patch("src.agents.manager.ChatAnthropic", return_value=mock_llm),
-        ):
-            mock_cfg.return_value.model_name = "test"
-            mock_cfg.return_value.model_temperature = 0.0
-            mock_cfg.return_value.anthropic_api_key = "test-key"
-
-            import src.agents.manager as mgr_mod
-
-            mgr_mod._manager_agent = None
-
-            from src.agents.manager import run_manager_agent
-
+        with patch("src.agents.manager.run_competitor_agent", failing_comp):
             result = await run_manager_agent("Compare DataDog to Dynatrace")
             assert "final_report" in result
 
     @pytest.mark.asyncio
     async def test_progress_callback_fires(
-        self, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent
     ):
         callback = MagicMock()
 
+        await run_manager_agent("Compare DataDog to Dynatrace", progress_callback=callback)
+
+        assert callback.call_count > 0
+        stages = {call.args[0]["stage"] for call in callback.call_args_list}
+        assert "parse" in stages
+        assert "financial" in stages
+        assert "market_intel" in stages
+        assert "synthesize" in stages
+
+    @pytest.mark.asyncio
+    async def test_respects_max_parallel_agents(self, manager_env):
+        """With a pool of one, sub-agents never overlap."""
+        active = 0
+        peak = 0
+
+        async def _agent(*args):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+            return {"response": "ok", "tool_calls": []}
+
+        manager_env(_SERIAL_CFG)
+        with (
+            patch("src.agents.manager.run_financial_agent", side_effect=_agent),
+            patch("src.agents.manager.run_competitor_agent", side_effect=_agent),
+            patch("src.agents.manager.run_market_intel_agent", side_effect=_agent),
+        ):
+            result = await run_manager_agent("Compare DataDog to Dynatrace")
+
+            assert result["financial_results"]["response"] == "ok"
+            assert result["market_intel_results"]["response"] == "ok"
+            assert peak == 1
+
+    @pytest.mark.asyncio
+    async def test_speculative_and_regular_agents_share_one_pool(self, manager_env, config, mock_llm):
+        """Reused speculative agents count against the same max_parallel_agents limit as new ones."""
+        active = 0
+        peak = 0
+
+        async def _agent(*args):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"response": "ok", "tool_calls": []}
+
+        mock_llm.ainvoke.return_value.content = json.dumps(
+            {"companies": list(config.default_companies), "tickers": ["CSCO", "DDOG", "DT"]}
+        )
+        manager_env(dataclasses.replace(config, manager_max_parallel_agents=2))
         with (
-            patch("src.agents.manager.get_config") as mock_cfg,
-            patch("src.agents.manager.ChatAnthropic", return_value=mock_llm),
+            patch("src.agents.manager.run_financial_agent", side_effect=_agent),
+            patch("src.agents.manager.run_competitor_agent", side_effect=_agent),
+            patch("src.agents.manager.run_market_intel_agent", side_effect=_agent),
         ):
-            mock_cfg.return_value.model_name = "test"
-            mock_cfg.return_value.model_temperature = 0.0
-            mock_cfg.return_value.anthropic_api_key = "test-key"
+            result = await run_manager_agent("Who leads the observability market?")
 
-            import src.agents.manager as mgr_mod
+        assert result["market_intel_results"]["response"] == "ok"
+        assert peak == 2
 
-            mgr_mod._manager_agent = None
+    @pytest.mark.asyncio
+    async def test_done_callback_fires_per_agent(
+        self, manager_env, mock_run_financial_agent, mock_run_market_intel_agent
+    ):
+        """A fast agent reports done while a slower one is still running."""
+        financial_done = asyncio.Event()
 
-            from src.agents.manager import run_manager_agent
+        def callback(update):
+            if update["stage"] == "financial" and update["status"] == "done":
+                financial_done.set()
 
-            await run_manager_agent("Compare DataDog to Dynatrace", progress_callback=callback)
+        async def _slow_competitor(*args):
+            await asyncio.wait_for(financial_done.wait(), timeout=5)
+            return {"response": "ok", "tool_calls": []}
 
-            assert callback.call_count > 0
-            stages = {call.args[0]["stage"] for call in callback.call_args_list}
-            assert "parse" in stages
-            assert "financial" in stages
-            assert "market_intel" in stages
-            assert "synthesize" in stages
+        with patch("src.agents.manager.run_competitor_agent", side_effect=_slow_competitor):
+            result = await run_manager_agent("Compare DataDog to Dynatrace", progress_callback=callback)
 
+            assert result["competitor_results"]["response"] == "ok"
 
-@pytest.mark.unit
-class TestFollowUpRouting:
-    """Tests for the follow-up routing path through the manager graph."""
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_finished_agent_results(
+        self, manager_env, mock_run_financial_agent, mock_run_market_intel_agent
+    ):
+        """Only the agent still running at the deadline is reported as timed out."""
+
+        async def _hung_competitor(*args):
+            await asyncio.sleep(10)
+
+        with (
+            patch("src.agents.manager.run_competitor_agent", side_effect=_hung_competitor),
+            patch("src.agents.manager._AGENT_TIMEOUT_S", 0.2),
+        ):
+            result = await run_manager_agent("Compare DataDog to Dynatrace")
+
+            assert result["competitor_results"] == {"error": "Timeout", "response": ""}
+            assert "error" not in result["financial_results"]
+            assert "error" not in result["market_intel_results"]
 
     @pytest.mark.asyncio
-    async def test_no_prior_report_runs_full_pipeline(
-        self, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+    async def test_per_agent_timeout_frees_slot_for_queued_agents(
+        self, manager_env, mock_run_competitor_agent, mock_run_market_intel_agent
     ):
-        """When prior_report is None, the full pipeline runs (existing behavior)."""
-        # mock_llm returns valid JSON for parse, then text for route (but route won't call LLM
-        # since prior_report is None)
-        mock_llm.invoke.return_value.content = (
-            '{"companies": ["DataDog", "Dynatrace"], "tickers": ["DDOG", "DT"], "focus": "observability"}'
-        )
+        """With one slot, a hung agent times out on its own and the queued agents still run."""
 
+        async def _hung_financial(*args):
+            await asyncio.sleep(10)
+
+        manager_env(_SERIAL_CFG)
         with (
-            patch("src.agents.manager.get_config") as mock_cfg,
-            patch("src.agents.manager.ChatAnthropic", return_value=mock_llm),
+            patch("src.agents.manager.run_financial_agent", side_effect=_hung_financial),
+            patch("src.agents.manager._PER_AGENT_TIMEOUT_S", 0.1),
         ):
-            mock_cfg.return_value.model_name = "test"
-            mock_cfg.return_value.model_temperature = 0.0
-            mock_cfg.return_value.anthropic_api_key = "test-key"
+            result = await run_manager_agent("Compare DataDog to Dynatrace")
+
+            assert result["financial_results"] == {"error": "Timeout", "response": ""}
+            assert "error" not in result["competitor_results"]
+            assert "error" not in result["market_intel_results"]
 
-            import src.agents.manager as mgr_mod
+    @pytest.mark.asyncio
+    async def test_synthesis_streams_tokens_through_callback(
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+    ):
+        mock_llm.invoke.return_value.content = '{"companies": ["DataDog"], "tickers": ["DDOG"]}'
+        callback = MagicMock()
+        result = await run_manager_agent("Who leads APM?", callback)
 
-            mgr_mod._manager_agent = None
+        streamed = [call.args[0]["token"] for call in callback.call_args_list if call.args[0]["status"] == "streaming"]
+        assert "".join(streamed) == result["final_report"]
 
-            from src.agents.manager import run_manager_agent
+    @pytest.mark.asyncio
+    async def test_repeated_query_parses_once(
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+    ):
+        """Near-duplicate queries reuse the cached parse."""
+        first = await run_manager_agent("Compare DataDog to Dynatrace")
+        second = await run_manager_agent("  compare datadog vs. dynatrace ")
 
-            result = await run_manager_agent("Compare DataDog to Dynatrace", prior_report=None)
+        assert mock_llm.ainvoke.await_count == 1
+        assert first["tickers"] == second["tickers"] == ["DDOG", "DT"]
 
-            assert "final_report" in result
-            assert result["query_type"] == "new_research"
-            # All 3 sub-agents should have been called
-            mock_run_financial_agent.assert_called_once()
-            mock_run_competitor_agent.assert_called_once()
-            mock_run_market_intel_agent.assert_called_once()
+    @pytest.mark.asyncio
+    async def test_explicit_tickers_skip_parse_llm(
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+    ):
+        result = await run_manager_agent("Compare CSCO vs DDOG vs DT Q3 2024 APM revenue")
+
+        mock_llm.ainvoke.assert_not_awaited()
+        assert result["tickers"] == ["CSCO", "DDOG", "DT"]
+        assert result["companies"] == ["Cisco (Splunk/AppDynamics)", "DataDog", "Dynatrace"]
 
     @pytest.mark.asyncio
-    async def test_followup_with_agents_runs_selected_agents(
+    async def test_single_ticker_with_company_name_falls_through_to_llm(
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+    ):
+        await run_manager_agent("How does DDOG compare to New Relic?")
+
+        mock_llm.ainvoke.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_known_tickers_with_another_company_fall_through_to_llm(
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+    ):
+        await run_manager_agent("CSCO vs DDOG and New Relic")
+
+        mock_llm.ainvoke.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_company_names_skip_parse_llm(
         self,
+        manager_env,
+        config,
         mock_run_financial_agent,
         mock_run_competitor_agent,
         mock_run_market_intel_agent,
-        mock_prior_report,
-        mock_prior_results,
+        mock_llm,
     ):
-        """Follow-up routed to followup_with_agents only runs the needed agents."""
-        mock_llm = MagicMock()
-        # First call: route_query classification
-        route_response = MagicMock()
-        route_response.content = json.dumps(
-            {
-                "query_type": "followup_with_agents",
-                "agents_needed": ["financial"],
-                "focused_task": "Get latest revenue data",
-                "reasoning": "Financial question",
-            }
-        )
-        # Second call: synthesize_followup
-        synth_response = MagicMock()
-        synth_response.content = "DataDog has higher revenue growth due to cloud adoption."
+        manager_env(config)
+        result = await run_manager_agent("How does datadog stack up against Dynatrace and Splunk?")
 
-        mock_llm.invoke.side_effect = [route_response, synth_response]
+        mock_llm.ainvoke.assert_not_awaited()
+        assert result["tickers"] == ["DDOG", "DT", "CSCO"]
+        assert result["companies"] == ["DataDog", "Dynatrace", "Cisco (Splunk/AppDynamics)"]
 
-        with (
-            patch("src.agents.manager.get_config") as mock_cfg,
-            patch("src.agents.manager.ChatAnthropic", return_value=mock_llm),
-        ):
-            mock_cfg.return_value.model_name = "test"
-            mock_cfg.return_value.model_temperature = 0.0
-            mock_cfg.return_value.anthropic_api_key = "test-key"
+    @pytest.mark.asyncio
+    async def test_single_company_name_falls_through_to_llm(
+        self,
+        manager_env,
+        config,
+        mock_run_financial_agent,
+        mock_run_competitor_agent,
+        mock_run_market_intel_agent,
+        mock_llm,
+    ):
+        manager_env(config)
+        await run_manager_agent("Compare Datadog to New Relic")
 
-            import src.agents.manager as mgr_mod
+        mock_llm.ainvoke.assert_awaited_once()
 
-            mgr_mod._manager_agent = None
+    @pytest.mark.asyncio
+    async def test_known_names_with_another_company_fall_through_to_llm(
+        self,
+        manager_env,
+        config,
+        mock_run_financial_agent,
+        mock_run_competitor_agent,
+        mock_run_market_intel_agent,
+        mock_llm,
+    ):
+        manager_env(config)
+        await run_manager_agent("Compare Datadog, Dynatrace and New Relic")
 
-            from src.agents.manager import run_manager_agent
+        mock_llm.ainvoke.assert_awaited_once()
 
-            result = await run_manager_agent(
-                "Why does DataDog have higher revenue growth?",
-                prior_report=mock_prior_report,
-                prior_results=mock_prior_results,
-            )
+    @pytest.mark.asyncio
+    async def test_speculative_agents_reused_when_parse_matches_defaults(
+        self,
+        manager_env,
+        config,
+        mock_run_financial_agent,
+        mock_run_competitor_agent,
+        mock_run_market_intel_agent,
+        mock_llm,
+    ):
+        mock_llm.ainvoke.return_value.content = json.dumps(
+            {"companies": ["Dynatrace", "Cisco (Splunk/AppDynamics)", "DataDog"], "tickers": ["DT", "CSCO", "DDOG"]}
+        )
+        manager_env(config)
+        await run_manager_agent("Who leads the observability market?")
 
-            assert result["query_type"] == "followup_with_agents"
-            assert "financial" in result["followup_agents"]
-            # Only financial agent should have been called
-            mock_run_financial_agent.assert_called_once()
-            # Competitor and market_intel should NOT have been called
-            mock_run_competitor_agent.assert_not_called()
-            mock_run_market_intel_agent.assert_not_called()
+        mock_run_financial_agent.assert_awaited_once_with(
+            "Analyze financial metrics for: Cisco (Splunk/AppDynamics), DataDog, Dynatrace", ["CSCO", "DDOG", "DT"]
+        )
+        mock_run_competitor_agent.assert_awaited_once()
+        mock_run_market_intel_agent.assert_awaited_once()
 
     @pytest.mark.asyncio
-    async def test_followup_context_only_skips_all_agents(
+    async def test_speculative_agents_discarded_when_parse_differs(
         self,
+        manager_env,
+        config,
         mock_run_financial_agent,
         mock_run_competitor_agent,
         mock_run_market_intel_agent,
-        mock_prior_report,
-        mock_prior_results,
     ):
-        """Context-only follow-up doesn't re-run any agents."""
-        mock_llm = MagicMock()
-        # First call: route_query classification
-        route_response = MagicMock()
-        route_response.content = json.dumps(
-            {
-                "query_type": "followup_context_only",
-                "agents_needed": [],
-                "focused_task": "Extract pricing info",
-                "reasoning": "Already in report",
-            }
+        manager_env(config)
+        await run_manager_agent("Who leads the observability market?")
+
+        mock_run_financial_agent.assert_awaited_once_with(
+            "Analyze financial metrics for: DataDog, Dynatrace", ["DDOG", "DT"]
+        )
+        mock_run_competitor_agent.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cancelling_during_parse_cancels_speculative_agents(self, manager_env, config, mock_llm):
+        started, parsing, cancelled = asyncio.Event(), asyncio.Event(), []
+
+        async def _hung_parse(*args, **kwargs):
+            parsing.set()
+            await asyncio.sleep(10)
+
+        async def _hung_agent(*args):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(args[0])
+                raise
+
+        mock_llm.ainvoke.side_effect = _hung_parse
+        manager_env(config)
+        with (
+            patch("src.agents.manager.run_financial_agent", side_effect=_hung_agent),
+            patch("src.agents.manager.run_competitor_agent", side_effect=_hung_agent),
+            patch("src.agents.manager.run_market_intel_agent", side_effect=_hung_agent),
+        ):
+            run = asyncio.create_task(run_manager_agent("Who leads the observability market?"))
+            await asyncio.wait_for(asyncio.gather(started.wait(), parsing.wait()), timeout=5)
+            run.cancel()
+            await asyncio.wait([run])
+            leftover = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            if leftover:
+                await asyncio.wait(leftover, timeout=5)
+
+        assert cancelled
+        assert all(t.done() for t in leftover)
+
+    @pytest.mark.asyncio
+    async def test_parse_sends_static_system_and_query_turn(
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+    ):
+        await run_manager_agent("Who leads APM?")
+
+        system, human = mock_llm.ainvoke.await_args.args[0]
+        assert system.content[0]["text"] == PARSE_REQUEST_PROMPT
+        assert human.content == "Request: Who leads APM?"
+
+    @pytest.mark.asyncio
+    async def test_unknown_ticker_falls_through_to_llm(
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+    ):
+        await run_manager_agent("Compare DDOG vs NEWR")
+
+        mock_llm.ainvoke.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_parse_extracts_fenced_json(
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+    ):
+        """A ```json block surrounded by prose is still parsed."""
+        mock_llm.invoke.return_value.content = (
+            'Here you go:\n```json\n{"companies": ["DataDog"], "tickers": ["DDOG"], "focus": "x"}\n```\nDone.'
         )
-        # Second call: synthesize_followup
-        synth_response = MagicMock()
-        synth_response.content = "Based on the report, DataDog uses consumption-based pricing."
+        result = await run_manager_agent("Analyze DataDog")
+
+        assert result["companies"] == ["DataDog"]
+        assert result["tickers"] == ["DDOG"]
 
-        mock_llm.invoke.side_effect = [route_response, synth_response]
+
+@pytest.mark.unit
+class TestRunManagerAgentStream:
+    @pytest.mark.asyncio
+    async def test_yields_stages_tokens_then_final(
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent
+    ):
+        events = [event async for event in run_manager_agent_stream("Compare DataDog to Dynatrace")]
+
+        assert {e["stage"] for e in events if e["type"] == "stage"} >= {"parse", "financial", "synthesize"}
+        tokens = "".join(e["text"] for e in events if e["type"] == "token")
+        final = events[-1]
+        assert final["type"] == "final"
+        assert final["report"] == final["result"]["final_report"] == tokens
+        assert [e["type"] for e in events].count("final") == 1
+
+    @pytest.mark.asyncio
+    async def test_closing_early_cancels_the_run(self, manager_env):
+        started = asyncio.Event()
+
+        async def _hung_agent(*args):
+            started.set()
+            await asyncio.sleep(10)
 
         with (
-            patch("src.agents.manager.get_config") as mock_cfg,
-            patch("src.agents.manager.ChatAnthropic", return_value=mock_llm),
+            patch("src.agents.manager.run_financial_agent", side_effect=_hung_agent),
+            patch("src.agents.manager.run_competitor_agent", side_effect=_hung_agent),
+            patch("src.agents.manager.run_market_intel_agent", side_effect=_hung_agent),
         ):
-            mock_cfg.return_value.model_name = "test"
-            mock_cfg.return_value.model_temperature = 0.0
-            mock_cfg.return_value.anthropic_api_key = "test-key"
+            stream = run_manager_agent_stream("Compare DataDog to Dynatrace")
+            async for event in stream:
+                if event.get("stage") == "financial" and event.get("status") == "running":
+                    break
+            await asyncio.wait_for(started.wait(), timeout=5)
+            await stream.aclose()
+
+        assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
 
-            import src.agents.manager as mgr_mod
+    def test_iter_reuses_one_loop_across_queries(self, manager_env, mock_run_market_intel_agent):
+        """Consecutive UI queries share the background loop instead of starting one each."""
+        loops = []
 
-            mgr_mod._manager_agent = None
+        async def _agent(*args):
+            loops.append(asyncio.get_running_loop())
+            return {"response": "ok", "tool_calls": []}
 
-            from src.agents.manager import run_manager_agent
+        with (
+            patch("src.agents.manager.run_financial_agent", side_effect=_agent),
+            patch("src.agents.manager.run_competitor_agent", side_effect=_agent),
+        ):
+            for _ in range(2):
+                assert list(run_manager_agent_iter("Compare DataDog to Dynatrace"))[-1]["type"] == "final"
 
-            result = await run_manager_agent(
-                "What did you find about pricing?",
-                prior_report=mock_prior_report,
-                prior_results=mock_prior_results,
-            )
+        assert len(loops) == 4
+        assert len(set(loops)) == 1
 
-            assert result["query_type"] == "followup_context_only"
-            # No agents should have been called
-            mock_run_financial_agent.assert_not_called()
-            mock_run_competitor_agent.assert_not_called()
-            mock_run_market_intel_agent.assert_not_called()
-            assert "pricing" in result["final_report"].lower()
+
+@pytest.mark.unit
+class TestFollowUpRouting:
+    """Tests for the follow-up routing path through the manager graph."""
 
     @pytest.mark.asyncio
-    async def test_route_error_falls_back_to_full_pipeline(
+    async def test_no_prior_report_runs_full_pipeline(
+        self, manager_env, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent, mock_llm
+    ):
+        """When prior_report is None, the full pipeline runs (existing behavior)."""
+        # mock_llm's default parse JSON covers parse; route won't call the LLM since prior_report is None
+        result = await run_manager_agent("Compare DataDog to Dynatrace", prior_report=None)
+
+        assert "final_report" in result
+        assert result["query_type"] == "new_research"
+        # All 3 sub-agents should have been called
+        mock_run_financial_agent.assert_called_once()
+        mock_run_competitor_agent.assert_called_once()
+        mock_run_market_intel_agent.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_followup_with_agents_runs_selected_agents(
         self,
+        manager_env,
         mock_run_financial_agent,
         mock_run_competitor_agent,
         mock_run_market_intel_agent,
         mock_prior_report,
         mock_prior_results,
+        llm_returning,
     ):
-        """If route_query classification fails, it falls back to new_research (full pipeline)."""
-        mock_llm = MagicMock()
-        # First call: route_query gets invalid JSON → falls back to new_research
-        route_response = MagicMock()
-        route_response.content = "I cannot classify this"
-        # Second call: parse_request
-        parse_response = MagicMock()
-        parse_response.content = '{"companies": ["DataDog", "Dynatrace"], "tickers": ["DDOG", "DT"], "focus": "test"}'
-        # Third call: synthesize
-        synth_response = MagicMock()
-        synth_response.content = "Full report content"
-
-        mock_llm.invoke.side_effect = [route_response, parse_response, synth_response]
+        """Follow-up routed to followup_with_agents only runs the needed agents."""
+        mock_llm = llm_returning(
+            # First call: route_query classification
+            json.dumps(
+                {
+                    "query_type": "followup_with_agents",
+                    "agents_needed": ["financial"],
+                    "focused_task": "Get latest revenue data",
+                    "reasoning": "Financial question",
+                }
+            ),
+            # Second call: synthesize_followup
+            "DataDog has higher revenue growth due to cloud adoption.",
+        )
 
-        with (
-            patch("src.agents.manager.get_config") as mock_cfg,
-            patch("src.agents.manager.ChatAnthropic", return_value=mock_llm),
-        ):
-            mock_cfg.return_value.model_name = "test"
-            mock_cfg.return_value.model_temperature = 0.0
-            mock_cfg.return_value.anthropic_api_key = "test-key"
+        manager_env(llm=mock_llm)
+        result = await run_manager_agent(
+            "Why does DataDog have higher revenue growth?",
+            prior_report=mock_prior_report,
+            prior_results=mock_prior_results,
+        )
 
-            import src.agents.manager as mgr_mod
+        assert result["query_type"] == "followup_with_agents"
+        assert "financial" in result["followup_agents"]
+        # Only financial agent should have been called
+        mock_run_financial_agent.assert_called_once()
+        # Competitor and market_intel should NOT have been called
+        mock_run_competitor_agent.assert_not_called()
+        mock_run_market_intel_agent.assert_not_called()
 
-            mgr_mod._manager_agent = None
+    @pytest.mark.asyncio
+    async def test_followup_context_only_skips_all_agents(
+        self,
+        manager_env,
+        mock_run_financial_agent,
+        mock_run_competitor_agent,
+        mock_run_market_intel_agent,
+        mock_prior_report,
+        mock_prior_results,
+        llm_returning,
+    ):
+        """Context-only follow-up doesn't re-run any agents."""
+        mock_llm = llm_returning(
+            # First call: route_query classification
+            json.dumps(
+                {
+                    "query_type": "followup_context_only",
+                    "agents_needed": [],
+                    "focused_task": "Extract pricing info",
+                    "reasoning": "Already in report",
+                }
+            ),
+            # Second call: synthesize_followup
+            "Based on the report, DataDog uses consumption-based pricing.",
+        )
 
-            from src.agents.manager import run_manager_agent
+        manager_env(llm=mock_llm)
+        result = await run_manager_agent(
+            "What did you find about pricing?",
+            prior_report=mock_prior_report,
+            prior_results=mock_prior_results,
+        )
 
-            result = await run_manager_agent(
-                "Tell me more",
-                prior_report=mock_prior_report,
-                prior_results=mock_prior_results,
-            )
+        assert result["query_type"] == "followup_context_only"
+        # No agents should have been called
+        mock_run_financial_agent.assert_not_called()
+        mock_run_competitor_agent.assert_not_called()
+        mock_run_market_intel_agent.assert_not_called()
+        assert "pricing" in result["final_report"].lower()
 
-            # Should fall back to full pipeline
-            assert result["query_type"] == "new_research"
-            assert "final_report" in result
+    @pytest.mark.asyncio
+    async def test_route_error_falls_back_to_full_pipeline(
+        self,
+        manager_env,
+        mock_run_financial_agent,
+        mock_run_competitor_agent,
+        mock_run_market_intel_agent,
+        mock_prior_report,
+        mock_prior_results,
+        llm_returning,
+    ):
+        """If route_query classification fails, it falls back to new_research (full pipeline)."""
+        mock_llm = llm_returning(
+            # First call: route_query gets invalid JSON → falls back to new_research
+            "I cannot classify this",
+            # Second call: synthesize
+            "Full report content",
+            # parse_request (async)
+            async_reply='{"companies": ["DataDog", "Dynatrace"], "tickers": ["DDOG", "DT"], "focus": "test"}',
+        )
+
+        manager_env(llm=mock_llm)
+        result = await run_manager_agent(
+            "Tell me more",
+            prior_report=mock_prior_report,
+            prior_results=mock_prior_results,
+        )
+
+        # Should fall back to full pipeline
+        assert result["query_type"] == "new_research"
+        assert "final_report" in result
 
     @pytest.mark.asyncio
     async def test_followup_progress_callback_includes_route_stage(
-        self, mock_run_financial_agent, mock_run_competitor_agent, mock_run_market_intel_agent
+        self,
+        manager_env,
+        llm_returning,
+        mock_run_financial_agent,
+        mock_run_competitor_agent,
+        mock_run_market_intel_agent,
     ):
         """Progress callback fires 'route' stage for all queries."""
         callback = MagicMock()
-        mock_llm = MagicMock()
-        mock_llm.invoke.return_value.content = '{"companies": ["DataDog"], "tickers": ["DDOG"], "focus": "test"}'
-
-        with (
-            patch("src.agents.manager.get_config") as mock_cfg,
-            patch("src.agents.manager.ChatAnthropic", return_value=mock_llm),
-        ):
-            mock_cfg.return_value.model_name = "test"
-            mock_cfg.return_value.model_temperature = 0.0
-            mock_cfg.return_value.anthropic_api_key = "test-key"
-
-            import src.agents.manager as mgr_mod
-
-            mgr_mod._manager_agent = None
-
-            from src.agents.manager import run_manager_agent
+        mock_llm = llm_returning('{"companies": ["DataDog"], "tickers": ["DDOG"], "focus": "test"}')
 
-            await run_manager_agent("Compare DataDog to Dynatrace", progress_callback=callback)
+        manager_env(llm=mock_llm)
+        await run_manager_agent("Compare DataDog to Dynatrace", progress_callback=callback)
 
-            stages = {call.args[0]["stage"] for call in callback.call_args_list}
-            assert "route" in stages
+        stages = {call.args[0]["stage"] for call in callback.call_args_list}
+        assert "route" in stages
@@ -0,0 +1,55 @@
+"""Unit tests for the shared message-history helpers."""
+
+from functools import lru_cache
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.agents._message_utils import extract_tool_calls
+
+
+@lru_cache(maxsize=None)
+def _tool_pair(name: str, content: str, args: tuple = ()) -> tuple[AIMessage, ToolMessage]:
+    """An AI tool call and its ToolMessage reply, built once per distinct input; treat as read-only."""
+    ai_msg = AIMessage(content="", tool_calls=[{"id": "tc1", "name": name, "args": dict(args)}])
+    return ai_msg, ToolMessage(content=content, tool_call_id="tc1")
+
+
+@pytest.mark.unit
+class TestExtractToolCalls:
+    def test_extracts_paired_calls(self):
+        pair = _tool_pair("get_company_financials", "Datadog financials data here", (("ticker", "DDOG"),))
+
+        result = extract_tool_calls(list(pair))
+        assert len(result) == 1
+        assert result[0]["tool"] == "get_company_financials"
+        assert result[0]["args"] == {"ticker": "DDOG"}
+        assert result[0]["result_preview"] == "Datadog financials data here"
+
+    def test_handles_empty_messages(self):
+        assert extract_tool_calls([]) == []
+
+    @pytest.mark.parametrize(
+        "content_len,preview_len",
+        [(200, 200), (201, 203), (300, 203)],  # 200 chars + "..." once over the limit
+    )
+    def test_truncates_long_results(self, content_len, preview_len):
+        result = extract_tool_calls(list(_tool_pair("search", "x" * content_len)))
+        preview = result[0]["result_preview"]
+        assert len(preview) == preview_len
+        assert preview.endswith("...") == (content_len > 200)
+
+    def test_handles_messages_without_tool_calls(self):
+        result = extract_tool_calls([HumanMessage(content="hi"), AIMessage(content="hello")])
+        assert result == []
+
+    def test_ignores_non_message_entries(self):
+        ai_msg, tool_msg = _tool_pair("search", "found it")
+        result = extract_tool_calls([object(), ai_msg, object(), tool_msg])
+        assert [tc["result_preview"] for tc in result] == ["found it"]
+
+    def test_skips_unmatched_tool_messages(self):
+        ai_msg, _ = _tool_pair("search", "orphan")
+        stray = ToolMessage(content="orphan", tool_call_id="other")
+
+        assert extract_tool_calls([ai_msg, stray]) == []
@@ -0,0 +1,51 @@
+"""Unit tests for the manager parse cache."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.cache import ParseCache, normalize_query
+
+RESULT = (("DataDog", "Dynatrace"), ("DDOG", "DT"))
+
+
+@pytest.mark.unit
+class TestNormalizeQuery:
+    def test_folds_case_punctuation_and_connectives(self):
+        assert normalize_query("Compare Cisco vs. Datadog!") == normalize_query("compare  cisco to datadog")
+
+    def test_keeps_distinct_companies_distinct(self):
+        assert normalize_query("Compare Cisco vs Datadog") != normalize_query("Compare Cisco vs Dynatrace")
+
+
+@pytest.mark.unit
+class TestParseCache:
+    def test_miss_then_hit(self):
+        cache = ParseCache()
+        assert cache.get("Compare DataDog to Dynatrace") is None
+
+        cache.set("Compare DataDog to Dynatrace", RESULT)
+        assert cache.get("compare datadog versus dynatrace") == RESULT
+
+    def test_evicts_least_recently_used(self):
+        cache = ParseCache(maxsize=2)
+        cache.set("a", RESULT)
+        cache.set("b", RESULT)
+        cache.get("a")
+        cache.set("c", RESULT)
+
+        assert cache.get("a") == RESULT
+        assert cache.get("b") is None
+
+    def test_expired_entries_miss(self):
+        cache = ParseCache(ttl=10)
+        with patch("src.cache.ttl.time.monotonic", return_value=100.0):
+            cache.set("query", RESULT)
+        with patch("src.cache.ttl.time.monotonic", return_value=111.0):
+            assert cache.get("query") is None
+
+    def test_clear(self):
+        cache = ParseCache()
+        cache.set("query", RESULT)
+        cache.clear()
+        assert cache.get("query") is None
@@ -0,0 +1,106 @@
+"""Unit tests for the background progress pump."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.utils.progress import ProgressPump
+
+
+@pytest.mark.unit
+class TestProgressPump:
+    @pytest.mark.asyncio
+    async def test_delivers_events_in_order_before_close_returns(self):
+        received = []
+        pump = ProgressPump(received.append)
+
+        for i in range(5):
+            pump.emit({"stage": "parse", "n": i})
+        await pump.aclose()
+
+        assert [event["n"] for event in received] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_emit_does_not_wait_for_callback(self):
+        received = []
+        pump = ProgressPump(received.append, window=10)
+
+        pump.emit({"stage": "parse"})
+        await asyncio.sleep(0)
+
+        assert received == []
+        await pump.aclose()
+        assert received == [{"stage": "parse"}]
+
+    @pytest.mark.asyncio
+    async def test_accepts_events_from_other_threads(self):
+        received = []
+        pump = ProgressPump(received.append)
+
+        worker = threading.Thread(target=pump.emit, args=({"stage": "synthesize"},))
+        worker.start()
+        await asyncio.to_thread(worker.join)
+        await pump.aclose()
+
+        assert received == [{"stage": "synthesize"}]
+
+    @pytest.mark.asyncio
+    async def test_callback_error_does_not_stop_delivery(self):
+        received = []
+
+        def flaky(event):
+            if event["n"] == 0:
+                raise RuntimeError("render failed")
+            received.append(event)
+
+        pump = ProgressPump(flaky)
+        pump.emit({"n": 0})
+        pump.emit({"n": 1})
+        await pump.aclose()
+
+        assert received == [{"n": 1}]
+
+    @pytest.mark.asyncio
+    async def test_coalesces_superseded_updates_within_a_batch(self):
+        received = []
+        pump = ProgressPump(received.append)
+
+        pump.emit({"stage": "financial", "status": "running", "detail": "Fetching"})
+        pump.emit({"stage": "financial", "status": "running", "detail": "Analyzing"})
+        pump.emit({"stage": "market_intel", "status": "running", "detail": "Searching"})
+        pump.emit({"stage": "financial", "status": "done", "detail": "Done"})
+        await pump.aclose()
+
+        assert [(e["stage"], e["status"], e["detail"]) for e in received] == [
+            ("financial", "running", "Analyzing"),
+            ("market_intel", "running", "Searching"),
+            ("financial", "done", "Done"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_keeps_status_transitions_in_order(self):
+        received = []
+        pump = ProgressPump(received.append)
+
+        pump.emit({"stage": "financial", "status": "running", "detail": "a"})
+        pump.emit({"stage": "financial", "status": "done", "detail": ""})
+        pump.emit({"stage": "financial", "status": "running", "detail": "b"})
+        await pump.aclose()
+
+        assert [(e["status"], e["detail"]) for e in received] == [("running", "a"), ("done", ""), ("running", "b")]
+
+    @pytest.mark.asyncio
+    async def test_joins_adjacent_streaming_tokens(self):
+        received = []
+        pump = ProgressPump(received.append)
+
+        for token in ("Apple ", "vs ", "Microsoft"):
+            pump.emit({"stage": "synthesize", "status": "streaming", "token": token})
+        pump.emit({"stage": "synthesize", "status": "done"})
+        await pump.aclose()
+
+        assert received == [
+            {"stage": "synthesize", "status": "streaming", "token": "Apple vs Microsoft"},
+            {"stage": "synthesize", "status": "done"},
+        ]
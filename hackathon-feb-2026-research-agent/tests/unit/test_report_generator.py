@@ -3,9 +3,11 @@
 from unittest.mock import MagicMock
 
 import pytest
+from langchain_core.messages import AIMessageChunk
 
 from src.report.generator import (
     _generate_basic_report,
+    agenerate_report,
     format_as_markdown_table,
     generate_report,
 )
@@ -36,6 +38,9 @@ class TestGenerateReport:
             llm=mock_llm,
         )
         assert "Synthesized Report" in report
+        system, human = mock_llm.invoke.call_args.args[0]
+        assert system.content[0]["cache_control"] == {"type": "ephemeral"}
+        assert "fin data" in human.content
 
     def test_falls_back_to_basic_on_llm_error(self):
         failing_llm = MagicMock()
@@ -64,6 +69,79 @@ class TestGenerateReport:
         assert "not available" in report.lower() or len(report) > 0
 
 
+@pytest.mark.unit
+class TestAgenerateReport:
+    @pytest.mark.asyncio
+    async def test_streams_tokens_and_returns_full_report(self):
+        async def _astream(messages):
+            for piece in ["# Report", "\n", "Body"]:
+                yield AIMessageChunk(content=piece)
+
+        llm = MagicMock()
+        llm.astream = MagicMock(side_effect=_astream)
+        tokens = []
+
+        report = await agenerate_report(
+            query="Compare DataDog vs Dynatrace",
+            companies=["DataDog", "Dynatrace"],
+            financial_data={"response": "fin data"},
+            competitor_data=None,
+            llm=llm,
+            on_token=tokens.append,
+        )
+
+        assert tokens == ["# Report", "\n", "Body"]
+        assert report == "# Report\nBody"
+
+    @pytest.mark.asyncio
+    async def test_streams_text_from_content_blocks(self):
+        async def _astream(messages):
+            yield AIMessageChunk(content=[{"type": "text", "text": "# Report", "index": 0}])
+            yield AIMessageChunk(content=[{"type": "tool_use", "id": "t1", "name": "x", "input": {}, "index": 1}])
+            yield AIMessageChunk(content=[{"type": "text", "text": " body", "index": 0}])
+
+        llm = MagicMock()
+        llm.astream = MagicMock(side_effect=_astream)
+        tokens = []
+
+        report = await agenerate_report(
+            query="test",
+            companies=["DataDog"],
+            financial_data=None,
+            competitor_data=None,
+            llm=llm,
+            on_token=tokens.append,
+        )
+
+        assert tokens == ["# Report", " body"]
+        assert report == "# Report body"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_basic_on_stream_error(self):
+        async def _astream(messages):
+            raise RuntimeError("stream dropped")
+            yield
+
+        llm = MagicMock()
+        llm.astream = MagicMock(side_effect=_astream)
+
+        report = await agenerate_report(
+            query="test",
+            companies=["DataDog"],
+            financial_data={"response": "Financial data here"},
+            competitor_data=None,
+            llm=llm,
+        )
+
+        assert "Financial data here" in report
+        assert "Yahoo Finance" in report
+
+    @pytest.mark.asyncio
+    async def test_without_llm_produces_basic_report(self):
+        report = await agenerate_report(query="test", companies=["DataDog"], financial_data=None, competitor_data=None)
+        assert "# Competitive Analysis" in report
+
+
 @pytest.mark.unit
 class TestGenerateBasicReport:
     def test_includes_all_sections(self):
@@ -110,3 +188,27 @@ class TestFormatAsMarkdownTable:
 
     def test_handles_empty_headers(self):
         assert format_as_markdown_table([], [["a"]]) == ""
+
+    @pytest.mark.asyncio
+    async def test_mid_stream_error_keeps_the_streamed_report(self):
+        async def _astream(messages):
+            yield AIMessageChunk(content="# Partial")
+            raise RuntimeError("stream dropped")
+
+        llm = MagicMock()
+        llm.astream = MagicMock(side_effect=_astream)
+        tokens = []
+
+        report = await agenerate_report(
+            query="test",
+            companies=["DataDog"],
+            financial_data={"response": "Financial data here"},
+            competitor_data=None,
+            llm=llm,
+            on_token=tokens.append,
+        )
+
+        assert report == "".join(tokens)
+        assert report.startswith("# Partial")
+        assert "interrupted" in report
+        assert "Financial data here" not in report
@@ -0,0 +1,61 @@
+"""Unit tests for the on-disk report store."""
+
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from src.cache import ReportStore
+
+OUTPUT = {"final_report": "# Verdict", "companies": ["DataDog"], "financial_results": {"tickers": ["DDOG"]}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ReportStore(tmp_path / "reports.sqlite3")
+
+
+@pytest.mark.unit
+class TestReportStore:
+    def test_miss_then_hit_on_normalized_query(self, store):
+        assert store.get("Compare DataDog to Dynatrace") is None
+
+        store.set("Compare DataDog to Dynatrace", OUTPUT)
+        assert store.get("compare  datadog versus Dynatrace!") == OUTPUT
+
+    def test_shared_between_instances_on_the_same_file(self, store):
+        store.set("DDOG vs DT", OUTPUT)
+
+        assert ReportStore(store.path).get("DDOG vs DT") == OUTPUT
+
+    def test_expired_entries_miss(self, store):
+        with patch("src.cache.report_store.time.time", return_value=1000.0):
+            store.set("DDOG vs DT", OUTPUT)
+        with patch("src.cache.report_store.time.time", return_value=1000.0 + store.ttl + 1):
+            assert store.get("DDOG vs DT") is None
+
+    def test_version_bump_invalidates_entries(self, store):
+        store.set("DDOG vs DT", OUTPUT)
+
+        with patch("src.cache.report_store.AGENT_VERSION", "next"):
+            assert store.get("DDOG vs DT") is None
+
+    def test_storage_errors_are_misses(self, store):
+        with patch("src.cache.report_store.sqlite3.connect", side_effect=sqlite3.OperationalError("disk I/O error")):
+            store.set("DDOG vs DT", OUTPUT)
+            assert store.get("DDOG vs DT") is None
+
+    def test_unwritable_path_disables_the_store(self, tmp_path):
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        store = ReportStore(blocker / "reports.sqlite3")
+
+        assert not store.enabled
+        store.set("DDOG vs DT", OUTPUT)
+        store.clear()
+        assert store.get("DDOG vs DT") is None
+
+    def test_unserializable_output_is_skipped(self, store):
+        store.set("DDOG vs DT", {"final_report": object()})
+
+        assert store.get("DDOG vs DT") is None
@@ -5,34 +5,26 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from src.utils.retry import retry_transient
+from src.utils.retry import TRANSIENT_POLICY, retry_transient
 
 
 @pytest.mark.unit
 class TestRetryTransient:
-    def test_retries_on_connection_error(self):
-        """Function that fails twice with ConnectionError then succeeds is retried."""
-        func = MagicMock(side_effect=[ConnectionError("conn failed"), ConnectionError("conn failed"), "ok"])
+    @pytest.mark.parametrize(
+        "exc,retries",
+        [(ConnectionError, True), (TimeoutError, True), (OSError, True), (ValueError, False), (KeyError, False)],
+    )
+    def test_retries_only_transient_errors(self, exc, retries):
+        """Transient errors are retried; permanent ones (bad input, programming errors) surface at once."""
+        func = MagicMock(side_effect=[exc("failed"), "ok"])
         decorated = retry_transient(max_attempts=3)(func)
-        result = decorated()
-        assert result == "ok"
-        assert func.call_count == 3
-
-    def test_retries_on_timeout_error(self):
-        """Function that fails with TimeoutError is retried."""
-        func = MagicMock(side_effect=[TimeoutError("timed out"), "ok"])
-        decorated = retry_transient(max_attempts=3)(func)
-        result = decorated()
-        assert result == "ok"
-        assert func.call_count == 2
-
-    def test_retries_on_os_error(self):
-        """Function that fails with OSError is retried."""
-        func = MagicMock(side_effect=[OSError("network unreachable"), "ok"])
-        decorated = retry_transient(max_attempts=3)(func)
-        result = decorated()
-        assert result == "ok"
-        assert func.call_count == 2
+        if retries:
+            assert decorated() == "ok"
+            assert func.call_count == 2
+        else:
+            with pytest.raises(exc):
+                decorated()
+            assert func.call_count == 1
 
     def test_gives_up_after_max_attempts(self):
         """Function that always fails exhausts max_attempts and reraises."""
@@ -42,22 +34,6 @@ class TestRetryTransient:
             decorated()
         assert func.call_count == 3
 
-    def test_does_not_retry_value_error(self):
-        """ValueError is a permanent error — not retried."""
-        func = MagicMock(side_effect=ValueError("bad input"))
-        decorated = retry_transient(max_attempts=3)(func)
-        with pytest.raises(ValueError, match="bad input"):
-            decorated()
-        assert func.call_count == 1
-
-    def test_does_not_retry_key_error(self):
-        """KeyError is a permanent error — not retried."""
-        func = MagicMock(side_effect=KeyError("missing"))
-        decorated = retry_transient(max_attempts=3)(func)
-        with pytest.raises(KeyError):
-            decorated()
-        assert func.call_count == 1
-
     def test_logging_on_retry(self, caplog):
         """Retry attempts are logged at WARNING level."""
         func = MagicMock(side_effect=[ConnectionError("fail"), "ok"])
@@ -67,3 +43,16 @@ class TestRetryTransient:
         assert result == "ok"
         # before_sleep_log should have emitted a warning
         assert any("Retrying" in record.message for record in caplog.records)
+
+    def test_policy_is_built_once_per_attempt_count(self):
+        """Repeated factory calls return the same cached decorator."""
+        assert retry_transient() is retry_transient(max_attempts=3) is TRANSIENT_POLICY
+        assert retry_transient(max_attempts=5) is not TRANSIENT_POLICY
+
+    def test_shared_policy_keeps_wrapped_functions_independent(self):
+        """Functions decorated with the shared policy retry independently."""
+        first = MagicMock(side_effect=[ConnectionError("conn failed"), "first"])
+        second = MagicMock(return_value="second")
+        assert TRANSIENT_POLICY(first)() == "first"
+        assert TRANSIENT_POLICY(second)() == "second"
+        assert (first.call_count, second.call_count) == (2, 1)
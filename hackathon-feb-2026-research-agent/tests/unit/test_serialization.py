@@ -0,0 +1,50 @@
+"""Unit tests for the JSON serialization helpers."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import serialization
+
+
+@pytest.mark.unit
+class TestSerialization:
+    def test_round_trip(self):
+        data = {"companies": ["DataDog", "Dynatrace"], "tickers": ["DDOG", "DT"], "nested": {"n": 1}}
+        assert serialization.loads(serialization.dumps(data)) == data
+
+    def test_loads_accepts_bytes(self):
+        assert serialization.loads(b'{"a": 1}') == {"a": 1}
+
+    def test_invalid_json_raises_stdlib_error(self):
+        with pytest.raises(serialization.JSONDecodeError):
+            serialization.loads("not valid json")
+
+    def test_falls_back_to_stdlib_without_orjson(self):
+        with patch.object(serialization, "orjson", None):
+            assert serialization.dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+            assert serialization.loads('{"a": [1, 2]}') == {"a": [1, 2]}
+            with pytest.raises(serialization.JSONDecodeError):
+                serialization.loads("{bad")
+
+
+@pytest.mark.unit
+class TestLoadsFenced:
+    @pytest.mark.parametrize(
+        "content",
+        [
+            '{"a": 1}',
+            '  {"a": 1}\n',
+            '```json\n{"a": 1}\n```',
+            '```\n{"a": 1}\n```',
+            'Sure, here it is:\n```json\n{"a": 1}\n```\nLet me know!',
+            '```json\n{"a": 1}\n',
+        ],
+        ids=["bare", "whitespace", "json-fence", "plain-fence", "prose-around", "unclosed-fence"],
+    )
+    def test_extracts_json(self, content):
+        assert serialization.loads_fenced(content) == {"a": 1}
+
+    def test_invalid_body_raises(self):
+        with pytest.raises(serialization.JSONDecodeError):
+            serialization.loads_fenced("```json\nnope\n```")
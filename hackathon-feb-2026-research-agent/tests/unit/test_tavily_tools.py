@@ -1,19 +1,32 @@
 """Unit tests for Tavily tools — all external calls mocked."""
 
 import os
-from unittest.mock import MagicMock, patch
+import threading
+from unittest.mock import patch
 
 import pytest
 
 from src.tools.tavily_tools import (
+    _Q_COMPETITIVE_VS,
+    _Q_PRODUCT,
     _get_client,
     search_company_info,
+    search_company_info_batch,
     search_competitive_analysis,
     search_market_trends,
     search_product_info,
 )
 
 
+def _raiser(exc):
+    """A stand-in for a client getter that raises ``exc`` when called."""
+
+    def fail():
+        raise exc
+
+    return fail
+
+
 @pytest.mark.unit
 class TestSearchCompanyInfo:
     def test_returns_correct_structure(self, mock_tavily_client):
@@ -23,28 +36,60 @@ class TestSearchCompanyInfo:
         assert len(result["results"]) == 1
         assert result["results"][0]["title"] == "Test Result"
 
-    def test_returns_error_on_api_exception(self):
-        with patch("src.tools.tavily_tools._get_client", side_effect=Exception("API down")):
-            result = search_company_info.invoke({"company_name": "DataDog"})
-            assert "error" in result
-            assert result["results"] == []
+    def test_returns_error_on_api_exception(self, monkeypatch):
+        monkeypatch.setattr("src.tools.tavily_tools._get_client", _raiser(Exception("API down")))
+        result = search_company_info.invoke({"company_name": "DataDog"})
+        assert "error" in result
+        assert result["results"] == []
 
     def test_returns_error_when_no_api_key(self):
         with patch.dict(os.environ, {}, clear=True):
-            import src.tools.tavily_tools as mod
-
-            mod._tavily_client = None
+            _get_client.cache_clear()
             result = search_company_info.invoke({"company_name": "Test"})
             assert isinstance(result, dict)
             # Should either have error or empty results (key might come from .env)
             assert "error" in result or "results" in result
 
+    def test_defaults_to_basic_depth(self, mock_tavily_client):
+        search_company_info.invoke({"company_name": "DataDog"})
+        assert mock_tavily_client.search.call_args.kwargs["search_depth"] == "basic"
+
+    def test_advanced_depth_is_opt_in(self, mock_tavily_client):
+        search_company_info.invoke({"company_name": "DataDog", "search_depth": "advanced"})
+        assert mock_tavily_client.search.call_args.kwargs["search_depth"] == "advanced"
+
     def test_empty_company_name_returns_error(self):
         result = search_company_info.invoke({"company_name": ""})
         assert "error" in result
         assert result["error"] == "Empty company name"
 
 
+@pytest.mark.unit
+class TestSearchCompanyInfoBatch:
+    def test_returns_one_result_per_company_in_order(self, mock_tavily_client):
+        results = search_company_info_batch.invoke({"company_names": ["DataDog", "Dynatrace", "Cisco"]})
+        assert [r["company"] for r in results] == ["DataDog", "Dynatrace", "Cisco"]
+        assert mock_tavily_client.search.call_count == 3
+
+    def test_runs_searches_concurrently(self, mock_tavily_client):
+        # Each search waits for the other; sequential dispatch would time out
+        barrier = threading.Barrier(2, timeout=5)
+
+        def search(**kwargs):
+            barrier.wait()
+            return {"results": []}
+
+        mock_tavily_client.search.side_effect = search
+        results = search_company_info_batch.invoke({"company_names": ["DataDog", "Dynatrace"]})
+        assert all("error" not in r for r in results)
+
+    def test_failure_is_isolated_to_its_company(self, monkeypatch):
+        monkeypatch.setattr("src.tools.tavily_tools._get_client", _raiser(Exception("API down")))
+        results = search_company_info_batch.invoke({"company_names": ["DataDog", ""]})
+        assert results[0]["error"] == "API down"
+        assert results[1]["error"] == "Empty company name"
+
+
 @pytest.mark.unit
 class TestSearchCompetitiveAnalysis:
     def test_builds_query_with_competitors(self, mock_tavily_client):
@@ -59,6 +104,7 @@ class TestSearchCompetitiveAnalysis:
         # Verify the search was called with a "vs" query
         call_args = mock_tavily_client.search.call_args
         assert "vs" in call_args[1]["query"] or "vs" in call_args.kwargs.get("query", "")
+        assert call_args.kwargs["search_depth"] == "advanced"
 
     def test_works_without_competitors(self, mock_tavily_client):
         result = search_competitive_analysis.invoke(
@@ -92,47 +138,60 @@ class TestSearchMarketTrends:
         assert result["source"] == "tavily"
 
 
+@pytest.mark.unit
+class TestQueryTemplates:
+    def test_competitive_vs_query(self):
+        query = _Q_COMPETITIVE_VS(name="DataDog", others="Dynatrace vs Splunk")
+        assert query == "DataDog vs Dynatrace vs Splunk comparison competitive analysis"
+
+    def test_product_query_passes_through_to_search(self, mock_tavily_client):
+        search_product_info.invoke({"company_name": "DataDog", "product_category": "APM"})
+        expected = _Q_PRODUCT(name="DataDog", category="APM")
+        assert mock_tavily_client.search.call_args.kwargs["query"] == expected == "DataDog APM product features pricing"
+
+
 @pytest.mark.unit
 class TestGetClient:
     def test_raises_when_key_missing(self):
         with patch.dict(os.environ, {}, clear=True):
-            import src.tools.tavily_tools as mod
-
-            mod._tavily_client = None
+            _get_client.cache_clear()
             with pytest.raises((ValueError, Exception)):
                 _get_client()
 
+    def test_client_is_created_once(self):
+        with patch.dict(os.environ, {"TAVILY_API_KEY": "tvly-test"}), patch("tavily.TavilyClient") as client_cls:
+            assert _get_client() is _get_client()
+        client_cls.assert_called_once_with(api_key="tvly-test")
+
 
 @pytest.mark.unit
 class TestTavilyRetryBehavior:
-    def test_transient_error_retries_and_succeeds(self):
-        """ConnectionError on client.search is retried — succeeds on second call."""
-        mock_client = MagicMock()
-        mock_client.search.side_effect = [
-            ConnectionError("network error"),
+    @pytest.mark.parametrize(
+        "tool,exc,retried",
+        [
+            (search_company_info, ConnectionError, True),
+            (search_competitive_analysis, TimeoutError, True),
+            (search_company_info, ValueError, False),
+        ],
+        ids=["company_connection_error", "competitive_timeout", "company_value_error"],
+    )
+    def test_search_retries_only_transient_errors(self, mock_tavily_client, tool, exc, retried):
+        """A transient client.search failure is retried once and succeeds; a permanent one returns an error dict."""
+        mock_tavily_client.search.side_effect = [
+            exc("search failed"),
             {"results": [{"title": "Retry Result", "content": "Worked after retry", "url": "https://example.com"}]},
         ]
-        with patch("src.tools.tavily_tools._get_client", return_value=mock_client):
-            result = search_company_info.invoke({"company_name": "DataDog"})
+        result = tool.invoke({"company_name": "DataDog"})
+        if retried:
             assert "error" not in result
             assert result["results"][0]["title"] == "Retry Result"
-            assert mock_client.search.call_count == 2
-
-    def test_permanent_error_not_retried(self):
-        """ValueError is not retried — returns error dict immediately."""
-        with patch("src.tools.tavily_tools._get_client", side_effect=ValueError("bad config")):
-            result = search_company_info.invoke({"company_name": "DataDog"})
-            assert "error" in result
-            assert "bad config" in result["error"]
-
-    def test_competitive_analysis_retries_on_transient(self):
-        """Competitive analysis search retries on transient errors."""
-        mock_client = MagicMock()
-        mock_client.search.side_effect = [
-            TimeoutError("timed out"),
-            {"results": [{"title": "Analysis", "content": "Competitive data", "url": "https://example.com"}]},
-        ]
-        with patch("src.tools.tavily_tools._get_client", return_value=mock_client):
-            result = search_competitive_analysis.invoke({"company_name": "DataDog"})
-            assert "error" not in result
-            assert mock_client.search.call_count == 2
+            assert mock_tavily_client.search.call_count == 2
+        else:
+            assert "search failed" in result["error"]
+            assert mock_tavily_client.search.call_count == 1
+
+    def test_client_config_error_returns_error_dict(self, monkeypatch):
+        """A ValueError building the client (e.g. no API key) is reported, not retried."""
+        monkeypatch.setattr("src.tools.tavily_tools._get_client", _raiser(ValueError("bad config")))
+        result = search_company_info.invoke({"company_name": "DataDog"})
+        assert "bad config" in result["error"]
@@ -0,0 +1,63 @@
+"""Unit tests for the TTL cache used around external API calls."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.cache import TTLCache, clear_caches, ttl_cache
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    def test_default_on_miss(self):
+        cache = TTLCache()
+        assert cache.get("k") is None
+        assert cache.get("k", "fallback") == "fallback"
+
+    def test_expired_entries_miss(self):
+        cache = TTLCache(ttl=10)
+        with patch("src.cache.ttl.time.monotonic", return_value=100.0):
+            cache.set("k", "v")
+        with patch("src.cache.ttl.time.monotonic", return_value=105.0):
+            assert cache.get("k") == "v"
+        with patch("src.cache.ttl.time.monotonic", return_value=111.0):
+            assert cache.get("k") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=1)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+
+@pytest.mark.unit
+class TestTtlCacheDecorator:
+    def test_memoizes_on_args(self):
+        fetch = MagicMock(side_effect=lambda name, items: {"name": name, "items": items})
+        cached = ttl_cache()(fetch)
+
+        first = cached("DDOG", ["DT", "CSCO"])
+        second = cached("DDOG", ["DT", "CSCO"])
+        cached("DDOG", ["DT"])
+
+        assert first is second
+        assert fetch.call_count == 2
+
+    def test_exceptions_are_not_cached(self):
+        fetch = MagicMock(side_effect=[ConnectionError("down"), "ok"])
+        cached = ttl_cache()(fetch)
+
+        with pytest.raises(ConnectionError):
+            cached("DDOG")
+        assert cached("DDOG") == "ok"
+
+    def test_clear_caches_resets_every_cache(self):
+        fetch = MagicMock(return_value="v")
+        cached = ttl_cache()(fetch)
+        cached("DDOG")
+
+        clear_caches()
+        cached("DDOG")
+
+        assert fetch.call_count == 2
@@ -1,5 +1,6 @@
 """Unit tests for yfinance tools — all external calls mocked."""
 
+import threading
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
@@ -37,13 +38,33 @@ class TestFormatHelpers:
 
 @pytest.mark.unit
 class TestGetCompanyFinancials:
-    def test_returns_correct_structure(self, mock_yfinance_ticker):
-        result = get_company_financials.invoke({"ticker": "DDOG"})
+    def test_returns_correct_structure(self, ddog_financials):
+        result = ddog_financials
         assert result["ticker"] == "DDOG"
         assert result["source"] == "yfinance"
         assert result["company_name"] == "Datadog Inc."
         assert result["market_cap"] == "$45.00B"
 
+    def test_formats_every_metric_with_raw_copy(self, ddog_financials):
+        result = ddog_financials
+        assert result["revenue_ttm"] == "$2.10B"
+        assert result["revenue_ttm_raw"] == 2_100_000_000
+        assert result["revenue_growth_yoy"] == "25.0%"
+        assert result["gross_margin"] == "78.0%"
+        assert result["operating_margin_raw"] == 0.05
+        assert result["sector"] == "Technology"
+
+    def test_missing_info_keys_fall_back_to_defaults(self):
+        sparse = MagicMock()
+        sparse.info = {}
+        with patch("src.tools.yfinance_tools.yf.Ticker", return_value=sparse):
+            result = get_company_financials.invoke({"ticker": "NEW"})
+        assert result["company_name"] == "NEW"
+        assert result["market_cap"] == "N/A"
+        assert result["market_cap_raw"] is None
+        assert result["sector"] == "N/A"
+        assert result["currency"] == "USD"
+
     def test_returns_error_on_exception(self):
         with patch("src.tools.yfinance_tools.yf.Ticker", side_effect=Exception("network error")):
             result = get_company_financials.invoke({"ticker": "DDOG"})
@@ -67,10 +88,24 @@ class TestGetHistoricalRevenue:
         assert isinstance(result["historical_revenue"], list)
         assert result["source"] == "yfinance"
 
-    def test_handles_empty_financials(self):
+    def test_skips_missing_years_and_sorts_oldest_first(self):
+        ticker = MagicMock()
+        ticker.info = {"shortName": "Datadog Inc."}
+        ticker.financials = pd.DataFrame(
+            {"2024-12-31": [2.1e9], "2023-12-31": [float("nan")], "2022-12-31": [1.6e9], "2021-12-31": [1.0e9]},
+            index=["Revenue"],
+        )
+        ticker.financials.columns = pd.to_datetime(ticker.financials.columns)
+        with patch("src.tools.yfinance_tools.yf.Ticker", return_value=ticker):
+            result = get_historical_revenue.invoke({"ticker": "DDOG", "years": 2})
+        history = result["historical_revenue"]
+        assert [h["year"] for h in history] == [2022, 2024]
+        assert history[1] == {"year": 2024, "revenue": 2.1e9, "revenue_formatted": "$2.10B"}
+
+    def test_handles_empty_financials(self, empty_financials_df):
         mock_ticker = MagicMock()
         mock_ticker.info = {"shortName": "Test"}
-        mock_ticker.financials = pd.DataFrame()
+        mock_ticker.financials = empty_financials_df
 
         with patch("src.tools.yfinance_tools.yf.Ticker", return_value=mock_ticker):
             result = get_historical_revenue.invoke({"ticker": "TEST"})
@@ -81,6 +116,23 @@ class TestGetHistoricalRevenue:
         assert "error" in result
 
 
+@pytest.mark.unit
+class TestYfinanceCaching:
+    def test_repeat_ticker_fetches_once(self, mock_yfinance_ticker):
+        get_company_financials.invoke({"ticker": "DDOG"})
+        result = get_company_financials.invoke({"ticker": "DDOG"})
+
+        assert result["company_name"] == "Datadog Inc."
+        mock_yfinance_ticker.assert_called_once_with("DDOG")
+
+    def test_ticker_case_and_whitespace_share_cache_entry(self, mock_yfinance_ticker):
+        get_company_financials.invoke({"ticker": " ddog "})
+        result = get_company_financials.invoke({"ticker": "DDOG"})
+
+        assert result["ticker"] == "DDOG"
+        mock_yfinance_ticker.assert_called_once_with("DDOG")
+
+
 @pytest.mark.unit
 class TestGetCompanyComparison:
     def test_calls_financials_for_each_ticker(self, mock_yfinance_ticker):
@@ -88,30 +140,31 @@ class TestGetCompanyComparison:
         assert "companies" in result
         assert len(result["companies"]) == 2
 
+    def test_fetches_concurrently_and_keeps_order(self):
+        """Tickers are requested in parallel, but results follow the input order."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def _ticker(symbol):
+            barrier.wait()  # only passes once all three fetches are in flight
+            mock = MagicMock()
+            mock.info = {"shortName": symbol}
+            return mock
+
+        with patch("src.tools.yfinance_tools.yf.Ticker", side_effect=_ticker):
+            result = get_company_comparison.invoke({"tickers": ["DDOG", "DT", "CSCO"]})
+
+        assert [c["company_name"] for c in result["companies"]] == ["DDOG", "DT", "CSCO"]
+
 
 @pytest.mark.unit
 class TestYfinanceRetryBehavior:
-    def test_transient_error_retries_and_succeeds(self):
+    def test_transient_error_retries_and_succeeds(self, mock_yfinance_ticker):
         """ConnectionError is retried — function succeeds on second call."""
-        mock_ticker = MagicMock()
-        mock_ticker.info = {
-            "shortName": "Datadog Inc.",
-            "marketCap": 45_000_000_000,
-            "totalRevenue": 2_100_000_000,
-            "revenueGrowth": 0.25,
-            "grossMargins": 0.78,
-            "operatingMargins": 0.05,
-            "sector": "Technology",
-            "industry": "Software—Application",
-            "currency": "USD",
-        }
-        with patch(
-            "src.tools.yfinance_tools.yf.Ticker",
-            side_effect=[ConnectionError("network error"), mock_ticker],
-        ):
-            result = get_company_financials.invoke({"ticker": "DDOG"})
-            assert "error" not in result
-            assert result["company_name"] == "Datadog Inc."
+        mock_yfinance_ticker.side_effect = [ConnectionError("network error"), mock_yfinance_ticker._instance]
+        result = get_company_financials.invoke({"ticker": "DDOG"})
+        assert "error" not in result
+        assert result["company_name"] == "Datadog Inc."
+        assert mock_yfinance_ticker.call_count == 2
 
     def test_permanent_error_not_retried(self):
         """ValueError is not retried — immediately returns error dict."""
@@ -123,11 +176,11 @@ class TestYfinanceRetryBehavior:
             assert "error" in result
             assert "bad ticker format" in result["error"]
 
-    def test_historical_transient_error_retries(self):
+    def test_historical_transient_error_retries(self, empty_financials_df):
         """ConnectionError in historical fetch is retried."""
         mock_ticker = MagicMock()
         mock_ticker.info = {"shortName": "Test"}
-        mock_ticker.financials = pd.DataFrame()
+        mock_ticker.financials = empty_financials_df
         with patch(
             "src.tools.yfinance_tools.yf.Ticker",
             side_effect=[ConnectionError("timeout"), mock_ticker],
@@ -7,15 +7,21 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import streamlit as st
-import asyncio
-import time
 import threading
+import time
 import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
 
 import pandas as pd
 
+from src.cache import ReportStore, normalize_query
 from src.config import get_config
-from src.agents.manager import run_manager_agent, extract_tool_call_summary
+from src.agents.competitor import get_competitor_agent
+from src.agents.financial import get_financial_agent
+from src.agents.manager import get_manager_agent, run_manager_agent_iter, extract_tool_call_summary
+from src.agents.market_intel import get_market_intel_agent
 from src.report.decision_tree import build_decision_tree_markdown
 
 
@@ -26,20 +32,13 @@ st.set_page_config(
     layout="wide",
 )
 
-# Custom CSS
-st.markdown("""
-<style>
-    .stProgress > div > div > div {
-        background-color: #4CAF50;
-    }
-    .research-box {
-        background-color: #f0f2f6;
-        padding: 20px;
-        border-radius: 10px;
-        margin: 10px 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Static page chrome
+_TAGLINE = "*Drop a company matchup. We'll dig up the financials, scout the competition, and deliver the verdict.*"
+_FOOTER_HTML = """
+<div style="text-align: center; color: #888;">
+Rivalry Rumble-o-Tron v0.1 | Built with LangGraph + Claude + Streamlit
+</div>
+"""
 
 # Pipeline stage definitions — full research pipeline
 PIPELINE_STAGES_FULL = [
@@ -64,16 +63,21 @@ AGENT_STAGE_DEFS = {
     "market_intel": {"key": "market_intel", "label": "Market Intel Scout", "icon_pending": "⬜", "icon_running": "📈", "icon_done": "✅"},
 }
 
-STAGE_PROGRESS = {
-    "route": 0.05,
-    "parse": 0.15,
-    "financial": 0.40,
-    "competitor": 0.40,
-    "market_intel": 0.40,
-    "synthesize": 0.85,
-}
+# Chat history kept in session state, and how many of the newest entries render in full
+MAX_HISTORY_MESSAGES = 20
+FULL_HISTORY_MESSAGES = 3
+# Length of the preview shown for older, collapsed reports
+HISTORY_PREVIEW_CHARS = 500
+# Sessions whose report texts and follow-up context are kept in the side table (least recently active dropped first)
+MAX_STORED_SESSIONS = 100
 
-# Funky status quips shown while each stage is running (cycled by poll tick)
+# Progress UI refreshes are coalesced to at most one per interval (~10 Hz)
+UI_FLUSH_INTERVAL_S = 0.1
+
+# Seconds each status quip stays up before the next one
+QUIP_INTERVAL_S = 1.5
+
+# Funky status quips shown while each stage is running (cycled every QUIP_INTERVAL_S)
 STAGE_QUIPS = {
     "route": [
         "Sizing up the question...",
@@ -112,16 +116,74 @@ def init_session_state():
         st.session_state.messages = []
     if "is_processing" not in st.session_state:
         st.session_state.is_processing = False
-    if "last_report_context" not in st.session_state:
-        st.session_state.last_report_context = None
+    if "side_table_key" not in st.session_state:
+        st.session_state.side_table_key = uuid.uuid4().hex
+
+
+@st.cache_resource
+def _side_tables() -> tuple[threading.Lock, OrderedDict[str, dict]]:
+    """Process-wide side tables by session key, least recently active first, and the lock guarding them."""
+    return threading.Lock(), OrderedDict()
+
+
+def _side_table() -> dict:
+    """This session's large values, kept out of session state.
+
+    Holds ``reports`` (full report text by the history entry's content_id) and
+    ``context`` (the last report and agent results, for follow-up routing).
+    Eviction is per session: only the least recently active sessions beyond
+    MAX_STORED_SESSIONS are dropped, never part of a live session's history.
+    """
+    key = st.session_state.side_table_key
+    lock, tables = _side_tables()
+    with lock:
+        table = tables.get(key)
+        if table is None:
+            table = tables[key] = {"reports": {}, "context": None}
+        tables.move_to_end(key)
+        while len(tables) > MAX_STORED_SESSIONS:
+            tables.popitem(last=False)
+    return table
+
+
+def _add_message(message: dict) -> None:
+    """Append to the chat history, dropping the oldest entries beyond MAX_HISTORY_MESSAGES."""
+    messages = st.session_state.messages
+    messages.append(message)
+    del messages[:-MAX_HISTORY_MESSAGES]
+    # Forget the report texts of entries that just fell out of the history
+    reports = _side_table()["reports"]
+    for report_id in reports.keys() - {m["content_id"] for m in messages if "content_id" in m}:
+        del reports[report_id]
+
+
+def _stash_report(report: str) -> str:
+    """Keep a report's full text out of session state; return the id to store instead."""
+    report_id = uuid.uuid4().hex
+    _side_table()["reports"][report_id] = report
+    return report_id
+
+
+def _message_text(message: dict) -> str:
+    """A message's full text, falling back to its preview if the session's side table was dropped."""
+    if "content_id" not in message:
+        return message["content"]
+    return _side_table()["reports"].get(message["content_id"], message["preview"])
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _config_errors() -> list[str]:
+    """Missing-setting errors, validated (and logged) at most once a minute rather than per rerun."""
+    return get_config().validate()
 
 
 def validate_config():
     """Validate API configuration."""
     config = get_config()
-    errors = config.validate()
 
-    if errors:
+    # Streamlit reruns this on every interaction; only build the error list when keys are missing
+    if not config.is_valid:
+        errors = _config_errors()
         st.error("⚠️ Configuration Required")
         st.markdown("""
         Please set the following environment variables in your `.env` file:
@@ -141,7 +203,7 @@ def validate_config():
 def display_header():
     """Display the app header."""
     st.title("🥊 Rivalry Rumble-o-Tron")
-    st.markdown("*Drop a company matchup. We'll dig up the financials, scout the competition, and deliver the verdict.*")
+    st.markdown(_TAGLINE)
 
 
 EXAMPLE_QUERIES = [
@@ -282,224 +344,379 @@ def _render_financial_snapshot(structured_data: dict) -> bool:
     return True
 
 
+def _report_preview(content: str) -> str:
+    """First paragraphs of a report, cut at a paragraph break within HISTORY_PREVIEW_CHARS."""
+    head = content[:HISTORY_PREVIEW_CHARS]
+    return (head.rsplit("\n\n", 1)[0] or head) + " …"
+
+
+def _render_message_body(message: dict) -> None:
+    """Render a message's text, preceded by the financial snapshot for assistant replies."""
+    meta = message.get("metadata")
+    if meta and message["role"] == "assistant":
+        fin_struct = meta.get("financial_structured_data")
+        if fin_struct and _render_financial_snapshot(fin_struct):
+            st.divider()
+
+    st.markdown(_escape_dollars(_message_text(message)))
+
+
+def _render_behind_the_scenes(meta: dict) -> None:
+    """Render the agent activity log for one assistant reply."""
+    query_type = meta.get("query_type", "new_research")
+    companies = meta.get("companies", [])
+    tickers = meta.get("tickers", [])
+    elapsed = meta.get("elapsed", 0)
+
+    # Show query routing info for follow-ups
+    if query_type != "new_research":
+        agents_used = meta.get("followup_agents", [])
+        route_label = "Context-only" if query_type == "followup_context_only" else f"Re-ran: {', '.join(agents_used)}"
+        st.markdown(f"**Query type:** Follow-up ({route_label})")
+    else:
+        st.markdown("**Query type:** Full research")
+
+    st.markdown(f"**Companies identified:** {', '.join(companies)}")
+    st.markdown(f"**Tickers analyzed:** {', '.join(tickers)}")
+    st.markdown(f"**Completed in:** {int(elapsed)}s")
+    st.divider()
+
+    fin = meta.get("financial_results") or {}
+    comp = meta.get("competitor_results") or {}
+    market = meta.get("market_intel_results") or {}
+
+    col_fin, col_comp, col_market = st.columns(3)
+    with col_fin:
+        st.markdown("**📊 Number Cruncher**")
+        st.caption(f"LLM round-trips: {fin.get('message_count', '?')}")
+        if fin.get("tickers"):
+            st.caption(f"Tickers: {', '.join(fin['tickers'])}")
+
+    with col_comp:
+        st.markdown("**🔍 Street Scout**")
+        st.caption(f"LLM round-trips: {comp.get('message_count', '?')}")
+        if comp.get("companies"):
+            st.caption(f"Companies: {', '.join(comp['companies'])}")
+
+    with col_market:
+        st.markdown("**📈 Market Intel Scout**")
+        st.caption(f"LLM round-trips: {market.get('message_count', '?')}")
+        if market.get("companies"):
+            st.caption(f"Companies: {', '.join(market['companies'])}")
+
+    # Decision tree visualization
+    fin_tc = meta.get("financial_tool_calls", [])
+    comp_tc = meta.get("competitor_tool_calls", [])
+    market_tc = meta.get("market_intel_tool_calls", [])
+    if fin_tc or comp_tc or market_tc:
+        st.divider()
+        st.markdown("**🌳 Decision Tree**")
+        tree_md = build_decision_tree_markdown(meta)
+        st.code(tree_md, language=None)
+
+
 def display_chat_history():
-    """Display chat message history with optional agent activity log."""
-    for message in st.session_state.messages:
+    """Display chat message history with optional agent activity log.
+
+    Only the last FULL_HISTORY_MESSAGES render in full; older reports show a
+    short preview and keep the rest behind an expander.
+    """
+    messages = st.session_state.messages
+    first_full = len(messages) - FULL_HISTORY_MESSAGES
+    for i, message in enumerate(messages):
         with st.chat_message(message["role"]):
-            # Render financial snapshot before report for assistant messages
+            text = _message_text(message)
+            if i < first_full and message["role"] == "assistant" and len(text) > HISTORY_PREVIEW_CHARS:
+                st.markdown(_escape_dollars(_report_preview(text)))
+                with st.expander("Older report — click to expand"):
+                    _render_message_body(message)
+            else:
+                _render_message_body(message)
+
+            # Agent activity log: built for the newest reply, or for older ones once asked for
             meta = message.get("metadata")
             if meta and message["role"] == "assistant":
-                fin_struct = meta.get("financial_structured_data")
-                if fin_struct and _render_financial_snapshot(fin_struct):
-                    st.divider()
+                if i == len(messages) - 1 or message.get("show_details"):
+                    with st.expander("🔎 Behind the Scenes"):
+                        _render_behind_the_scenes(meta)
+                elif st.button("🔎 Show details", key=f"show_details_{i}"):
+                    message["show_details"] = True
+                    with st.expander("🔎 Behind the Scenes", expanded=True):
+                        _render_behind_the_scenes(meta)
+
+
+def render_stage_line(stage_def: dict, state: dict | None, tick: int = 0) -> str:
+    """Render one stage's status as a markdown line, with a funky quip while it runs."""
+    key = stage_def["key"]
+    status = (state or {}).get("status", "pending")
+
+    if status == "done":
+        icon = stage_def["icon_done"]
+        detail_str = ""
+    elif status == "running":
+        icon = stage_def["icon_running"]
+        quips = STAGE_QUIPS.get(key, [])
+        quip = quips[tick % len(quips)] if quips else ""
+        detail_str = f" — *{quip}*" if quip else ""
+    else:
+        icon = stage_def["icon_pending"]
+        detail_str = ""
+
+    return f"{icon} **{stage_def['label']}**{detail_str}"
+
+
+def _apply_stage_event(stage_states: dict, event: dict) -> None:
+    """Record one stage event from the agent stream in stage_states."""
+    stage = event.get("stage")
+    if not stage:
+        return
+    stage_states[stage] = {
+        "status": event.get("status", "running"),
+        "detail": event.get("detail", ""),
+    }
+    # Store routing metadata when route completes
+    if event.get("query_type"):
+        stage_states["_query_type"] = event["query_type"]
+        # Pre-populate follow-up agent stages as pending so the
+        # UI shows them immediately, before their own events arrive
+        for agent_name in event.get("followup_agents", []):
+            if agent_name in AGENT_STAGE_DEFS:
+                stage_states[agent_name] = {"status": "pending", "detail": ""}
+
+
+@st.cache_resource
+def _report_store() -> ReportStore | None:
+    """The on-disk store shared by every session in this process, or None if disabled or unusable."""
+    path = get_config().report_cache_path
+    store = ReportStore(path) if path else None
+    return store if store is not None and store.enabled else None
+
+
+@st.cache_data(ttl=24 * 60 * 60, max_entries=64, show_spinner=False)
+def _cached_agent_output(query_key: str, _agent_output: dict | None = None) -> dict:
+    """Remember an agent run under query_key (``_agent_output`` is not part of the key).
+
+    Called without an output it is a pure lookup: a miss raises LookupError,
+    which st.cache_data does not cache.
+    """
+    if _agent_output is None:
+        raise LookupError(query_key)
+    return _agent_output
 
-            st.markdown(_escape_dollars(message["content"]))
 
-            # Render agent activity log if metadata is present
-            if meta and message["role"] == "assistant":
-                query_type = meta.get("query_type", "new_research")
-
-                with st.expander("🔎 Behind the Scenes"):
-                    companies = meta.get("companies", [])
-                    tickers = meta.get("tickers", [])
-                    elapsed = meta.get("elapsed", 0)
-
-                    # Show query routing info for follow-ups
-                    if query_type != "new_research":
-                        agents_used = meta.get("followup_agents", [])
-                        route_label = "Context-only" if query_type == "followup_context_only" else f"Re-ran: {', '.join(agents_used)}"
-                        st.markdown(f"**Query type:** Follow-up ({route_label})")
-                    else:
-                        st.markdown("**Query type:** Full research")
-
-                    st.markdown(f"**Companies identified:** {', '.join(companies)}")
-                    st.markdown(f"**Tickers analyzed:** {', '.join(tickers)}")
-                    st.markdown(f"**Completed in:** {int(elapsed)}s")
-                    st.divider()
+def _lookup_agent_output(query_key: str) -> dict | None:
+    """Return the stored agent output for query_key from memory, then disk; None if never run."""
+    try:
+        return _cached_agent_output(query_key)
+    except LookupError:
+        pass
+    store = _report_store()
+    agent_output = store.get(query_key) if store else None
+    if agent_output is not None:
+        _cached_agent_output(query_key, agent_output)
+    return agent_output
+
 
-                    fin = meta.get("financial_results") or {}
-                    comp = meta.get("competitor_results") or {}
-                    market = meta.get("market_intel_results") or {}
-
-                    col_fin, col_comp, col_market = st.columns(3)
-                    with col_fin:
-                        st.markdown("**📊 Number Cruncher**")
-                        st.caption(f"LLM round-trips: {fin.get('message_count', '?')}")
-                        if fin.get("tickers"):
-                            st.caption(f"Tickers: {', '.join(fin['tickers'])}")
-
-                    with col_comp:
-                        st.markdown("**🔍 Street Scout**")
-                        st.caption(f"LLM round-trips: {comp.get('message_count', '?')}")
-                        if comp.get("companies"):
-                            st.caption(f"Companies: {', '.join(comp['companies'])}")
-
-                    with col_market:
-                        st.markdown("**📈 Market Intel Scout**")
-                        st.caption(f"LLM round-trips: {market.get('message_count', '?')}")
-                        if market.get("companies"):
-                            st.caption(f"Companies: {', '.join(market['companies'])}")
-
-                    # Decision tree visualization
-                    fin_tc = meta.get("financial_tool_calls", [])
-                    comp_tc = meta.get("competitor_tool_calls", [])
-                    market_tc = meta.get("market_intel_tool_calls", [])
-                    if fin_tc or comp_tc or market_tc:
-                        st.divider()
-                        st.markdown("**🌳 Decision Tree**")
-                        tree_md = build_decision_tree_markdown(meta)
-                        st.code(tree_md, language=None)
-
-
-def render_stage_text(stage_states: dict, tick: int = 0) -> str:
-    """Render stage status as markdown text with funky quips."""
-    active_stages = _get_active_pipeline_stages(stage_states)
-    lines = []
-    for stage_def in active_stages:
-        key = stage_def["key"]
-        state = stage_states.get(key, {"status": "pending", "detail": ""})
-        status = state["status"]
-
-        if status == "done":
-            icon = stage_def["icon_done"]
-            detail_str = ""
-        elif status == "running":
-            icon = stage_def["icon_running"]
-            quips = STAGE_QUIPS.get(key, [])
-            quip = quips[tick % len(quips)] if quips else ""
-            detail_str = f" — *{quip}*" if quip else ""
-        else:
-            icon = stage_def["icon_pending"]
-            detail_str = ""
-
-        lines.append(f"{icon} **{stage_def['label']}**{detail_str}")
-
-    return "\n\n".join(lines)
-
-
-def compute_progress(stage_states: dict) -> float:
-    """Compute progress bar value from stage states."""
-    done_stages = [k for k, v in stage_states.items() if isinstance(v, dict) and v.get("status") == "done"]
-    running_stages = [k for k, v in stage_states.items() if isinstance(v, dict) and v.get("status") == "running"]
-
-    progress = 0.0
-    for s in done_stages:
-        progress = max(progress, STAGE_PROGRESS.get(s, 0) + 0.10)
-    for s in running_stages:
-        progress = max(progress, STAGE_PROGRESS.get(s, 0))
-
-    return min(progress, 0.95)
+def _remember_agent_output(query_key: str, agent_output: dict) -> None:
+    """Keep a finished run in memory for this process and on disk for the others."""
+    _cached_agent_output(query_key, agent_output)
+    if store := _report_store():
+        store.set(query_key, agent_output)
+
+
+@st.cache_resource
+def _runs_in_flight() -> tuple[threading.Lock, dict[str, Future]]:
+    """Process-wide map of cacheable queries being run right now, and the lock guarding it."""
+    return threading.Lock(), {}
+
+
+def _join_or_start_run(query_key: str) -> tuple[Future, bool]:
+    """Return the in-flight future for query_key and whether the caller owns (runs and resolves) it."""
+    lock, runs = _runs_in_flight()
+    with lock:
+        if (future := runs.get(query_key)) is not None:
+            return future, False
+        future = runs[query_key] = Future()
+        return future, True
+
+
+def _finish_run(query_key: str, future: Future, agent_output: dict | None) -> None:
+    """Hand an owned run's output (None if it failed) to any session waiting on it."""
+    lock, runs = _runs_in_flight()
+    with lock:
+        runs.pop(query_key, None)
+    future.set_result(agent_output)
+
+
+def _await_shared_run(future: Future, status, start_time: float) -> dict | None:
+    """Wait for another session's run of the same query; None if it failed.
+
+    Waits in short slices and touches the status each time, so Streamlit can
+    still stop or rerun this script while it waits.
+    """
+    while True:
+        try:
+            return future.result(timeout=1.0)
+        except TimeoutError:
+            elapsed = int(time.time() - start_time)
+            status.update(label=f"Same question is already running in another session — waiting ({elapsed}s)")
 
 
 def process_query(query: str):
     """Process a research query with progress indicators."""
     st.session_state.is_processing = True
+    try:
+        _answer_query(query)
+    finally:
+        # Also reached when Streamlit stops or reruns the script mid-query
+        st.session_state.is_processing = False
 
+
+def _answer_query(query: str):
+    """Run one query, streaming progress, and record the answer in the chat history."""
     # Add user message to history
-    st.session_state.messages.append({"role": "user", "content": query})
+    _add_message({"role": "user", "content": query})
 
     # Extract prior context for follow-up routing
-    last_ctx = st.session_state.last_report_context
+    side_table = _side_table()
+    last_ctx = side_table["context"]
     prior_report = last_ctx["report"] if last_ctx else None
     prior_results = last_ctx if last_ctx else None
 
+    # Only standalone questions are cached; a follow-up's answer depends on the prior report
+    cache_key = None if prior_report else normalize_query(query)
+    cached_output = _lookup_agent_output(cache_key) if cache_key else None
+
     with st.chat_message("assistant"):
-        progress_bar = st.progress(0.0)
-        stages_placeholder = st.empty()
-        elapsed_placeholder = st.empty()
+        # st.status animates the running state in the browser; inside it, one slot per
+        # stage line plus the elapsed time, and only changed lines are re-sent
+        status_placeholder = st.empty()
+        status = status_placeholder.status("Researching...", expanded=True)
+        lines_placeholder = status.empty()
         result_placeholder = st.empty()
 
-        # Shared mutable state between main thread and worker thread
         stage_states = {}
         start_time = time.time()
-        worker_result = [None]  # [0] = report string
-        worker_error = [None]   # [0] = exception
+        agent_output = None
+        slots = {}  # stage key (or "_elapsed") -> st.empty() for that line
+        shown = {}  # slot key -> text currently on screen
+        layout = None  # stage keys the slots were built for
+        shown_label = "Researching..."
+
+        def _refresh_status(tick: int = 0) -> None:
+            """Bring the status lines up to date, re-sending only the ones whose text changed.
+
+            The slots are rebuilt only when the active stage list itself changes
+            (e.g. once routing picks the follow-up pipeline).
+            """
+            nonlocal layout, shown_label
+            stages = _get_active_pipeline_stages(stage_states)
+            keys = [stage_def["key"] for stage_def in stages]
+            if keys != layout:
+                slots.clear()
+                shown.clear()
+                with lines_placeholder.container():
+                    for key in [*keys, "_elapsed"]:
+                        slots[key] = st.empty()
+                layout = keys
+
+            lines = {
+                stage_def["key"]: render_stage_line(stage_def, stage_states.get(stage_def["key"]), tick)
+                for stage_def in stages
+            }
+            lines["_elapsed"] = f":gray[{int(time.time() - start_time)}s elapsed]"
+            for key, line in lines.items():
+                if shown.get(key) != line:
+                    slots[key].markdown(line)
+                    shown[key] = line
+
+            running = [
+                stage_def["label"]
+                for stage_def in stages
+                if stage_states.get(stage_def["key"], {}).get("status") == "running"
+            ]
+            label = " · ".join(running) or "Researching..."
+            if label != shown_label:
+                status.update(label=label)
+                shown_label = label
 
         # Initial render
-        stages_placeholder.markdown(render_stage_text(stage_states))
-        elapsed_placeholder.caption("0s elapsed")
+        _refresh_status()
 
-        def progress_callback(update):
-            """Handle structured progress updates — only mutates shared dict.
+        def _report_tokens():
+            """Yield report text for st.write_stream, applying stage events as they pass.
 
-            This runs in the worker thread, so it must NOT call Streamlit APIs.
+            st.write_stream consumes this on the main thread, so updating the
+            other placeholders from here is safe. Tokens and stage changes are
+            flushed together at most every UI_FLUSH_INTERVAL_S.
             """
-            if isinstance(update, dict):
-                stage = update.get("stage")
-                if stage:
-                    stage_states[stage] = {
-                        "status": update.get("status", "running"),
-                        "detail": update.get("detail", ""),
-                    }
-                    # Store routing metadata when route completes
-                    if update.get("query_type"):
-                        stage_states["_query_type"] = update["query_type"]
-                        # Pre-populate follow-up agent stages as pending so the
-                        # UI shows them immediately, before their callbacks fire
-                        for agent_name in update.get("followup_agents", []):
-                            if agent_name in AGENT_STAGE_DEFS:
-                                stage_states[agent_name] = {"status": "pending", "detail": ""}
-
-        def _run_agent():
-            """Worker thread: runs the async agent in its own event loop."""
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            nonlocal agent_output
+            pending = []  # tokens not yet handed to st.write_stream
+            last_flush = 0.0
+            events = run_manager_agent_iter(
+                query, prior_report=prior_report, prior_results=prior_results, idle_timeout=UI_FLUSH_INTERVAL_S
+            )
             try:
-                worker_result[0] = loop.run_until_complete(
-                    run_manager_agent(
-                        query,
-                        progress_callback,
-                        prior_report=prior_report,
-                        prior_results=prior_results,
-                    )
-                )
-            except Exception as e:
-                worker_error[0] = e
+                for event in events:
+                    # None means nothing arrived for a while; fall through so the clock keeps ticking
+                    if event is None:
+                        pass
+                    elif event["type"] == "token":
+                        pending.append(_escape_dollars(event["text"]))
+                    elif event["type"] == "stage":
+                        _apply_stage_event(stage_states, event)
+                    elif event["type"] == "final":
+                        agent_output = event["result"]
+
+                    now = time.monotonic()
+                    if now - last_flush < UI_FLUSH_INTERVAL_S:
+                        continue
+                    last_flush = now
+                    _refresh_status(tick=int((time.time() - start_time) / QUIP_INTERVAL_S))
+                    if pending:
+                        yield "".join(pending)
+                        pending.clear()
             finally:
-                loop.close()
+                # Cancels the run when Streamlit stops or reruns the script mid-query
+                events.close()
+            if pending:
+                yield "".join(pending)
 
+        run_future, owns_run = None, False
         try:
-            # Start the agent in a background thread
-            thread = threading.Thread(target=_run_agent, daemon=True)
-            thread.start()
-
-            # Poll the thread, updating Streamlit UI from the main thread
-            tick = 0
-            while thread.is_alive():
-                thread.join(timeout=1.5)
-                tick += 1
-
-                # Update UI from main thread (safe for Streamlit)
-                stages_placeholder.markdown(render_stage_text(stage_states, tick))
-                progress_bar.progress(compute_progress(stage_states))
+            if cached_output is None and cache_key:
+                run_future, owns_run = _join_or_start_run(cache_key)
+                if not owns_run:
+                    cached_output = _await_shared_run(run_future, status, start_time)
+
+            if cached_output is not None:
+                # Asked before, or just answered by another session: show it without running the pipeline
+                agent_output = cached_output
+                status_placeholder.empty()
+                elapsed = time.time() - start_time
+            else:
+                tokens = _report_tokens()
+                try:
+                    with result_placeholder.container():
+                        st.write_stream(tokens)
+                finally:
+                    # Streamlit's stop/rerun exceptions derive from BaseException and skip
+                    # the handler below; close here so the run is cancelled, not orphaned
+                    tokens.close()
+                    if owns_run:
+                        shared = agent_output if agent_output and not agent_output.get("error") else None
+                        _finish_run(cache_key, run_future, shared)
+
                 elapsed = time.time() - start_time
-                elapsed_placeholder.caption(f"{int(elapsed)}s elapsed")
+                status.update(label=f"Done in {int(elapsed)}s", state="complete", expanded=False)
 
-            # Thread finished — check for errors
-            if worker_error[0]:
-                raise worker_error[0]
+                if cache_key and not agent_output.get("error"):
+                    _remember_agent_output(cache_key, agent_output)
 
-            agent_output = worker_result[0]
             report = agent_output["final_report"]
             query_type = agent_output.get("query_type", "new_research")
             followup_agents = agent_output.get("followup_agents", [])
 
-            # Show completion
-            progress_bar.progress(1.0)
-            elapsed = time.time() - start_time
-            elapsed_placeholder.caption(f"Completed in {int(elapsed)}s")
-
-            # Mark all active stages done (skip metadata keys like _query_type)
-            for key in stage_states:
-                if isinstance(stage_states[key], dict):
-                    stage_states[key] = {"status": "done", "detail": ""}
-            stages_placeholder.markdown(render_stage_text(stage_states))
-
-            # Brief pause so user sees 100%, then collapse progress and show report
-            time.sleep(0.5)
-            progress_bar.empty()
-            stages_placeholder.empty()
-            elapsed_placeholder.empty()
             with result_placeholder.container():
                 fin_struct = (agent_output.get("financial_results") or {}).get("structured_data")
                 if fin_struct and _render_financial_snapshot(fin_struct):
@@ -537,17 +754,18 @@ def process_query(query: str):
             }
 
             # Add to message history
-            st.session_state.messages.append({
+            _add_message({
                 "role": "assistant",
-                "content": report,
+                "content_id": _stash_report(report),
+                "preview": _report_preview(report),
                 "metadata": metadata,
             })
 
-            # Update last_report_context for follow-up routing
+            # Update the follow-up context (kept in the side table, not session state)
             # For new research: store full context
             # For follow-ups that re-ran agents: merge new results into existing context
             if query_type == "new_research":
-                st.session_state.last_report_context = {
+                side_table["context"] = {
                     "report": report,
                     "companies": agent_output.get("companies", []),
                     "tickers": agent_output.get("tickers", []),
@@ -563,20 +781,29 @@ def process_query(query: str):
                     if new_val:
                         last_ctx[key] = new_val
                 # Keep the original full report as the "prior report" for future follow-ups
-                st.session_state.last_report_context = last_ctx
+                side_table["context"] = last_ctx
             # For followup_context_only: no context update needed
 
         except Exception as e:
-            progress_bar.empty()
-            stages_placeholder.empty()
-            elapsed_placeholder.empty()
+            status_placeholder.empty()
             tb_lines = traceback.format_exception(type(e), e, e.__traceback__)
             print(f"ERROR in process_query:\n{''.join(tb_lines)}", flush=True)
             error_msg = f"❌ Error: {type(e).__name__}: {str(e) or 'See server logs'}"
             result_placeholder.error(error_msg)
-            st.session_state.messages.append({"role": "assistant", "content": error_msg})
+            _add_message({"role": "assistant", "content": error_msg})
 
-    st.session_state.is_processing = False
+
+@st.cache_resource(show_spinner=False)
+def _warm_agents() -> None:
+    """Build every agent graph (and the shared LLM client) once per process.
+
+    Otherwise the first query pays for the Anthropic SDK import and the graph
+    builds on top of its own latency.
+    """
+    get_manager_agent()
+    get_financial_agent()
+    get_competitor_agent()
+    get_market_intel_agent()
 
 
 def main():
@@ -613,11 +840,10 @@ def main():
 
     # Footer
     st.divider()
-    st.markdown("""
-    <div style="text-align: center; color: #888;">
-    Rivalry Rumble-o-Tron v0.1 | Built with LangGraph + Claude + Streamlit
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
+
+    # Last, so the first page paints before the agents are built
+    _warm_agents()
 
 
 if __name__ == "__main__":